@@ -0,0 +1,66 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+import asyncio
+
+import app.models as models
+from app.database import SQLALCHEMY_DATABASE_URL, set_utc_time_zone
+from app.partitions import DEFAULT_PARTITION, PARTITION_NAME
+
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = models.Base.metadata
+
+
+def include_name(name, type_, parent_names):
+    # Partitions of event are created by app.partitions and aren't in the
+    # models; autogenerate would otherwise emit drops for them
+    if type_ == "table":
+        return not (name == DEFAULT_PARTITION or PARTITION_NAME.match(name))
+    return True
+
+
+def run_migrations_offline():
+    context.configure(
+        url=SQLALCHEMY_DATABASE_URL,
+        target_metadata=target_metadata,
+        include_name=include_name,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=include_name,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online():
+    connectable = create_async_engine(SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+    event.listen(connectable.sync_engine, "connect", set_utc_time_zone)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,184 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 09:00:00.000000
+
+Mirrors the tables previously created by Base.metadata.create_all.
+Databases created that way run this revision like any other: every
+table and index is created only if missing. Depending on the release
+that built them, such databases may lack the rollup table and the
+timeline index. A database already stamped 0001 without running it
+should be reset with 'alembic stamp base' before upgrading.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def id_column(name="id", **kwargs):
+    return sa.Column(name, sa.String(100), **kwargs)
+
+
+def audit_columns():
+    return [
+        sa.Column("created_datetime", sa.DateTime(), nullable=False),
+        sa.Column("modified_datetime", sa.DateTime()),
+    ]
+
+
+def upgrade():
+    op.create_table(
+        "enum",
+        id_column(primary_key=True),
+        sa.Column("enum_name", sa.String(100), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        *audit_columns(),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "enum_history",
+        id_column(primary_key=True),
+        id_column("enum_id", nullable=False),
+        sa.Column("enum_name", sa.String(100), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("valid_from", sa.DateTime(), nullable=False),
+        sa.Column("valid_to", sa.DateTime()),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "parent",
+        id_column(primary_key=True),
+        sa.Column("email", sa.String(100), nullable=False, unique=True),
+        sa.Column("username", sa.String(100), unique=True),
+        sa.Column("first_name", sa.String(100), nullable=False),
+        sa.Column("last_name", sa.String(100)),
+        sa.Column("hashed_password", sa.String(100), nullable=False),
+        id_column("role"),
+        *audit_columns(),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["role"], ["enum.id"], name="parent_role_fkey"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "kid",
+        id_column(primary_key=True),
+        sa.Column("first_name", sa.String(100), nullable=False),
+        sa.Column("last_name", sa.String(100)),
+        sa.Column("birth_date", sa.DateTime()),
+        id_column("parent_id"),
+        *audit_columns(),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["parent_id"], ["parent.id"], name="kid_parent_id_fkey"
+        ),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "kid_permission",
+        id_column(primary_key=True),
+        id_column("kid_id", nullable=False),
+        id_column("parent_id", nullable=False),
+        id_column("role_id", nullable=False),
+        *audit_columns(),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["kid_id"], ["kid.id"], name="kid_permission_kid_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["parent_id"], ["parent.id"], name="kid_permission_parent_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["role_id"], ["enum.id"], name="kid_permission_role_id_fkey"
+        ),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "kid_invitation",
+        id_column(primary_key=True),
+        id_column("kid_id", nullable=False),
+        id_column("inviter_parent_id", nullable=False),
+        sa.Column("invited_email", sa.String(100), nullable=False),
+        id_column("role_id", nullable=False),
+        sa.Column("invitation_token", sa.String(100), nullable=False, unique=True),
+        sa.Column("expiration_datetime", sa.DateTime(), nullable=False),
+        sa.Column("is_accepted", sa.Boolean(), nullable=False),
+        sa.Column("created_datetime", sa.DateTime(), nullable=False),
+        sa.Column("accepted_datetime", sa.DateTime()),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["kid_id"], ["kid.id"], name="kid_invitation_kid_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["inviter_parent_id"],
+            ["parent.id"],
+            name="kid_invitation_inviter_parent_id_fkey",
+        ),
+        sa.ForeignKeyConstraint(
+            ["role_id"], ["enum.id"], name="kid_invitation_role_id_fkey"
+        ),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "event",
+        id_column(primary_key=True),
+        id_column("kid_id", nullable=False),
+        id_column("event_type_id", nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("string_value", sa.String(255)),
+        sa.Column("float_value", sa.Float()),
+        sa.Column("bool_value", sa.Boolean()),
+        sa.Column("int_value", sa.Integer()),
+        id_column("unit_id"),
+        *audit_columns(),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["kid_id"], ["kid.id"], name="event_kid_id_fkey"),
+        sa.ForeignKeyConstraint(
+            ["event_type_id"], ["enum.id"], name="event_event_type_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(["unit_id"], ["enum.id"], name="event_unit_id_fkey"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_event_kid_id_timestamp",
+        "event",
+        ["kid_id", "timestamp", "id"],
+        postgresql_where=sa.text("is_deleted = false"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "event_daily_rollup",
+        id_column("kid_id", primary_key=True),
+        id_column("event_type_id", primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("float_sum", sa.Float(), nullable=False),
+        sa.Column("int_sum", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["kid_id"], ["kid.id"], name="event_daily_rollup_kid_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["event_type_id"],
+            ["enum.id"],
+            name="event_daily_rollup_event_type_id_fkey",
+        ),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_table("event_daily_rollup")
+    op.drop_index("ix_event_kid_id_timestamp", table_name="event")
+    op.drop_table("event")
+    op.drop_table("kid_invitation")
+    op.drop_table("kid_permission")
+    op.drop_table("kid")
+    op.drop_table("parent")
+    op.drop_table("enum_history")
+    op.drop_table("enum")
@@ -0,0 +1,74 @@
+"""native uuid ids
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 10:00:00.000000
+
+Converts every String(100) primary and foreign key to a native uuid in
+place. Foreign keys are dropped first so referenced and referencing
+columns can change type independently, then recreated. Every id the app
+has written is a uuid4 string, so the ::uuid casts are lossless.
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+ID_COLUMNS = {
+    "enum": ["id"],
+    "enum_history": ["id", "enum_id"],
+    "parent": ["id", "role"],
+    "kid": ["id", "parent_id"],
+    "kid_permission": ["id", "kid_id", "parent_id", "role_id"],
+    "kid_invitation": ["id", "kid_id", "inviter_parent_id", "role_id"],
+    "event": ["id", "kid_id", "event_type_id", "unit_id"],
+    "event_daily_rollup": ["kid_id", "event_type_id"],
+}
+
+# (table, column, referenced table); names follow Postgres' defaults
+FOREIGN_KEYS = [
+    ("parent", "role", "enum"),
+    ("kid", "parent_id", "parent"),
+    ("kid_permission", "kid_id", "kid"),
+    ("kid_permission", "parent_id", "parent"),
+    ("kid_permission", "role_id", "enum"),
+    ("kid_invitation", "kid_id", "kid"),
+    ("kid_invitation", "inviter_parent_id", "parent"),
+    ("kid_invitation", "role_id", "enum"),
+    ("event", "kid_id", "kid"),
+    ("event", "event_type_id", "enum"),
+    ("event", "unit_id", "enum"),
+    ("event_daily_rollup", "kid_id", "kid"),
+    ("event_daily_rollup", "event_type_id", "enum"),
+]
+
+
+def convert(type_name: str, cast: str):
+    for table, column, _ in FOREIGN_KEYS:
+        op.drop_constraint(f"{table}_{column}_fkey", table, type_="foreignkey")
+
+    for table, columns in ID_COLUMNS.items():
+        op.execute(
+            f"ALTER TABLE {table} "
+            + ", ".join(
+                f"ALTER COLUMN {column} TYPE {type_name} USING {column}::{cast}"
+                for column in columns
+            )
+        )
+
+    for table, column, referenced in FOREIGN_KEYS:
+        op.create_foreign_key(
+            f"{table}_{column}_fkey", table, referenced, [column], ["id"]
+        )
+
+
+def upgrade():
+    convert("uuid", "uuid")
+
+
+def downgrade():
+    convert("varchar(100)", "varchar(100)")
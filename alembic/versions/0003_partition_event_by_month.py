@@ -0,0 +1,117 @@
+"""partition event by month
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 11:00:00.000000
+
+Rebuilds event as a table range-partitioned by month on timestamp. The
+primary key becomes (id, timestamp) because Postgres requires the
+partition key in it. Partitions are created for every month that has
+data, up to three months ahead. After that the application and
+'python -m app.partitions create' keep creating them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = (
+    "id, kid_id, event_type_id, timestamp, string_value, float_value, "
+    "bool_value, int_value, unit_id, created_datetime, modified_datetime, "
+    "is_deleted"
+)
+
+
+def create_event_table(primary_key, **kwargs):
+    op.create_table(
+        "event",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("kid_id", sa.Uuid(), nullable=False),
+        sa.Column("event_type_id", sa.Uuid(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("string_value", sa.String(255)),
+        sa.Column("float_value", sa.Float()),
+        sa.Column("bool_value", sa.Boolean()),
+        sa.Column("int_value", sa.Integer()),
+        sa.Column("unit_id", sa.Uuid()),
+        sa.Column("created_datetime", sa.DateTime(), nullable=False),
+        sa.Column("modified_datetime", sa.DateTime()),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint(*primary_key, name="event_pkey"),
+        sa.ForeignKeyConstraint(["kid_id"], ["kid.id"], name="event_kid_id_fkey"),
+        sa.ForeignKeyConstraint(
+            ["event_type_id"], ["enum.id"], name="event_event_type_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(["unit_id"], ["enum.id"], name="event_unit_id_fkey"),
+        **kwargs,
+    )
+    op.create_index(
+        "ix_event_kid_id_timestamp",
+        "event",
+        ["kid_id", "timestamp", "id"],
+        postgresql_where=sa.text("is_deleted = false"),
+    )
+
+
+def move_old_table_aside(name):
+    op.rename_table("event", name)
+    op.execute(f"ALTER INDEX event_pkey RENAME TO {name}_pkey")
+    op.drop_index("ix_event_kid_id_timestamp", table_name=name, if_exists=True)
+
+
+def upgrade():
+    move_old_table_aside("event_unpartitioned")
+    create_event_table(
+        ["id", "timestamp"], postgresql_partition_by="RANGE (timestamp)"
+    )
+
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month date;
+            utc_now timestamp := now() AT TIME ZONE 'utc';
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', LEAST(
+                        COALESCE((SELECT min(timestamp) FROM event_unpartitioned), utc_now),
+                        utc_now
+                    )),
+                    date_trunc('month', GREATEST(
+                        COALESCE((SELECT max(timestamp) FROM event_unpartitioned), utc_now),
+                        utc_now + interval '3 months'
+                    )),
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF event FOR VALUES FROM (%L) TO (%L)',
+                    'event_p' || to_char(month, 'YYYY_MM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+        """
+    )
+
+    op.execute(
+        f"INSERT INTO event ({COLUMNS}) SELECT {COLUMNS} FROM event_unpartitioned"
+    )
+    op.drop_table("event_unpartitioned")
+
+
+def downgrade():
+    move_old_table_aside("event_partitioned")
+    create_event_table(["id"])
+    op.execute(
+        f"INSERT INTO event ({COLUMNS}) SELECT {COLUMNS} FROM event_partitioned"
+    )
+    # Dropping the parent drops every attached partition with it
+    op.drop_table("event_partitioned")
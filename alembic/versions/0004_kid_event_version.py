@@ -0,0 +1,31 @@
+"""kid event version
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 12:00:00.000000
+
+Adds kid.event_version, a counter bumped on every event write for that
+kid, which the event timeline derives its ETag from. The constant server
+default keeps the ALTER a metadata-only change.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "kid",
+        sa.Column(
+            "event_version", sa.BigInteger(), server_default="0", nullable=False
+        ),
+    )
+
+
+def downgrade():
+    op.drop_column("kid", "event_version")
@@ -0,0 +1,57 @@
+"""event history
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 13:00:00.000000
+
+Adds event_history, the temporal audit trail for events that the audit
+queue writes behind. Every existing event is backfilled with one open
+version valid from its last modification.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "event_history",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("event_id", sa.Uuid(), nullable=False),
+        sa.Column("kid_id", sa.Uuid(), nullable=False),
+        sa.Column("event_type_id", sa.Uuid(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("string_value", sa.String(255)),
+        sa.Column("float_value", sa.Float()),
+        sa.Column("bool_value", sa.Boolean()),
+        sa.Column("int_value", sa.Integer()),
+        sa.Column("unit_id", sa.Uuid()),
+        sa.Column("valid_from", sa.DateTime(), nullable=False),
+        sa.Column("valid_to", sa.DateTime()),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO event_history (id, event_id, kid_id, event_type_id, "
+        "timestamp, string_value, float_value, bool_value, int_value, unit_id, "
+        "valid_from, valid_to, is_deleted) "
+        "SELECT gen_random_uuid(), id, kid_id, event_type_id, timestamp, "
+        "string_value, float_value, bool_value, int_value, unit_id, "
+        "COALESCE(modified_datetime, created_datetime), NULL, is_deleted "
+        "FROM event"
+    )
+    # Built after the backfill, which is cheaper than maintaining it row by row
+    op.create_index(
+        "ix_event_history_event_id_valid_from",
+        "event_history",
+        ["event_id", "valid_from"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_event_history_event_id_valid_from", table_name="event_history")
+    op.drop_table("event_history")
@@ -0,0 +1,37 @@
+"""enum history indexes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 14:00:00.000000
+
+Indexes enum_history for as-of reads: (enum_id, valid_from) for one
+enum's version at a time, as joined by event reports, and a GiST index
+on tsrange(valid_from, valid_to) for the whole enum set at a time.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_enum_history_enum_id_valid_from",
+        "enum_history",
+        ["enum_id", "valid_from"],
+    )
+    op.create_index(
+        "ix_enum_history_validity",
+        "enum_history",
+        [sa.text("tsrange(valid_from, valid_to)")],
+        postgresql_using="gist",
+    )
+
+
+def downgrade():
+    op.drop_index("ix_enum_history_validity", table_name="enum_history")
+    op.drop_index("ix_enum_history_enum_id_valid_from", table_name="enum_history")
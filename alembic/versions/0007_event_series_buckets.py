@@ -0,0 +1,44 @@
+"""event series buckets
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 15:00:00.000000
+
+Adds event_series_bucket, the downsampled count/sum/min/max of numeric
+event readings at 1 minute, 15 minute and 1 hour resolutions. Fill it
+for existing events with 'python -m app.series'.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "event_series_bucket",
+        sa.Column("kid_id", sa.Uuid(), primary_key=True),
+        sa.Column("event_type_id", sa.Uuid(), primary_key=True),
+        sa.Column("resolution", sa.Integer(), primary_key=True),
+        sa.Column("bucket_start", sa.DateTime(), primary_key=True),
+        sa.Column("value_count", sa.Integer(), nullable=False),
+        sa.Column("value_sum", sa.Float(), nullable=False),
+        sa.Column("value_min", sa.Float(), nullable=False),
+        sa.Column("value_max", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["kid_id"], ["kid.id"], name="event_series_bucket_kid_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["event_type_id"],
+            ["enum.id"],
+            name="event_series_bucket_event_type_id_fkey",
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("event_series_bucket")
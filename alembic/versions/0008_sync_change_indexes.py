@@ -0,0 +1,42 @@
+"""sync change indexes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 16:00:00.000000
+
+Indexes coalesce(modified_datetime, created_datetime), the change time
+the /sync endpoint compares watermarks against, on event (per kid),
+kid_permission (per parent) and enum.
+
+Rows written before this release were stamped with their worker's start
+time rather than their write time, so clients should do one full sync
+(no watermark) after upgrading.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+CHANGED = "coalesce(modified_datetime, created_datetime)"
+
+
+def upgrade():
+    op.create_index(
+        "ix_event_kid_id_changed", "event", ["kid_id", sa.text(CHANGED), "id"]
+    )
+    op.create_index(
+        "ix_kid_permission_parent_id_changed",
+        "kid_permission",
+        ["parent_id", sa.text(CHANGED)],
+    )
+    op.create_index("ix_enum_changed", "enum", [sa.text(CHANGED)])
+
+
+def downgrade():
+    op.drop_index("ix_enum_changed", table_name="enum")
+    op.drop_index("ix_kid_permission_parent_id_changed", table_name="kid_permission")
+    op.drop_index("ix_event_kid_id_changed", table_name="event")
@@ -0,0 +1,32 @@
+"""event note search
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16 17:00:00.000000
+
+GIN index over to_tsvector('simple', string_value) for live events
+with a note, serving GET /event/events/search. Built on the partitioned
+parent, so every monthly partition gets its own index.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_event_string_value_search",
+        "event",
+        [sa.text("to_tsvector('simple'::regconfig, string_value)")],
+        postgresql_using="gin",
+        postgresql_where=sa.text("is_deleted = false AND string_value IS NOT NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_event_string_value_search", table_name="event")
@@ -0,0 +1,25 @@
+"""kid sex
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16 18:00:00.000000
+
+Adds kid.sex ("M"/"F", nullable), which selects the WHO growth reference
+for growth percentiles.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("kid", sa.Column("sex", sa.String(length=1), nullable=True))
+
+
+def downgrade():
+    op.drop_column("kid", "sex")
@@ -0,0 +1,26 @@
+"""event default partition
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 09:00:00.000000
+
+Adds event_default, the DEFAULT partition of event. Rows for a month
+whose partition could not be created in time land there instead of
+failing the insert; partition maintenance moves them out once the month
+gets its own partition.
+"""
+from alembic import op
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE TABLE event_default PARTITION OF event DEFAULT")
+
+
+def downgrade():
+    op.execute("DROP TABLE event_default")
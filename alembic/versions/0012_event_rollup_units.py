@@ -0,0 +1,60 @@
+"""event rollup units
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17 11:00:00.000000
+
+Keys event_daily_rollup by unit as well, so readings in different units
+are no longer added together. unit_id is nullable, so the primary key
+becomes a NULLS NOT DISTINCT unique index and readings without a unit
+share one row. Existing rows mixed units and are rebuilt from event.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def rebuild(columns: str):
+    op.execute("DELETE FROM event_daily_rollup")
+    op.execute(
+        f"INSERT INTO event_daily_rollup ({columns}, event_count, float_sum, int_sum) "
+        f"SELECT {columns}, count(*), coalesce(sum(float_value), 0), "
+        "coalesce(sum(int_value), 0) FROM (SELECT *, CAST(timestamp AS date) AS day "
+        f"FROM event WHERE NOT is_deleted) AS live GROUP BY {columns}"
+    )
+
+
+def upgrade():
+    op.add_column("event_daily_rollup", sa.Column("unit_id", sa.Uuid()))
+    op.create_foreign_key(
+        "event_daily_rollup_unit_id_fkey",
+        "event_daily_rollup",
+        "enum",
+        ["unit_id"],
+        ["id"],
+    )
+    op.drop_constraint("event_daily_rollup_pkey", "event_daily_rollup")
+    op.create_index(
+        "ux_event_daily_rollup_key",
+        "event_daily_rollup",
+        ["kid_id", "event_type_id", "day", "unit_id"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+    rebuild("kid_id, event_type_id, day, unit_id")
+
+
+def downgrade():
+    op.drop_index("ux_event_daily_rollup_key", table_name="event_daily_rollup")
+    op.drop_column("event_daily_rollup", "unit_id")
+    rebuild("kid_id, event_type_id, day")
+    op.create_primary_key(
+        "event_daily_rollup_pkey",
+        "event_daily_rollup",
+        ["kid_id", "event_type_id", "day"],
+    )
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from dotenv import load_dotenv
+from typing import Any, Optional, Tuple
+import os
+import time
+
+
+load_dotenv()
+
+ACCESS_CACHE_TTL_SECONDS = float(os.getenv("ACCESS_CACHE_TTL_SECONDS", "30"))
+ACCESS_CACHE_MAX_SIZE = int(os.getenv("ACCESS_CACHE_MAX_SIZE", "10000"))
+
+
+class AccessCache:
+    # Per-parent results, expired after the TTL; past max_size the least
+    # recently used parent is evicted
+    def __init__(
+        self,
+        ttl_seconds: float = ACCESS_CACHE_TTL_SECONDS,
+        max_size: int = ACCESS_CACHE_MAX_SIZE,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, parent_id: str) -> Optional[Any]:
+        entry = self.entries.get(parent_id)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            self.entries.move_to_end(parent_id)
+            return entry[1]
+        self.misses += 1
+        self.entries.pop(parent_id, None)
+        return None
+
+    def set(self, parent_id: str, value: Any):
+        self.entries[parent_id] = (time.monotonic() + self.ttl_seconds, value)
+        self.entries.move_to_end(parent_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, parent_id: str):
+        self.entries.pop(parent_id, None)
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "max_size": self.max_size,
+        }
+
+
+access_cache = AccessCache()
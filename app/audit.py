@@ -0,0 +1,194 @@
+from dotenv import load_dotenv
+from sqlalchemy import exists, func, insert, select, update
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from app.database import get_engine
+from app.models import EnumHistory, EventHistory
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import os
+import uuid
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "1"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+# Beyond this many unflushed rows new audit rows are dropped and counted
+AUDIT_MAX_PENDING = int(os.getenv("AUDIT_MAX_PENDING", "100000"))
+# After this many failed flushes of a row its batch is written row by row,
+# and rows the database rejects on their own are logged and dropped
+AUDIT_MAX_ATTEMPTS = int(os.getenv("AUDIT_MAX_ATTEMPTS", "3"))
+
+# History model -> the column naming the audited entity
+HISTORY_KEYS = {EnumHistory: "enum_id", EventHistory: "event_id"}
+
+
+def close_superseded(model, keys: List[str]):
+    # Sets valid_to on every open version that now has a newer one
+    table = model.__table__
+    newer = table.alias("newer")
+    key = HISTORY_KEYS[model]
+    is_newer = (newer.c[key] == table.c[key]) & (
+        newer.c.valid_from > table.c.valid_from
+    )
+    return (
+        update(table)
+        .where(
+            table.c[key].in_(keys),
+            table.c.valid_to.is_(None),
+            exists().where(is_newer),
+        )
+        .values(
+            valid_to=select(func.min(newer.c.valid_from))
+            .where(is_newer)
+            .scalar_subquery()
+        )
+    )
+
+
+class AuditQueue:
+    def __init__(
+        self,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL_SECONDS,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        max_pending: int = AUDIT_MAX_PENDING,
+        max_attempts: int = AUDIT_MAX_ATTEMPTS,
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.pending: Dict[type, List[dict]] = {model: [] for model in HISTORY_KEYS}
+        # Row id -> failed flushes so far
+        self.attempts: Dict[str, int] = {}
+        self.size = 0
+        self.wakeup: Optional[asyncio.Event] = None
+        self.task: Optional[asyncio.Task] = None
+        self.flush_lock = asyncio.Lock()
+        self.recorded = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.batches = 0
+        self.failures = 0
+        self.rejected = 0
+
+    def record(self, model, row: dict):
+        if self.size >= self.max_pending:
+            self.dropped += 1
+            return
+        row.setdefault("id", str(uuid.uuid4()))
+        row.setdefault("valid_from", datetime.now(timezone.utc))
+        row.setdefault("valid_to", None)
+        row.setdefault("is_deleted", False)
+        self.pending[model].append(row)
+        self.size += 1
+        self.recorded += 1
+        if self.size >= self.batch_size and self.wakeup is not None:
+            self.wakeup.set()
+
+    async def write(self, batch: Dict[type, List[dict]]):
+        async with get_engine().begin() as conn:
+            for model, rows in batch.items():
+                if not rows:
+                    continue
+                await conn.execute(insert(model), rows)
+                keys = sorted({row[HISTORY_KEYS[model]] for row in rows})
+                await conn.execute(close_superseded(model, keys))
+
+    def requeue(self, batch: Dict[type, List[dict]]):
+        # In front of rows recorded since, so order is kept for the retry
+        for model, rows in batch.items():
+            self.pending[model][:0] = rows
+            self.size += len(rows)
+
+    async def write_each(self, batch: Dict[type, List[dict]]):
+        # One transaction per row, so a row the database rejects can't hold
+        # back the rest. Losing the connection isn't the row's fault: what
+        # is left goes back in the queue.
+        remaining = {model: list(rows) for model, rows in batch.items()}
+        for model, rows in remaining.items():
+            while rows:
+                row = rows[0]
+                try:
+                    await self.write({model: [row]})
+                except Exception as error:
+                    if isinstance(error, (OperationalError, InterfaceError)) or (
+                        isinstance(error, DBAPIError) and error.connection_invalidated
+                    ):
+                        self.requeue(remaining)
+                        return
+                    self.rejected += 1
+                    logger.exception("Dropping audit row %s", row["id"])
+                else:
+                    self.flushed += 1
+                rows.pop(0)
+                self.attempts.pop(row["id"], None)
+
+    async def flush(self):
+        async with self.flush_lock:
+            batch, self.pending = self.pending, {model: [] for model in HISTORY_KEYS}
+            size, self.size = self.size, 0
+            if not size:
+                return
+            try:
+                await self.write(batch)
+            except Exception:
+                self.failures += 1
+                logger.exception("Flushing %d audit rows failed", size)
+                rows = [row for model_rows in batch.values() for row in model_rows]
+                for row in rows:
+                    self.attempts[row["id"]] = self.attempts.get(row["id"], 0) + 1
+                if max(self.attempts[row["id"]] for row in rows) >= self.max_attempts:
+                    await self.write_each(batch)
+                else:
+                    self.requeue(batch)
+                return
+            for rows in batch.values():
+                for row in rows:
+                    self.attempts.pop(row["id"], None)
+            self.flushed += size
+            self.batches += 1
+
+    async def run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            # Shielded so stop() cancelling the loop can't drop a batch mid-write
+            await asyncio.shield(self.flush())
+
+    def start(self):
+        if self.task is None:
+            self.wakeup = asyncio.Event()
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+            self.wakeup = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.size,
+            "recorded": self.recorded,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
+
+
+audit_queue = AuditQueue()
@@ -1,38 +1,172 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from dotenv import load_dotenv
+from typing import Optional
 import os
+import time
 import urllib.parse
 
 
 load_dotenv()
 
 DB_USER = os.getenv("POSTGRES_USER")
-DB_PASSWORD = urllib.parse.quote_plus(os.getenv("POSTGRES_PASSWORD"))
+DB_PASSWORD = urllib.parse.quote_plus(os.getenv("POSTGRES_PASSWORD", ""))
 DB_HOST = os.getenv("DATABASE_URL")
 DB_PORT = os.getenv("DATABASE_PORT")
 DB_NAME = os.getenv("POSTGRES_DB")
 
-SQLALCHEMY_DATABASE_URL = (
-    f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+DB_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DATABASE_POOL_PRE_PING", "true").lower() == "true"
+# PgBouncer in transaction mode can't keep server-side prepared statements
+DB_PGBOUNCER = os.getenv("DATABASE_PGBOUNCER", "false").lower() == "true"
+
+# A full URL wins over the parts
+SQLALCHEMY_DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL") or (
+    f"postgresql+psycopg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+# Optional read-only streaming replica; unset sends every read to the primary
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float):
+        self.checkouts += 1
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    # Times how long each checkout waits for a free connection
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.timeouts += 1
+            raise
+        pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def get_pool_status(pool: InstrumentedPool) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checkouts": pool_stats.checkouts,
+        "timeouts": pool_stats.timeouts,
+        "wait_seconds_total": pool_stats.wait_seconds_total,
+        "wait_seconds_max": pool_stats.wait_seconds_max,
+        "wait_seconds_avg": (
+            pool_stats.wait_seconds_total / pool_stats.checkouts
+            if pool_stats.checkouts
+            else 0.0
+        ),
+    }
+
+
+def set_utc_time_zone(dbapi_connection, connection_record):
+    # DateTime columns hold naive UTC, and Postgres converts the aware
+    # datetimes bound into them with the session TimeZone. Pinned here,
+    # since the server default or a client PGTZ could be anything.
+    autocommit = dbapi_connection.autocommit
+    dbapi_connection.autocommit = True
+    cursor = dbapi_connection.cursor()
+    cursor.execute("SET TIME ZONE 'UTC'")
+    cursor.close()
+    dbapi_connection.autocommit = autocommit
+
+
+# The engines are created on first use (normally the app lifespan), so
+# importing the application opens no connections
+engine: Optional[AsyncEngine] = None
+replica_engine: Optional[AsyncEngine] = None
+
+# SessionLocal is bound to the engine by get_engine(); objects stay usable
+# after commit
+SessionLocal = async_sessionmaker(
+    class_=AsyncSession, autoflush=False, expire_on_commit=False
 )
+ReplicaSessionLocal = async_sessionmaker(
+    class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+def get_engine() -> AsyncEngine:
+    global engine
+    if engine is None:
+        engine = create_async_engine(
+            SQLALCHEMY_DATABASE_URL,
+            poolclass=InstrumentedPool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+            connect_args={"prepare_threshold": None} if DB_PGBOUNCER else {},
+        )
+        event.listen(engine.sync_engine, "connect", set_utc_time_zone)
+        SessionLocal.configure(bind=engine)
+    return engine
+
+
+def get_replica_engine() -> Optional[AsyncEngine]:
+    global replica_engine
+    if replica_engine is None and REPLICA_DATABASE_URL:
+        # Plain pool: the pool stats above describe the primary
+        replica_engine = create_async_engine(
+            REPLICA_DATABASE_URL,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING,
+            connect_args={"prepare_threshold": None} if DB_PGBOUNCER else {},
+            execution_options={"postgresql_readonly": True},
+        )
+        event.listen(replica_engine.sync_engine, "connect", set_utc_time_zone)
+        ReplicaSessionLocal.configure(bind=replica_engine)
+    return replica_engine
 
 
-# Create engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+async def dispose_engine():
+    global engine, replica_engine
+    if engine is not None:
+        await engine.dispose()
+        engine = None
+    if replica_engine is not None:
+        await replica_engine.dispose()
+        replica_engine = None
 
-# SessionLocal is configured with the engine
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Declarative base for ORM models
 Base = declarative_base()
 
 
 # Dependency for getting DB session
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
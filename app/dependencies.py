@@ -0,0 +1,8 @@
+from fastapi import Depends
+from app.database import get_db
+from app.replica import get_read_db
+
+
+db_dependency = Depends(get_db)
+# Replica-backed session for read-only routes; see app.replica
+read_db_dependency = Depends(get_read_db)
@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+from datetime import datetime
+from dotenv import load_dotenv
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+from app.models import Enum
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import os
+import time
+
+
+load_dotenv()
+
+# Bounds how long other workers serve enums changed elsewhere; writes in
+# this worker invalidate immediately
+ENUM_CACHE_TTL_SECONDS = float(os.getenv("ENUM_CACHE_TTL_SECONDS", "300"))
+
+CHANGED_KEY = "enum_cache_changed"
+
+
+@dataclass(frozen=True)
+class CachedEnum:
+    id: str
+    enum_name: str
+    name: str
+    created_datetime: datetime
+    modified_datetime: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, row: Enum) -> "CachedEnum":
+        return cls(
+            id=row.id,
+            enum_name=row.enum_name,
+            name=row.name,
+            created_datetime=row.created_datetime,
+            modified_datetime=row.modified_datetime,
+        )
+
+
+class EnumCache:
+    def __init__(self, ttl_seconds: float = ENUM_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.by_id: Dict[str, CachedEnum] = {}
+        self.by_name: Dict[Tuple[str, str], CachedEnum] = {}
+        self.ordered: List[CachedEnum] = []
+        self.loaded_at: Optional[float] = None
+        # Watermark of the loaded rows; identical data gives the same
+        # version in every worker
+        self.version = ""
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.lock = asyncio.Lock()
+
+    def is_fresh(self) -> bool:
+        return (
+            self.loaded_at is not None
+            and time.monotonic() - self.loaded_at < self.ttl_seconds
+        )
+
+    async def load(self, db: AsyncSession):
+        async with self.lock:
+            # Another request may have reloaded while this one waited
+            if self.is_fresh():
+                return
+            generation = self.generation
+            query = select(Enum).order_by(Enum.enum_name, Enum.name)
+            rows = (await db.execute(query)).scalars().all()
+
+            self.ordered = [CachedEnum.from_row(row) for row in rows]
+            self.by_id = {enum.id: enum for enum in self.ordered}
+            self.by_name = {(enum.enum_name, enum.name): enum for enum in self.ordered}
+            self.version = f"{len(rows)}:" + max(
+                (
+                    (row.modified_datetime or row.created_datetime).isoformat()
+                    for row in rows
+                ),
+                default="",
+            )
+            self.loads += 1
+            # An invalidation that raced the query leaves the cache stale
+            if generation == self.generation:
+                self.loaded_at = time.monotonic()
+
+    async def ensure_loaded(self, db: AsyncSession):
+        if self.is_fresh():
+            self.hits += 1
+        else:
+            self.misses += 1
+            await self.load(db)
+
+    async def all(self, db: AsyncSession) -> List[CachedEnum]:
+        await self.ensure_loaded(db)
+        return self.ordered
+
+    async def get(self, db: AsyncSession, id: str) -> Optional[CachedEnum]:
+        await self.ensure_loaded(db)
+        cached = self.by_id.get(id)
+        if cached:
+            return cached
+
+        # Unknown ids may have been written by another worker since the load
+        self.misses += 1
+        row = await db.get(Enum, id)
+        if row:
+            self.invalidate()
+            return CachedEnum.from_row(row)
+        return None
+
+    async def get_by_name(
+        self, db: AsyncSession, enum_name: str, name: str
+    ) -> Optional[CachedEnum]:
+        await self.ensure_loaded(db)
+        return self.by_name.get((enum_name, name))
+
+    def invalidate(self):
+        self.generation += 1
+        self.loaded_at = None
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "size": len(self.ordered),
+            "fresh": self.is_fresh(),
+        }
+
+
+enum_cache = EnumCache()
+
+
+# Any session that writes enums, through the ORM or a bulk statement,
+# invalidates the cache once its transaction commits
+@event.listens_for(Session, "after_flush")
+def note_enum_flush(session: Session, flush_context):
+    if any(
+        isinstance(row, Enum)
+        for row in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info[CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def note_enum_statement(orm_execute_state: ORMExecuteState):
+    mapper = orm_execute_state.bind_mapper
+    if orm_execute_state.statement.is_dml and mapper and mapper.class_ is Enum:
+        orm_execute_state.session.info[CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_after_commit(session: Session):
+    if session.info.pop(CHANGED_KEY, False):
+        enum_cache.invalidate()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def forget_after_rollback(session: Session, previous_transaction):
+    session.info.pop(CHANGED_KEY, None)
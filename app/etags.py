@@ -0,0 +1,46 @@
+from fastapi import Response, status
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Kid
+from typing import Iterable, Optional
+import hashlib
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode())
+    return f'W/"{digest.hexdigest()[:24]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+    )
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+async def bump_event_versions(db: AsyncSession, kid_ids: Iterable[str]):
+    # Sorted so concurrent writers lock kid rows in the same order;
+    # modified_datetime is pinned so the bump doesn't count as a kid edit
+    await db.execute(
+        update(Kid)
+        .where(Kid.id.in_(sorted(set(kid_ids))))
+        .values(
+            event_version=Kid.event_version + 1,
+            modified_datetime=Kid.modified_datetime,
+        )
+    )
@@ -0,0 +1,208 @@
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app import database
+from typing import Dict, Iterable, List, Optional, Set
+import asyncio
+import json
+import logging
+import os
+
+import psycopg
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+FEED_CHANNEL = "event_feed"
+FEED_QUEUE_SIZE = int(os.getenv("EVENT_FEED_QUEUE_SIZE", "100"))
+FEED_HEARTBEAT_SECONDS = float(os.getenv("EVENT_FEED_HEARTBEAT_SECONDS", "15"))
+FEED_RECONNECT_SECONDS = float(os.getenv("EVENT_FEED_RECONNECT_SECONDS", "2"))
+# Keeps each NOTIFY payload well under Postgres' 8000 byte limit
+FEED_MAX_IDS_PER_MESSAGE = 100
+# LISTEN needs a session-level connection, so point this past PgBouncer
+# when it runs in transaction mode; defaults to the application database
+FEED_DATABASE_URL = os.getenv("EVENT_FEED_DATABASE_URL")
+# "memory" keeps the feed within one process, e.g. for a single worker
+FEED_BROKER = os.getenv("EVENT_FEED_BROKER", "postgres")
+
+PENDING_KEY = "event_feed_pending"
+
+
+def feed_messages(kid_id: str, action: str, event_ids: List[str]) -> List[dict]:
+    return [
+        {
+            "kid_id": kid_id,
+            "action": action,
+            "event_ids": event_ids[start : start + FEED_MAX_IDS_PER_MESSAGE],
+        }
+        for start in range(0, len(event_ids), FEED_MAX_IDS_PER_MESSAGE)
+    ]
+
+
+class Subscription:
+    def __init__(self, kid_id: str, size: int = FEED_QUEUE_SIZE):
+        self.kid_id = kid_id
+        # None is the end-of-stream marker put on shutdown
+        self.queue: asyncio.Queue = asyncio.Queue(size)
+
+    def deliver(self, message: dict):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A reader this far behind refetches instead of replaying
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"kid_id": self.kid_id, "action": "resync"})
+
+
+class MemoryBroker:
+    # Fans messages out to this process's subscribers only
+    def __init__(self):
+        self.subscribers: Dict[str, Set[Subscription]] = {}
+        self.delivered = 0
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        for subscriptions in self.subscribers.values():
+            for subscription in subscriptions:
+                subscription.queue.put_nowait(None)
+
+    @asynccontextmanager
+    async def subscribe(self, kid_id: str):
+        subscription = Subscription(kid_id)
+        self.subscribers.setdefault(kid_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self.subscribers.get(kid_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscribers[kid_id]
+
+    def dispatch(self, messages: Iterable[dict]):
+        for message in messages:
+            for subscription in self.subscribers.get(message["kid_id"], ()):
+                subscription.deliver(message)
+                self.delivered += 1
+
+    def broadcast(self, action: str):
+        for kid_id in list(self.subscribers):
+            self.dispatch([{"kid_id": kid_id, "action": action}])
+
+    async def publish(self, db: AsyncSession, messages: List[dict]):
+        # Held on the session and dispatched by the after_commit hook below,
+        # so rolled-back writes are never announced
+        db.info.setdefault(PENDING_KEY, []).extend(messages)
+
+    def stats(self) -> dict:
+        return {
+            "broker": type(self).__name__,
+            "kids": len(self.subscribers),
+            "subscribers": sum(len(subs) for subs in self.subscribers.values()),
+            "delivered": self.delivered,
+        }
+
+
+class PostgresBroker(MemoryBroker):
+    # One LISTEN connection per worker feeds every local subscriber, so
+    # idle subscribers cost a queue each and no database connection
+    def __init__(self, url: str):
+        super().__init__()
+        url = make_url(url).set(drivername="postgresql")
+        self.conninfo = url.render_as_string(hide_password=False)
+        self.task: Optional[asyncio.Task] = None
+        self.reconnects = 0
+
+    async def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.listen())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        await super().stop()
+
+    async def listen(self):
+        connected_before = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.conninfo, autocommit=True
+                ) as conn:
+                    await conn.execute(f"LISTEN {FEED_CHANNEL}")
+                    if connected_before:
+                        # Notifications sent while disconnected are lost
+                        self.reconnects += 1
+                        self.broadcast("resync")
+                    connected_before = True
+                    async for notify in conn.notifies():
+                        self.dispatch([json.loads(notify.payload)])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event feed listener failed, reconnecting")
+                await asyncio.sleep(FEED_RECONNECT_SECONDS)
+
+    async def publish(self, db: AsyncSession, messages: List[dict]):
+        # NOTIFY is transactional: delivered on commit, dropped on rollback
+        if messages:
+            await db.execute(
+                select(
+                    *(
+                        func.pg_notify(FEED_CHANNEL, json.dumps(message))
+                        for message in messages
+                    )
+                )
+            )
+
+    def stats(self) -> dict:
+        return {**super().stats(), "reconnects": self.reconnects}
+
+
+@event.listens_for(Session, "after_commit")
+def dispatch_after_commit(session: Session):
+    messages = session.info.pop(PENDING_KEY, None)
+    if messages:
+        get_feed_broker().dispatch(messages)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def discard_after_rollback(session: Session, previous_transaction):
+    session.info.pop(PENDING_KEY, None)
+
+
+event_feed: Optional[MemoryBroker] = None
+
+
+def get_feed_broker() -> MemoryBroker:
+    # Built on first use, like the engine, so importing the app needs no
+    # database settings
+    global event_feed
+    if event_feed is None:
+        if FEED_BROKER == "postgres":
+            event_feed = PostgresBroker(
+                FEED_DATABASE_URL or database.SQLALCHEMY_DATABASE_URL
+            )
+        else:
+            event_feed = MemoryBroker()
+    return event_feed
+
+
+async def stop_feed_broker():
+    global event_feed
+    if event_feed is not None:
+        await event_feed.stop()
+        event_feed = None
@@ -0,0 +1,206 @@
+from sqlalchemy import false, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.enum_cache import enum_cache
+from app.models import Event, Kid
+from app.temporal import naive_utc
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+import csv
+import os
+
+import numpy as np
+
+
+# WHO Child Growth Standards (2006) LMS parameters per completed month:
+# weight-for-age 0-60 months, length-for-age 0-24, height-for-age 24-60
+WHO_LMS_PATH = os.path.join(os.path.dirname(__file__), "data", "who_lms.csv")
+DAYS_PER_MONTH = 30.4375
+# WHO measures recumbent length before 2 years and standing height after
+HEIGHT_FROM_DAYS = 731
+MAX_AGE_DAYS = 1856
+
+# (measure, table, first day, last day, restricted above 3 SD)
+GROWTH_INDICATORS = (
+    ("weight", "weight", 0, MAX_AGE_DAYS, True),
+    ("height", "length", 0, HEIGHT_FROM_DAYS - 1, False),
+    ("height", "height", HEIGHT_FROM_DAYS, MAX_AGE_DAYS, False),
+)
+# Factors to the tables' kg and cm, keyed by lower-cased unit enum name
+UNIT_FACTORS = {
+    "weight": {"kg": 1.0, "g": 0.001, "lb": 0.45359237, "oz": 0.028349523125},
+    "height": {"cm": 1.0, "mm": 0.1, "m": 100.0, "in": 2.54},
+}
+
+
+def load_lms_tables(path: str = WHO_LMS_PATH) -> Dict[Tuple[str, str], np.ndarray]:
+    # (table, sex) -> rows of (month, L, M, S)
+    tables: Dict[Tuple[str, str], list] = {}
+    with open(path, newline="") as lms_file:
+        for row in csv.DictReader(lms_file):
+            tables.setdefault((row["indicator"], row["sex"]), []).append(
+                [float(row[key]) for key in ("month", "l", "m", "s")]
+            )
+    return {key: np.array(sorted(rows)) for key, rows in tables.items()}
+
+
+lms_tables = load_lms_tables()
+
+
+def lms_at(table: str, sex: str, age_days: np.ndarray):
+    # Daily values interpolated linearly between the monthly rows
+    lms = lms_tables[(table, sex)]
+    months = age_days / DAYS_PER_MONTH
+    return tuple(
+        np.interp(months, lms[:, 0], lms[:, column]) for column in (1, 2, 3)
+    )
+
+
+def z_scores(values, lam, m, s, restricted: bool) -> np.ndarray:
+    z = (np.power(values / m, lam) - 1) / (lam * s)
+    if restricted:
+        # WHO's restricted method: past +-3 SD, distance is measured in
+        # units of the 2-3 SD gap, so skewed tails don't inflate scores
+        def sd(k):
+            return m * np.power(1 + lam * s * k, 1 / lam)
+
+        sd3, sd2, sd2neg, sd3neg = sd(3), sd(2), sd(-2), sd(-3)
+        z = np.where(z > 3, 3 + (values - sd3) / (sd3 - sd2), z)
+        z = np.where(z < -3, -3 + (values - sd3neg) / (sd2neg - sd3neg), z)
+    return z
+
+
+def normal_cdf(z: np.ndarray) -> np.ndarray:
+    # Abramowitz & Stegun 7.1.26 erf, absolute error under 1.5e-7
+    x = np.abs(z) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * x)
+    poly = t * (
+        0.254829592
+        + t
+        * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429)))
+    )
+    erf = 1 - poly * np.exp(-x * x)
+    return 0.5 * (1 + np.sign(z) * erf)
+
+
+def compute_growth(
+    measures: np.ndarray, sexes: np.ndarray, values: np.ndarray, age_days: np.ndarray
+):
+    # Vectorized over all rows: one interpolation and one z-score pass per
+    # (table, sex) group. Rows outside every group stay NaN / None.
+    z = np.full(len(values), np.nan)
+    tables = np.full(len(values), None, dtype=object)
+    measurable = ~np.isnan(age_days) & (values > 0)
+    for measure, table, first_day, last_day, restricted in GROWTH_INDICATORS:
+        for sex in ("M", "F"):
+            rows = (
+                measurable
+                & (measures == measure)
+                & (sexes == sex)
+                & (age_days >= first_day)
+                & (age_days <= last_day)
+            )
+            if rows.any():
+                lam, m, s = lms_at(table, sex, age_days[rows])
+                z[rows] = z_scores(values[rows], lam, m, s, restricted)
+                tables[rows] = table
+    return tables, z, 100 * normal_cdf(z)
+
+
+async def unit_factors(
+    db: AsyncSession, measures: Dict[str, str], unit_ids: Iterable[Optional[str]]
+) -> Dict[Tuple[str, Optional[str]], float]:
+    # Readings without a unit are taken to be in the tables' own units
+    factors = {}
+    for unit_id in unit_ids:
+        name = None
+        if unit_id:
+            unit = await enum_cache.get(db, unit_id)
+            name = unit.name.lower() if unit else ""
+        for measure in set(measures.values()):
+            factors[(measure, unit_id)] = (
+                1.0 if name is None else UNIT_FACTORS[measure].get(name, np.nan)
+            )
+    return factors
+
+
+async def growth_report(
+    db: AsyncSession,
+    kid_ids: List[str],
+    measures: Dict[str, str],
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> List[dict]:
+    # 'measures' maps event type ids to "weight" or "height"; one query
+    # loads every reading for the cohort along with the kids' birth data
+    query = (
+        select(
+            Event.id,
+            Event.kid_id,
+            Event.event_type_id,
+            Event.timestamp,
+            Event.float_value,
+            Event.unit_id,
+            Kid.birth_date,
+            Kid.sex,
+        )
+        .join(Kid, Kid.id == Event.kid_id)
+        .where(
+            Event.kid_id.in_(kid_ids),
+            Event.event_type_id.in_(measures),
+            Event.is_deleted == false(),
+            Event.float_value.isnot(None),
+        )
+        .order_by(Event.kid_id, Event.timestamp)
+    )
+    if since:
+        query = query.where(Event.timestamp >= since)
+    if until:
+        query = query.where(Event.timestamp < until)
+    rows = (await db.execute(query)).all()
+    if not rows:
+        return []
+
+    factors = await unit_factors(db, measures, {row.unit_id for row in rows})
+    row_measures = np.array([measures[row.event_type_id] for row in rows])
+    values = np.array([row.float_value for row in rows]) * np.array(
+        [factors[(measures[row.event_type_id], row.unit_id)] for row in rows]
+    )
+    timestamps = np.array(
+        [naive_utc(row.timestamp) for row in rows], dtype="datetime64[us]"
+    )
+    births = np.array(
+        [row.birth_date and naive_utc(row.birth_date) for row in rows],
+        dtype="datetime64[us]",
+    )
+    # Completed days, as in the WHO tables; NaN without a birth date
+    age_days = np.floor((timestamps - births) / np.timedelta64(1, "D"))
+    sexes = np.array([row.sex for row in rows], dtype=object)
+
+    tables, z, percentiles = compute_growth(row_measures, sexes, values, age_days)
+    missing = np.isnan(z)
+    z = np.where(missing, None, np.round(z, 2)).tolist()
+    percentiles = np.where(missing, None, np.round(percentiles, 1)).tolist()
+    values = np.where(np.isnan(values), None, values).tolist()
+    age_days = np.where(np.isnan(age_days), None, age_days).tolist()
+    return [
+        {
+            "event_id": row.id,
+            "kid_id": row.kid_id,
+            "timestamp": row.timestamp,
+            "measure": measure,
+            "indicator": f"{table}-for-age" if table else None,
+            "value": value,
+            "age_days": int(age) if age is not None else None,
+            "z_score": z_score,
+            "percentile": percentile,
+        }
+        for row, measure, table, value, age, z_score, percentile in zip(
+            rows,
+            row_measures.tolist(),
+            tables.tolist(),
+            values,
+            age_days,
+            z,
+            percentiles,
+        )
+    ]
@@ -1,15 +1,70 @@
-from fastapi import FastAPI
-import app.models as models
-from app.database import engine
-from app.routers import enum, event, parent, kid_permission, kid
+import time
 
-app = FastAPI()
+import_started = time.perf_counter()
 
-models.Base.metadata.create_all(bind=engine)
+from contextlib import asynccontextmanager  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from app.database import (  # noqa: E402
+    dispose_engine,
+    get_engine,
+    get_replica_engine,
+)
+from app import passwords  # noqa: E402
+from app.audit import audit_queue  # noqa: E402
+from app.feed import get_feed_broker, stop_feed_broker  # noqa: E402
+from app.metrics import instrument_engine, metrics_middleware  # noqa: E402
+from app.partitions import partition_maintenance  # noqa: E402
+from app.replica import recent_write_middleware, replica_monitor  # noqa: E402
+from app.routers import (  # noqa: E402
+    enum,
+    event,
+    growth,
+    parent,
+    kid_permission,
+    kid,
+    onboarding,
+    sync,
+    system,
+    metrics,
+)
 
 
+# Schema changes are applied by 'alembic upgrade head' as a separate
+# deployment step; startup only builds the (lazily connecting) engine
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    instrument_engine(get_engine())
+    if get_replica_engine() is not None:
+        instrument_engine(get_replica_engine())
+    audit_queue.start()
+    await get_feed_broker().start()
+    replica_monitor.start()
+    partition_maintenance.start()
+    app.state.startup["lifespan_seconds"] = time.perf_counter() - started
+    yield
+    await partition_maintenance.stop()
+    await replica_monitor.stop()
+    await stop_feed_broker()
+    await audit_queue.stop()
+    passwords.shutdown()
+    await dispose_engine()
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.middleware("http")(metrics_middleware)
+app.middleware("http")(recent_write_middleware)
+
 app.include_router(enum.router)
 app.include_router(event.router)
+app.include_router(growth.router)
 app.include_router(parent.router)
 app.include_router(kid_permission.router)
 app.include_router(kid.router)
+app.include_router(onboarding.router)
+app.include_router(sync.router)
+app.include_router(system.router)
+app.include_router(metrics.router)
+
+app.state.startup = {"import_seconds": time.perf_counter() - import_started}
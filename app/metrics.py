@@ -0,0 +1,189 @@
+from contextvars import ContextVar
+from dotenv import load_dotenv
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from typing import Dict, List, Optional, Tuple
+import logging
+import os
+import time
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 0 disables the warning
+QUERY_COUNT_BUDGET = int(os.getenv("QUERY_COUNT_BUDGET", "0"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.series: Dict[Labels, List[float]] = {}
+
+    def observe(self, labels: Labels, value: float):
+        # Per label set: one cumulative count per bucket, then +Inf, sum
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0.0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+        series[-2] += 1
+        series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, series in self.series.items():
+            for bound, count in zip(self.buckets, series):
+                lines.append(
+                    f"{self.name}_bucket{format_labels(labels + (('le', str(bound)),))}"
+                    f" {count:g}"
+                )
+            lines.append(
+                f"{self.name}_bucket{format_labels(labels + (('le', '+Inf'),))}"
+                f" {series[-2]:g}"
+            )
+            lines.append(f"{self.name}_count{format_labels(labels)} {series[-2]:g}")
+            lines.append(f"{self.name}_sum{format_labels(labels)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.series: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, value: float = 1):
+        self.series[labels] = self.series.get(labels, 0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in self.series.items():
+            lines.append(f"{self.name}{format_labels(labels)} {value:g}")
+        return lines
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{escape_label_value(value)}"' for key, value in labels)
+    return "{" + pairs + "}"
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency by route.", LATENCY_BUCKETS
+)
+request_total = Counter("http_requests_total", "Requests by route and status.")
+request_statements = Histogram(
+    "db_statements_per_request", "SQL statements issued per request.", STATEMENT_BUCKETS
+)
+request_db_time = Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL per request.", LATENCY_BUCKETS
+)
+over_budget_total = Counter(
+    "db_query_budget_exceeded_total", "Requests over the query-count budget."
+)
+
+
+class RequestStats:
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request", default=None
+)
+
+
+def instrument_engine(engine: AsyncEngine):
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        stats = current_request.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += time.perf_counter() - started
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None:
+            pending = context.connection.info.get("query_started")
+            if pending:
+                pending.pop()
+
+
+async def metrics_middleware(request: Request, call_next):
+    stats = RequestStats()
+    token = current_request.set(stats)
+    started = time.perf_counter()
+    status_code = "500"
+    try:
+        response = await call_next(request)
+        status_code = str(response.status_code)
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        current_request.reset(token)
+
+        # Label by route template so ids in the path don't explode cardinality
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        labels = (("method", request.method), ("route", path))
+        request_duration.observe(labels, elapsed)
+        request_total.inc(labels + (("status", status_code),))
+        request_statements.observe(labels, stats.statements)
+        request_db_time.observe(labels, stats.db_seconds)
+
+        if QUERY_COUNT_BUDGET and stats.statements > QUERY_COUNT_BUDGET:
+            over_budget_total.inc(labels)
+            logger.warning(
+                "%s %s issued %d SQL statements (budget %d) in %.1fms",
+                request.method,
+                path,
+                stats.statements,
+                QUERY_COUNT_BUDGET,
+                stats.db_seconds * 1000,
+            )
+
+
+def render_metrics(
+    extra_gauges: Optional[Dict[str, float]] = None,
+    extra_counters: Optional[Dict[str, float]] = None,
+) -> str:
+    lines = []
+    for metric in (
+        request_duration,
+        request_total,
+        request_statements,
+        request_db_time,
+        over_budget_total,
+    ):
+        lines.extend(metric.render())
+    for name, value in (extra_gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    for name, value in (extra_counters or {}).items():
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
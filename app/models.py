@@ -1,55 +1,94 @@
 from app.database import Base
+from app.search import search_document
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import Column, String, Boolean, DateTime, Float, ForeignKey, Integer
+from sqlalchemy import (
+    Column,
+    String,
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    Uuid,
+    false,
+    func,
+)
 from sqlalchemy.orm import relationship
 import uuid
 
 
+# Native uuid columns whose Python values stay canonical strings
+UuidStr = Uuid(as_uuid=False)
+
+
+# Passed as a callable so every row gets its own write time
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class Enum(Base):
     __tablename__ = "enum"
 
-    id = Column(String(100), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UuidStr, primary_key=True, default=lambda: str(uuid.uuid4()))
     enum_name = Column(String(100), nullable=False)
     name = Column(String(100), unique=True, nullable=False)
     created_datetime = Column(
-        DateTime, default=datetime.now(timezone.utc), nullable=False
+        DateTime, default=utc_now, nullable=False
     )
     modified_datetime = Column(
-        DateTime, default=None, onupdate=datetime.now(timezone.utc)
+        DateTime, default=None, onupdate=utc_now
+    )
+
+    __table_args__ = (
+        # Delta sync: rows changed since a watermark
+        Index("ix_enum_changed", func.coalesce(modified_datetime, created_datetime)),
     )
 
 
 class EnumHistory(Base):
     __tablename__ = "enum_history"
 
-    id = Column(String(100), primary_key=True, default=lambda: str(uuid.uuid4()))
-    enum_id = Column(String(100), nullable=False)
+    id = Column(UuidStr, primary_key=True, default=lambda: str(uuid.uuid4()))
+    enum_id = Column(UuidStr, nullable=False)
     enum_name = Column(String(100), nullable=False)
     name = Column(String(100), nullable=False)
     valid_from = Column(
-        DateTime, default=datetime.now(timezone.utc), nullable=False
+        DateTime, default=utc_now, nullable=False
     )
     valid_to = Column(
         DateTime
     )
     is_deleted = Column(Boolean, default=False, nullable=False)
 
+    __table_args__ = (
+        Index("ix_enum_history_enum_id_valid_from", "enum_id", "valid_from"),
+        # Answers "which versions were valid at t" for the whole enum set
+        Index(
+            "ix_enum_history_validity",
+            func.tsrange(valid_from, valid_to),
+            postgresql_using="gist",
+        ).ddl_if(dialect="postgresql"),
+    )
+
 
 class Parent(Base):
     __tablename__ = "parent"
 
-    id = Column(String(100), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UuidStr, primary_key=True, default=lambda: str(uuid.uuid4()))
     email = Column(String(100), unique=True, nullable=False)
     username = Column(String(100), unique=True)
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100))
     hashed_password = Column(String(100), nullable=False)
-    role = Column(String(100), ForeignKey("enum.id"))
+    role = Column(UuidStr, ForeignKey("enum.id"))
     created_datetime = Column(
-        DateTime, default=datetime.now(timezone.utc), nullable=False
+        DateTime, default=utc_now, nullable=False
     )
     modified_datetime = Column(
-        DateTime, default=None, onupdate=datetime.now(timezone.utc)
+        DateTime, default=None, onupdate=utc_now
     )
     is_deleted = Column(Boolean, default=False, nullable=False)
 
@@ -57,18 +96,22 @@ class Parent(Base):
 class Kid(Base):
     __tablename__ = "kid"
 
-    id = Column(String(100), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UuidStr, primary_key=True, default=lambda: str(uuid.uuid4()))
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100))
     birth_date = Column(DateTime)
-    parent_id = Column(String(100), ForeignKey("parent.id"))
+    # "M" or "F"; selects the WHO growth reference
+    sex = Column(String(1))
+    parent_id = Column(UuidStr, ForeignKey("parent.id"))
     created_datetime = Column(
-        DateTime, default=datetime.now(timezone.utc), nullable=False
+        DateTime, default=utc_now, nullable=False
     )
     modified_datetime = Column(
-        DateTime, default=None, onupdate=datetime.now(timezone.utc)
+        DateTime, default=None, onupdate=utc_now
     )
     is_deleted = Column(Boolean, default=False, nullable=False)
+    # Bumped on every write to the kid's events; feeds the timeline ETag
+    event_version = Column(BigInteger, default=0, server_default="0", nullable=False)
 
     parent = relationship("Parent", backref="kid")
 
@@ -76,30 +119,38 @@ class Kid(Base):
 class KidPermission(Base):
     __tablename__ = "kid_permission"
 
-    id = Column(String(100), primary_key=True, default=lambda: str(uuid.uuid4()))
-    kid_id = Column(String(100), ForeignKey("kid.id"), nullable=False)
-    parent_id = Column(String(100), ForeignKey("parent.id"), nullable=False)
-    role_id = Column(String(100), ForeignKey("enum.id"), nullable=False)
+    id = Column(UuidStr, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kid_id = Column(UuidStr, ForeignKey("kid.id"), nullable=False)
+    parent_id = Column(UuidStr, ForeignKey("parent.id"), nullable=False)
+    role_id = Column(UuidStr, ForeignKey("enum.id"), nullable=False)
     created_datetime = Column(
-        DateTime, default=datetime.now(timezone.utc), nullable=False
+        DateTime, default=utc_now, nullable=False
     )
     modified_datetime = Column(
-        DateTime, default=None, onupdate=datetime.now(timezone.utc)
+        DateTime, default=None, onupdate=utc_now
     )
     is_deleted = Column(Boolean, default=False, nullable=False)
 
     kid = relationship("Kid", backref="kid_permission")
     parent = relationship("Parent", backref="kid_permission")
 
+    __table_args__ = (
+        Index(
+            "ix_kid_permission_parent_id_changed",
+            "parent_id",
+            func.coalesce(modified_datetime, created_datetime),
+        ),
+    )
+
 
 class KidInvitation(Base):
     __tablename__ = "kid_invitation"
 
-    id = Column(String(100), primary_key=True, default=lambda: str(uuid.uuid4()))
-    kid_id = Column(String(100), ForeignKey("kid.id"), nullable=False)
-    inviter_parent_id = Column(String(100), ForeignKey("parent.id"), nullable=False)
+    id = Column(UuidStr, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kid_id = Column(UuidStr, ForeignKey("kid.id"), nullable=False)
+    inviter_parent_id = Column(UuidStr, ForeignKey("parent.id"), nullable=False)
     invited_email = Column(String(100), nullable=False)
-    role_id = Column(String(100), ForeignKey("enum.id"), nullable=False)
+    role_id = Column(UuidStr, ForeignKey("enum.id"), nullable=False)
     invitation_token = Column(String(100), unique=True, nullable=False)
     expiration_datetime = Column(
         DateTime,
@@ -108,7 +159,7 @@ class KidInvitation(Base):
     )
     is_accepted = Column(Boolean, default=False, nullable=False)
     created_datetime = Column(
-        DateTime, default=datetime.now(timezone.utc), nullable=False
+        DateTime, default=utc_now, nullable=False
     )
     accepted_datetime = Column(DateTime, default=None)
     is_deleted = Column(Boolean, default=False, nullable=False)
@@ -120,22 +171,114 @@ class KidInvitation(Base):
 class Event(Base):
     __tablename__ = "event"
 
-    id = Column(String(100), primary_key=True, default=lambda: str(uuid.uuid4()))
-    kid_id = Column(String(100), ForeignKey("kid.id"), nullable=False)
-    event_type_id = Column(String(100), ForeignKey("enum.id"), nullable=False)
-    timestamp = Column(DateTime, nullable=False)
+    id = Column(UuidStr, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kid_id = Column(UuidStr, ForeignKey("kid.id"), nullable=False)
+    event_type_id = Column(UuidStr, ForeignKey("enum.id"), nullable=False)
+    # Part of the table's primary key because Postgres requires the
+    # partition key in it; the ORM still identifies events by id alone
+    timestamp = Column(DateTime, primary_key=True, nullable=False)
     string_value = Column(String(255))
     float_value = Column(Float)
     bool_value = Column(Boolean)
     int_value = Column(Integer)
-    unit_id = Column(String(100), ForeignKey("enum.id"))
+    unit_id = Column(UuidStr, ForeignKey("enum.id"))
 
     created_datetime = Column(
-        DateTime, default=datetime.now(timezone.utc), nullable=False
+        DateTime, default=utc_now, nullable=False
     )
     modified_datetime = Column(
-        DateTime, default=None, onupdate=datetime.now(timezone.utc)
+        DateTime, default=None, onupdate=utc_now
     )
     is_deleted = Column(Boolean, default=False, nullable=False)
 
     kid = relationship("Kid", backref="event")
+
+    __table_args__ = (
+        # Serves the per-kid timeline; only live rows are ever paged through
+        Index(
+            "ix_event_kid_id_timestamp",
+            "kid_id",
+            "timestamp",
+            "id",
+            postgresql_where=is_deleted == false(),
+        ),
+        # Note search; per-kid scoping comes from combining it with the
+        # timeline index
+        Index(
+            "ix_event_string_value_search",
+            search_document(string_value),
+            postgresql_using="gin",
+            postgresql_where=(is_deleted == false()) & string_value.isnot(None),
+        ).ddl_if(dialect="postgresql"),
+        # Delta sync: a kid's changes, tombstones included, since a watermark
+        Index(
+            "ix_event_kid_id_changed",
+            "kid_id",
+            func.coalesce(modified_datetime, created_datetime),
+            "id",
+        ),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
+
+class EventHistory(Base):
+    __tablename__ = "event_history"
+
+    id = Column(UuidStr, primary_key=True, default=lambda: str(uuid.uuid4()))
+    event_id = Column(UuidStr, nullable=False)
+    kid_id = Column(UuidStr, nullable=False)
+    event_type_id = Column(UuidStr, nullable=False)
+    timestamp = Column(DateTime, nullable=False)
+    string_value = Column(String(255))
+    float_value = Column(Float)
+    bool_value = Column(Boolean)
+    int_value = Column(Integer)
+    unit_id = Column(UuidStr)
+    valid_from = Column(DateTime, nullable=False)
+    valid_to = Column(DateTime)
+    is_deleted = Column(Boolean, default=False, nullable=False)
+
+    __table_args__ = (
+        Index("ix_event_history_event_id_valid_from", "event_id", "valid_from"),
+    )
+
+
+class EventDailyRollup(Base):
+    __tablename__ = "event_daily_rollup"
+
+    kid_id = Column(UuidStr, ForeignKey("kid.id"), nullable=False)
+    event_type_id = Column(UuidStr, ForeignKey("enum.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    # Sums are kept per unit; readings without one share the NULL row
+    unit_id = Column(UuidStr, ForeignKey("enum.id"))
+    event_count = Column(Integer, default=0, nullable=False)
+    float_sum = Column(Float, default=0, nullable=False)
+    int_sum = Column(BigInteger, default=0, nullable=False)
+
+    __table_args__ = (
+        Index(
+            "ux_event_daily_rollup_key",
+            "kid_id",
+            "event_type_id",
+            "day",
+            "unit_id",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    __mapper_args__ = {"primary_key": [kid_id, event_type_id, day, unit_id]}
+
+
+class EventSeriesBucket(Base):
+    __tablename__ = "event_series_bucket"
+
+    kid_id = Column(UuidStr, ForeignKey("kid.id"), primary_key=True)
+    event_type_id = Column(UuidStr, ForeignKey("enum.id"), primary_key=True)
+    # Bucket width in seconds
+    resolution = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    value_count = Column(Integer, nullable=False)
+    value_sum = Column(Float, nullable=False)
+    value_min = Column(Float, nullable=False)
+    value_max = Column(Float, nullable=False)
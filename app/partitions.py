@@ -0,0 +1,263 @@
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional, Set
+import argparse
+import asyncio
+import gzip
+import logging
+import os
+import re
+
+from app.database import dispose_engine, get_engine
+
+
+logger = logging.getLogger(__name__)
+
+PARTITION_MONTHS_AHEAD = 3
+PARTITION_NAME = re.compile(r"^event_p(\d{4})_(\d{2})$")
+DEFAULT_PARTITION = "event_default"
+# Partition DDL gives up after this rather than queue behind a long
+# reader of event_default and stall every write queued behind it
+PARTITION_LOCK_TIMEOUT_SECONDS = float(
+    os.getenv("PARTITION_LOCK_TIMEOUT_SECONDS", "1")
+)
+PARTITION_MAINTENANCE_INTERVAL_SECONDS = float(
+    os.getenv("PARTITION_MAINTENANCE_INTERVAL_SECONDS", "3600")
+)
+LOCK_NOT_AVAILABLE = "55P03"
+
+# Months known to have a partition, so the write path only pays for DDL
+# once. Per process: partition maintenance reloads it from the catalog,
+# and until then a stale entry only sends rows to event_default.
+known_partitions: Set[date] = set()
+
+
+def month_start(value: datetime) -> date:
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"event_p{month.year:04d}_{month.month:02d}"
+
+
+async def ensure_event_partitions(
+    months: Iterable[date], bind: Optional[AsyncEngine] = None
+) -> bool:
+    bind = bind or get_engine()
+    missing = sorted(set(months) - known_partitions)
+    if not missing:
+        return True
+
+    # Own short transaction, serialized across workers by an advisory lock.
+    # On a lock timeout the rows go to event_default until maintenance
+    # creates the month, so writes never wait long or fail on it.
+    try:
+        async with bind.begin() as conn:
+            timeout_ms = int(PARTITION_LOCK_TIMEOUT_SECONDS * 1000)
+            await conn.execute(text(f"SET LOCAL lock_timeout = {timeout_ms}"))
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext('event_partitions'))")
+            )
+            for month in missing:
+                await create_partition(conn, month)
+    except OperationalError as error:
+        if getattr(error.orig, "sqlstate", None) != LOCK_NOT_AVAILABLE:
+            raise
+        logger.warning(
+            "Timed out creating event partitions %s, writing to %s",
+            ", ".join(partition_name(month) for month in missing),
+            DEFAULT_PARTITION,
+        )
+        return False
+    known_partitions.update(missing)
+    return True
+
+
+async def create_partition(conn: AsyncConnection, month: date):
+    name = partition_name(month)
+    if (await conn.execute(text(f"SELECT to_regclass('{name}')"))).scalar():
+        return
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    # Built detached and then attached: ATTACH takes a SHARE UPDATE
+    # EXCLUSIVE lock on event, where CREATE ... PARTITION OF would block
+    # all reads and writes. Rows that went to the default partition for
+    # this month move over first, or the attach would fail on them.
+    await conn.execute(text(f"CREATE TABLE {name} (LIKE event INCLUDING DEFAULTS)"))
+    await conn.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE timestamp >= '{start}' AND timestamp < '{end}' RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )
+    )
+    await conn.execute(
+        text(
+            f"ALTER TABLE event ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    )
+
+
+async def default_partition_months(bind: Optional[AsyncEngine] = None) -> List[date]:
+    bind = bind or get_engine()
+    async with bind.connect() as conn:
+        months = (
+            await conn.execute(
+                text(
+                    "SELECT DISTINCT CAST(date_trunc('month', timestamp) AS date) "
+                    f"FROM {DEFAULT_PARTITION}"
+                )
+            )
+        ).scalars()
+        return sorted(months)
+
+
+async def list_event_partitions(bind: Optional[AsyncEngine] = None) -> List[date]:
+    bind = bind or get_engine()
+    async with bind.connect() as conn:
+        names = (
+            await conn.execute(
+                text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "WHERE parent.relname = 'event'"
+                )
+            )
+        ).scalars()
+        months = []
+        for name in names:
+            match = PARTITION_NAME.match(name)
+            if match:
+                months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+async def archive_partition(
+    month: date, directory: str, bind: Optional[AsyncEngine] = None
+):
+    bind = bind or get_engine()
+    name = partition_name(month)
+    path = os.path.join(directory, f"{name}.csv.gz")
+
+    # One transaction: COPY streams the still attached partition into the
+    # compressed file, and only then is it detached and dropped. A failure
+    # anywhere rolls back and leaves the partition in place.
+    try:
+        async with bind.begin() as conn:
+            await conn.execute(text(f"LOCK TABLE {name} IN SHARE MODE"))
+            raw = await conn.get_raw_connection()
+            cursor = raw.driver_connection.cursor()
+            with gzip.open(path, "wb") as archive:
+                async with cursor.copy(
+                    f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)"
+                ) as copy:
+                    async for chunk in copy:
+                        archive.write(chunk)
+            await conn.execute(text(f"ALTER TABLE event DETACH PARTITION {name}"))
+            await conn.execute(text(f"DROP TABLE {name}"))
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    known_partitions.discard(month)
+    return path
+
+
+async def archive_old_partitions(
+    older_than: date, directory: str, bind: Optional[AsyncEngine] = None
+) -> List[str]:
+    bind = bind or get_engine()
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for month in await list_event_partitions(bind):
+        if add_months(month, 1) <= older_than:
+            paths.append(await archive_partition(month, directory, bind))
+    return paths
+
+
+async def maintain_partitions(
+    months_ahead: int = PARTITION_MONTHS_AHEAD, bind: Optional[AsyncEngine] = None
+) -> bool:
+    # Creates the upcoming months ahead of the write path and moves rows
+    # out of the default partition into their own month. The reload lets
+    # this process see months archived by another one.
+    bind = bind or get_engine()
+    known_partitions.clear()
+    known_partitions.update(await list_event_partitions(bind))
+    current = month_start(datetime.now(timezone.utc))
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+    months.update(await default_partition_months(bind))
+    return await ensure_event_partitions(months, bind)
+
+
+class PartitionMaintenance:
+    def __init__(
+        self, interval_seconds: float = PARTITION_MAINTENANCE_INTERVAL_SECONDS
+    ):
+        self.interval_seconds = interval_seconds
+        self.task: Optional[asyncio.Task] = None
+
+    async def run(self):
+        while True:
+            try:
+                await maintain_partitions()
+            except Exception:
+                logger.exception("Event partition maintenance failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+
+partition_maintenance = PartitionMaintenance()
+
+
+async def main(args):
+    try:
+        if args.command == "create":
+            if not await maintain_partitions(args.months_ahead):
+                raise SystemExit("timed out waiting for locks on event")
+        else:
+            cutoff = add_months(
+                month_start(datetime.now(timezone.utc)), -args.older_than_months
+            )
+            for path in await archive_old_partitions(cutoff, args.directory):
+                print(f"archived {path}")
+    finally:
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage monthly event partitions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser(
+        "create",
+        help="Create upcoming partitions and move rows out of the default one.",
+    )
+    create.add_argument("--months-ahead", type=int, default=PARTITION_MONTHS_AHEAD)
+    archive = commands.add_parser(
+        "archive", help="Detach old partitions and archive them as csv.gz files."
+    )
+    archive.add_argument("--older-than-months", type=int, default=24)
+    archive.add_argument("--directory", default="archive")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+from passlib.context import CryptContext
+from typing import Optional
+import asyncio
+import os
+
+
+load_dotenv()
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_CONCURRENCY = int(
+    os.getenv("PASSWORD_HASH_MAX_CONCURRENCY", str(PASSWORD_HASH_WORKERS * 2))
+)
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_HASH_QUEUE_TIMEOUT", "5"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+# Executed inside the pool's worker processes
+def hash_in_worker(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_in_worker(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+
+executor: Optional[ProcessPoolExecutor] = None
+slots: Optional[asyncio.Semaphore] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global executor
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+    return executor
+
+
+def get_slots() -> asyncio.Semaphore:
+    global slots
+    if slots is None:
+        slots = asyncio.Semaphore(PASSWORD_HASH_MAX_CONCURRENCY)
+    return slots
+
+
+async def run_in_pool(function, *args):
+    # Bound the backlog: callers wait at most the queue timeout for a slot
+    # and are rejected instead of piling up behind a saturated pool
+    semaphore = get_slots()
+    try:
+        await asyncio.wait_for(semaphore.acquire(), PASSWORD_HASH_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise PasswordHasherBusy()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), function, *args)
+    finally:
+        semaphore.release()
+
+
+async def hash_password(password: str) -> str:
+    return await run_in_pool(hash_in_worker, password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await run_in_pool(verify_in_worker, password, hashed_password)
+
+
+def shutdown():
+    global executor
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+        executor = None
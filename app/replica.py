@@ -0,0 +1,170 @@
+from dotenv import load_dotenv
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.database import (
+    ReplicaSessionLocal,
+    SessionLocal,
+    get_engine,
+    get_replica_engine,
+)
+from typing import Optional
+import asyncio
+import logging
+import math
+import os
+import time
+
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Above this lag reads go back to the primary. It is also how long a
+# client reads from the primary after writing: a healthy replica is
+# never further behind than that
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_HEALTH_INTERVAL_SECONDS = float(
+    os.getenv("REPLICA_HEALTH_INTERVAL_SECONDS", "2")
+)
+REPLICA_HEALTH_TIMEOUT_SECONDS = float(os.getenv("REPLICA_HEALTH_TIMEOUT_SECONDS", "1"))
+
+RECENT_WRITE_COOKIE = "recent_write"
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+PRIMARY_LSN_QUERY = text("SELECT pg_current_wal_lsn()")
+# Zero once the standby has replayed everything the primary had written
+# when the check started. Comparing with its own received position instead
+# would read zero forever after the WAL receiver disconnects. NULL (nothing
+# replayed yet) counts as unhealthy.
+LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_replay_lsn() >= CAST(:primary_lsn AS pg_lsn) THEN 0"
+    " ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+    " END"
+)
+
+
+class ReplicaMonitor:
+    def __init__(
+        self,
+        max_lag_seconds: float = REPLICA_MAX_LAG_SECONDS,
+        interval_seconds: float = REPLICA_HEALTH_INTERVAL_SECONDS,
+    ):
+        self.max_lag_seconds = max_lag_seconds
+        self.interval_seconds = interval_seconds
+        # Reads stay on the primary until the first check passes
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.failures = 0
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.task: Optional[asyncio.Task] = None
+
+    async def measure_lag(self, engine: AsyncEngine) -> Optional[float]:
+        async with get_engine().connect() as conn:
+            primary_lsn = (await conn.execute(PRIMARY_LSN_QUERY)).scalar()
+        async with engine.connect() as conn:
+            lag = (
+                await conn.execute(LAG_QUERY, {"primary_lsn": primary_lsn})
+            ).scalar()
+        return None if lag is None else float(lag)
+
+    async def check(self):
+        engine = get_replica_engine()
+        if engine is None:
+            return
+        try:
+            self.lag_seconds = await asyncio.wait_for(
+                self.measure_lag(engine), REPLICA_HEALTH_TIMEOUT_SECONDS
+            )
+        except Exception:
+            if self.healthy:
+                logger.exception("Replica health check failed, reading from primary")
+            self.failures += 1
+            self.lag_seconds = None
+        self.checked_at = time.time()
+        healthy = (
+            self.lag_seconds is not None and self.lag_seconds <= self.max_lag_seconds
+        )
+        if self.healthy and not healthy and self.lag_seconds is not None:
+            logger.warning(
+                "Replica lag %.1fs over %.1fs, reading from primary",
+                self.lag_seconds,
+                self.max_lag_seconds,
+            )
+        self.healthy = healthy
+
+    async def run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self):
+        if self.task is None and get_replica_engine() is not None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.healthy = False
+
+    def stats(self) -> dict:
+        return {
+            "configured": get_replica_engine() is not None,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "checked_at": self.checked_at,
+            "failures": self.failures,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+
+
+replica_monitor = ReplicaMonitor()
+
+
+def wrote_recently(request: Request) -> bool:
+    marker = request.cookies.get(RECENT_WRITE_COOKIE)
+    if not marker:
+        return False
+    try:
+        return time.time() - float(marker) < replica_monitor.max_lag_seconds
+    except ValueError:
+        return False
+
+
+def read_sessionmaker(request: Request):
+    # The replica while it is healthy, unless this client wrote within the
+    # lag bound and so might not see its own write there
+    if replica_monitor.healthy and not wrote_recently(request):
+        replica_monitor.replica_reads += 1
+        return ReplicaSessionLocal
+    replica_monitor.primary_reads += 1
+    return SessionLocal
+
+
+async def get_read_db(request: Request):
+    async with read_sessionmaker(request)() as db:
+        yield db
+
+
+async def recent_write_middleware(request: Request, call_next):
+    response = await call_next(request)
+    if request.method not in READ_METHODS and response.status_code < 400:
+        response.set_cookie(
+            RECENT_WRITE_COOKIE,
+            f"{time.time():.3f}",
+            max_age=math.ceil(replica_monitor.max_lag_seconds),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
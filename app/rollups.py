@@ -0,0 +1,121 @@
+from sqlalchemy import Date, cast, delete, false, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import SessionLocal, dispose_engine, get_engine
+from app.models import Event, EventDailyRollup
+from datetime import date, datetime, timezone
+from typing import Iterable, Optional
+import argparse
+import asyncio
+
+
+def event_day(timestamp: datetime) -> date:
+    # Rollup days are UTC days, matching how timestamps are stored
+    if timestamp.tzinfo:
+        timestamp = timestamp.astimezone(timezone.utc)
+    return timestamp.date()
+
+
+def rollup_delta(event, sign: int = 1) -> dict:
+    return {
+        "kid_id": event.kid_id,
+        "event_type_id": event.event_type_id,
+        "day": event_day(event.timestamp),
+        "unit_id": event.unit_id,
+        "event_count": sign,
+        "float_sum": sign * (event.float_value or 0),
+        "int_sum": sign * (event.int_value or 0),
+    }
+
+
+async def apply_rollup_deltas(db: AsyncSession, deltas: Iterable[dict]):
+    # Collapse deltas per key so each rollup row is upserted once
+    merged = {}
+    for delta in deltas:
+        key = (
+            delta["kid_id"],
+            delta["event_type_id"],
+            delta["day"],
+            delta["unit_id"],
+        )
+        if key in merged:
+            for field in ("event_count", "float_sum", "int_sum"):
+                merged[key][field] += delta[field]
+        else:
+            merged[key] = dict(delta)
+    if not merged:
+        return
+
+    statement = insert(EventDailyRollup).values(list(merged.values()))
+    statement = statement.on_conflict_do_update(
+        index_elements=["kid_id", "event_type_id", "day", "unit_id"],
+        set_={
+            "event_count": EventDailyRollup.event_count
+            + statement.excluded.event_count,
+            "float_sum": EventDailyRollup.float_sum + statement.excluded.float_sum,
+            "int_sum": EventDailyRollup.int_sum + statement.excluded.int_sum,
+        },
+    )
+    await db.execute(statement)
+
+
+async def add_event_to_rollups(db: AsyncSession, event):
+    await apply_rollup_deltas(db, [rollup_delta(event)])
+
+
+async def remove_event_from_rollups(db: AsyncSession, event):
+    await apply_rollup_deltas(db, [rollup_delta(event, sign=-1)])
+
+
+async def rebuild_rollups(db: AsyncSession, kid_id: Optional[str] = None):
+    clear = delete(EventDailyRollup)
+    day = cast(Event.timestamp, Date)
+    aggregate = (
+        select(
+            Event.kid_id,
+            Event.event_type_id,
+            day,
+            Event.unit_id,
+            func.count(),
+            func.coalesce(func.sum(Event.float_value), 0),
+            func.coalesce(func.sum(Event.int_value), 0),
+        )
+        .where(Event.is_deleted == false())
+        .group_by(Event.kid_id, Event.event_type_id, day, Event.unit_id)
+    )
+    if kid_id:
+        clear = clear.where(EventDailyRollup.kid_id == kid_id)
+        aggregate = aggregate.where(Event.kid_id == kid_id)
+
+    await db.execute(clear)
+    await db.execute(
+        insert(EventDailyRollup).from_select(
+            [
+                "kid_id",
+                "event_type_id",
+                "day",
+                "unit_id",
+                "event_count",
+                "float_sum",
+                "int_sum",
+            ],
+            aggregate,
+        )
+    )
+    await db.commit()
+
+
+async def main(kid_id: Optional[str] = None):
+    get_engine()
+    async with SessionLocal() as db:
+        await rebuild_rollups(db, kid_id)
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuild daily event rollups from the event table."
+    )
+    parser.add_argument("--kid-id", help="Only rebuild rollups for this kid.")
+    args = parser.parse_args()
+    asyncio.run(main(args.kid_id))
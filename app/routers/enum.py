@@ -1,11 +1,17 @@
-from fastapi import APIRouter, status, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, status, HTTPException, Header, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.future import select
+from sqlalchemy import DateTime, false, literal, select, union_all
 from typing import List, Optional
 from pydantic import BaseModel, Field
-from app.database import SessionLocal
+from app.audit import audit_queue
+from app.dependencies import db_dependency, read_db_dependency
+from app.enum_cache import enum_cache
+from app.etags import etag_matches, make_etag, not_modified, set_etag
 from app.models import Enum, EnumHistory
+from app.temporal import naive_utc, versions_at
+from app.types import UUIDStr
 from datetime import datetime, timezone
 import uuid
 
@@ -15,16 +21,7 @@ router = APIRouter(
     responses={404: {"description": "Not found"}}
 )
 
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-db_dependency = Depends(get_db)
+MAX_AS_OF_TIMESTAMPS = 100
 
 
 class EnumCreateRequest(BaseModel):
@@ -56,24 +53,23 @@ class EnumHistoryResponse(BaseModel):
         orm_mode = True
 
 
-def update_enum_history(
-    db: Session, enum: Enum, is_deleted: bool = False
-):
-    db.query(EnumHistory).filter(
-        EnumHistory.enum_id == enum.id, EnumHistory.valid_to.is_(None)
-    ).update({"valid_to": datetime.now(timezone.utc)})
+class EnumSetAsOfResponse(BaseModel):
+    at: datetime
+    enums: List[EnumHistoryResponse]
 
-    new_history = EnumHistory(
-        id=str(uuid.uuid4()),
-        enum_id=enum.id,
-        enum_name=enum.enum_name,
-        name=enum.name,
-        valid_from=datetime.now(timezone.utc),
-        valid_to=None,
-        is_deleted=is_deleted,
+
+def record_enum_history(enum: Enum, is_deleted: bool = False):
+    # Written behind by the audit queue; the previous version's valid_to is
+    # closed when the batch is flushed
+    audit_queue.record(
+        EnumHistory,
+        {
+            "enum_id": enum.id,
+            "enum_name": enum.enum_name,
+            "name": enum.name,
+            "is_deleted": is_deleted,
+        },
     )
-    db.add(new_history)
-    db.commit()
 
 
 @router.get(
@@ -82,21 +78,89 @@ def update_enum_history(
 async def get_all_enums(
     enum_name: Optional[str] = None,
     name: Optional[str] = None,
-    db: Session = db_dependency,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = db_dependency,
 ):
-    query = select(Enum)
+    results = await enum_cache.all(db)
+    etag = make_etag("enums", enum_cache.version, enum_name, name)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
     if enum_name:
-        query = query.where(Enum.enum_name == enum_name)
+        results = [result for result in results if result.enum_name == enum_name]
     if name:
-        query = query.where(Enum.name == name)
+        results = [result for result in results if result.name == name]
+    # Cached entries are frozen dataclasses, which orjson encodes natively
+    response = ORJSONResponse(results)
+    set_etag(response, etag)
+    return response
 
-    results = db.execute(query).scalars().all()
-    return results
+
+@router.get("/cache/stats", status_code=status.HTTP_200_OK)
+async def get_enum_cache_stats():
+    return enum_cache.stats()
+
+
+@router.get(
+    "/enums/as-of",
+    response_model=List[EnumHistoryResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_enums_as_of(
+    at: datetime,
+    enum_name: Optional[str] = None,
+    db: AsyncSession = read_db_dependency,
+):
+    query = (
+        select(EnumHistory)
+        .where(
+            versions_at(EnumHistory, naive_utc(at)),
+            EnumHistory.is_deleted == false(),
+        )
+        .order_by(EnumHistory.enum_name, EnumHistory.name)
+    )
+    if enum_name:
+        query = query.where(EnumHistory.enum_name == enum_name)
+    return (await db.execute(query)).scalars().all()
+
+
+@router.get(
+    "/enums/as-of/batch",
+    response_model=List[EnumSetAsOfResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_enums_as_of_batch(
+    at: List[datetime] = Query(..., max_length=MAX_AS_OF_TIMESTAMPS),
+    enum_name: Optional[str] = None,
+    db: AsyncSession = read_db_dependency,
+):
+    # One query for every timestamp: each point is joined to the versions
+    # valid at it
+    timestamps = sorted({naive_utc(value) for value in at})
+    points = union_all(
+        *(select(literal(value, DateTime).label("at")) for value in timestamps)
+    ).subquery("points")
+    query = (
+        select(points.c.at, EnumHistory)
+        .join(
+            EnumHistory,
+            versions_at(EnumHistory, points.c.at),
+        )
+        .where(EnumHistory.is_deleted == false())
+        .order_by(points.c.at, EnumHistory.enum_name, EnumHistory.name)
+    )
+    if enum_name:
+        query = query.where(EnumHistory.enum_name == enum_name)
+
+    enums_at = {value: [] for value in timestamps}
+    for point, history in (await db.execute(query)).all():
+        enums_at[point].append(history)
+    return [{"at": value, "enums": enums} for value, enums in enums_at.items()]
 
 
 @router.get("/enums/{id}", response_model=EnumResponse, status_code=status.HTTP_200_OK)
-async def get_enum(id: str, db: Session = db_dependency):
-    result = db.get(Enum, id)
+async def get_enum(id: UUIDStr, db: AsyncSession = db_dependency):
+    result = await enum_cache.get(db, id)
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -106,7 +170,7 @@ async def get_enum(id: str, db: Session = db_dependency):
 
 
 @router.post("/enums", response_model=EnumResponse, status_code=status.HTTP_201_CREATED)
-async def post_enum(enum_request: EnumCreateRequest, db: Session = db_dependency):
+async def post_enum(enum_request: EnumCreateRequest, db: AsyncSession = db_dependency):
     new_enum = Enum(
         id=str(uuid.uuid4()),
         enum_name=enum_request.enum_name,
@@ -116,12 +180,12 @@ async def post_enum(enum_request: EnumCreateRequest, db: Session = db_dependency
 
     try:
         db.add(new_enum)
-        db.commit()
-        db.refresh(new_enum)
-        update_enum_history(db, new_enum)
+        await db.commit()
+        await db.refresh(new_enum)
+        record_enum_history(new_enum)
         return new_enum
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Enum with the same name and enum_name already exists.",
@@ -132,11 +196,11 @@ async def post_enum(enum_request: EnumCreateRequest, db: Session = db_dependency
     "/enums/{id}", response_model=EnumResponse, status_code=status.HTTP_202_ACCEPTED
 )
 async def put_enum(
-    id: str,
+    id: UUIDStr,
     enum_request: EnumCreateRequest,
-    db: Session = db_dependency,
+    db: AsyncSession = db_dependency,
 ):
-    enum_to_update = db.get(Enum, id)
+    enum_to_update = await db.get(Enum, id)
     if not enum_to_update:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -147,24 +211,24 @@ async def put_enum(
     enum_to_update.name = enum_request.name
     enum_to_update.modified_datetime = datetime.now(timezone.utc)
 
-    db.commit()
-    db.refresh(enum_to_update)
-    update_enum_history(db, enum_to_update)
+    await db.commit()
+    await db.refresh(enum_to_update)
+    record_enum_history(enum_to_update)
     return enum_to_update
 
 
 @router.delete("/enums/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_enum(id: str, db: Session = db_dependency):
-    enum_to_delete = db.get(Enum, id)
+async def delete_enum(id: UUIDStr, db: AsyncSession = db_dependency):
+    enum_to_delete = await db.get(Enum, id)
     if not enum_to_delete:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Enum with id '{id}' not found.",
         )
 
-    update_enum_history(db, enum_to_delete, is_deleted=True)
-    db.delete(enum_to_delete)
-    db.commit()
+    await db.delete(enum_to_delete)
+    await db.commit()
+    record_enum_history(enum_to_delete, is_deleted=True)
     return {"message": "Enum deleted successfully."}
 
 
@@ -173,13 +237,15 @@ async def delete_enum(id: str, db: Session = db_dependency):
     response_model=List[EnumHistoryResponse],
     status_code=status.HTTP_200_OK,
 )
-async def get_enum_history(id: str, db: Session = db_dependency):
+async def get_enum_history(
+    id: UUIDStr, db: AsyncSession = read_db_dependency
+):
     query = (
         select(EnumHistory)
         .where(EnumHistory.enum_id == id)
         .order_by(EnumHistory.valid_from.asc())
     )
-    results = db.execute(query).scalars().all()
+    results = (await db.execute(query)).scalars().all()
 
     if not results:
         raise HTTPException(
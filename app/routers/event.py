@@ -1,12 +1,59 @@
-from fastapi import APIRouter, status, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, status, HTTPException, Header, Query, WebSocket
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.websockets import WebSocketDisconnect
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.future import select
-from typing import List, Optional
+from sqlalchemy import select, insert, cast, false, func, tuple_
+from sqlalchemy.orm import aliased
+from typing import List, Literal, Optional, Tuple
 from pydantic import BaseModel, Field
+from app.audit import audit_queue
 from app.database import SessionLocal
-from app.models import Event
-from datetime import datetime, timezone
+from app.dependencies import db_dependency, read_db_dependency
+from app.enum_cache import enum_cache
+from app.feed import FEED_HEARTBEAT_SECONDS, feed_messages, get_feed_broker
+from app.etags import (
+    bump_event_versions,
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_etag,
+)
+from app.models import (
+    Enum,
+    EnumHistory,
+    Event,
+    EventDailyRollup,
+    EventHistory,
+    EventSeriesBucket,
+    Kid,
+)
+from app.partitions import ensure_event_partitions, month_start
+from app.rollups import (
+    add_event_to_rollups,
+    apply_rollup_deltas,
+    remove_event_from_rollups,
+    rollup_delta,
+)
+from app.search import text_match
+from app.series import (
+    EPOCH as SERIES_EPOCH,
+    apply_series_deltas,
+    bucket_start,
+    pick_resolution,
+    refresh_series_windows,
+    series_deltas,
+    stored_resolution,
+)
+from app.temporal import naive_utc, version_at
+from app.types import UUIDStr, canonical_uuid
+from datetime import date, datetime, timedelta, timezone
+import asyncio
+import base64
+import csv
+import io
+import json
+import uuid
 
 router = APIRouter(
     prefix="/event",
@@ -14,26 +61,28 @@ router = APIRouter(
     responses={404: {"description": "Not found"}}
 )
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BULK_EVENTS = 5000
+DEFAULT_SERIES_POINTS = 500
+MAX_SERIES_POINTS = 5000
+EXPORT_CHUNK_SIZE = 1000
+# Cursor values are bound as the key columns' types; a plain string id
+# would be sent as varchar, which Postgres won't compare with uuid
+CURSOR_TYPES = [Event.timestamp.type, Event.id.type]
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-db_dependency = Depends(get_db)
 
 class EventCreateRequest(BaseModel):
-    kid_id: str = Field(..., example="kid123")
-    event_type_id: str = Field(..., example="event123")
+    kid_id: UUIDStr = Field(..., example="123e4567-e89b-12d3-a456-426614174000")
+    event_type_id: UUIDStr = Field(..., example="123e4567-e89b-12d3-a456-426614174003")
     timestamp: datetime = Field(..., example="2024-12-01T14:30:00Z")
     string_value: Optional[str] = Field(None, max_length=255, example="sample string")
     float_value: Optional[float] = Field(None, example=10.5)
     bool_value: Optional[bool] = Field(None, example=True)
     int_value: Optional[int] = Field(None, example=42)
-    unit_id: Optional[str] = Field(None, example="unit123")
+    unit_id: Optional[UUIDStr] = Field(
+        None, example="123e4567-e89b-12d3-a456-426614174004"
+    )
 
 
 class EventResponse(BaseModel):
@@ -53,29 +102,565 @@ class EventResponse(BaseModel):
         orm_mode = True
 
 
+class EventReportResponse(EventResponse):
+    event_type_name: Optional[str]
+    unit_name: Optional[str]
+
+
+class EventSearchResponse(EventResponse):
+    rank: float
+
+
+class EventSeriesPoint(BaseModel):
+    bucket_start: datetime
+    count: int
+    min: float
+    max: float
+    avg: float
+
+
+class EventSeriesResponse(BaseModel):
+    resolution_seconds: int
+    points: List[EventSeriesPoint]
+
+
+class EventHistoryResponse(BaseModel):
+    id: str
+    event_id: str
+    kid_id: str
+    event_type_id: str
+    timestamp: datetime
+    string_value: Optional[str]
+    float_value: Optional[float]
+    bool_value: Optional[bool]
+    int_value: Optional[int]
+    unit_id: Optional[str]
+    valid_from: datetime
+    valid_to: Optional[datetime]
+    is_deleted: bool
+
+    class Config:
+        orm_mode = True
+
+
+class EventDailySummaryResponse(BaseModel):
+    kid_id: str
+    event_type_id: str
+    day: date
+    unit_id: Optional[str]
+    event_count: int
+    float_sum: float
+    int_sum: int
+
+    class Config:
+        orm_mode = True
+
+
+class EventBulkCreateRequest(BaseModel):
+    events: List[EventCreateRequest] = Field(..., max_length=MAX_BULK_EVENTS)
+
+
+class EventBulkItemResult(BaseModel):
+    index: int
+    id: Optional[str]
+    created: bool
+    detail: Optional[str]
+
+
+class EventBulkResponse(BaseModel):
+    created_count: int
+    failed_count: int
+    results: List[EventBulkItemResult]
+
+
+# Exactly EventResponse's fields, for paths that skip the ORM and Pydantic
+EVENT_COLUMNS = [
+    Event.id,
+    Event.kid_id,
+    Event.event_type_id,
+    Event.timestamp,
+    Event.string_value,
+    Event.float_value,
+    Event.bool_value,
+    Event.int_value,
+    Event.unit_id,
+    Event.created_datetime,
+    Event.modified_datetime,
+]
+EVENT_FIELDS = [column.key for column in EVENT_COLUMNS]
+REPORT_FIELDS = EVENT_FIELDS + ["event_type_name", "unit_name"]
+SEARCH_FIELDS = EVENT_FIELDS + ["rank"]
+HISTORY_FIELDS = [
+    "kid_id",
+    "event_type_id",
+    "timestamp",
+    "string_value",
+    "float_value",
+    "bool_value",
+    "int_value",
+    "unit_id",
+]
+
+
+def record_event_history(event_id: str, event, is_deleted: bool = False):
+    # Only called once the write has committed; flushed by the audit queue
+    row = {field: getattr(event, field) for field in HISTORY_FIELDS}
+    row["event_id"] = event_id
+    row["is_deleted"] = is_deleted
+    audit_queue.record(EventHistory, row)
+
+
+def encode_cursor(timestamp: datetime, id: str) -> str:
+    raw = f"{timestamp.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), canonical_uuid(id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+
+
+def encode_search_cursor(rank: float, timestamp: datetime, id: str) -> str:
+    raw = f"{rank!r}|{timestamp.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        rank, timestamp, id = raw.split("|", 2)
+        return float(rank), datetime.fromisoformat(timestamp), canonical_uuid(id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+
+
+def timeline_page(
+    query,
+    kid_id: Optional[str],
+    event_type_id: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime],
+    cursor: Optional[str],
+    limit: int,
+):
+    # Newest first, keyed on (timestamp, id) so pages stay stable under inserts
+    query = (
+        query.where(Event.is_deleted == false())
+        .order_by(Event.timestamp.desc(), Event.id.desc())
+        .limit(limit + 1)
+    )
+    if kid_id:
+        query = query.where(Event.kid_id == kid_id)
+    if event_type_id:
+        query = query.where(Event.event_type_id == event_type_id)
+    if since:
+        query = query.where(Event.timestamp >= since)
+    if until:
+        query = query.where(Event.timestamp < until)
+    if cursor:
+        cursor_timestamp, cursor_id = decode_cursor(cursor)
+        # The plain bound lets the planner prune partitions the row
+        # comparison alone would not
+        query = query.where(
+            Event.timestamp <= cursor_timestamp,
+            tuple_(Event.timestamp, Event.id)
+            < tuple_(cursor_timestamp, cursor_id, types=CURSOR_TYPES),
+        )
+    return query
+
+
+def page_response(rows, fields: List[str], limit: int) -> ORJSONResponse:
+    # Plain rows go straight to orjson; response_model still documents the
+    # shape but per-row validation is skipped
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+
+    response = ORJSONResponse([dict(zip(fields, row)) for row in rows])
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
 @router.get(
     "/events/", response_model=List[EventResponse], status_code=status.HTTP_200_OK
 )
 async def get_all_events(
-    kid_id: Optional[str] = None,
-    event_type_id: Optional[str] = None,
-    db: Session = db_dependency,
+    kid_id: Optional[UUIDStr] = None,
+    event_type_id: Optional[UUIDStr] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = read_db_dependency,
 ):
-    query = select(Event).where(not Event.is_deleted)
+    # A kid's timeline is versioned, so an unchanged page is answered from
+    # a single primary-key lookup
+    etag = None
     if kid_id:
-        query = query.where(Event.kid_id == kid_id)
+        version = (
+            await db.execute(select(Kid.event_version).where(Kid.id == kid_id))
+        ).scalar()
+        if version is not None:
+            etag = make_etag(
+                "events", kid_id, version, event_type_id, since, until, cursor, limit
+            )
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+    query = timeline_page(
+        select(*EVENT_COLUMNS), kid_id, event_type_id, since, until, cursor, limit
+    )
+
+    response = page_response((await db.execute(query)).all(), EVENT_FIELDS, limit)
+    if etag:
+        set_etag(response, etag)
+    return response
+
+
+@router.get(
+    "/events/report",
+    response_model=List[EventReportResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_event_report(
+    kid_id: UUIDStr,
+    event_type_id: Optional[UUIDStr] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = read_db_dependency,
+):
+    # Names come from the enum version in force at each event's timestamp,
+    # falling back to the current name for events older than any version
+    type_history = aliased(EnumHistory)
+    unit_history = aliased(EnumHistory)
+    event_type = aliased(Enum)
+    unit = aliased(Enum)
+    query = (
+        select(
+            *EVENT_COLUMNS,
+            func.coalesce(type_history.name, event_type.name),
+            func.coalesce(unit_history.name, unit.name),
+        )
+        .outerjoin(
+            type_history,
+            (type_history.enum_id == Event.event_type_id)
+            & version_at(type_history, Event.timestamp),
+        )
+        .outerjoin(event_type, event_type.id == Event.event_type_id)
+        .outerjoin(
+            unit_history,
+            (unit_history.enum_id == Event.unit_id)
+            & version_at(unit_history, Event.timestamp),
+        )
+        .outerjoin(unit, unit.id == Event.unit_id)
+    )
+    query = timeline_page(query, kid_id, event_type_id, since, until, cursor, limit)
+    return page_response((await db.execute(query)).all(), REPORT_FIELDS, limit)
+
+
+@router.get(
+    "/events/search",
+    response_model=List[EventSearchResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def search_events(
+    kid_id: UUIDStr,
+    q: str = Query(..., min_length=1, max_length=200),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = read_db_dependency,
+):
+    match, rank = text_match(Event.string_value, q)
+    # Best match first, newest first among equals; the time range prunes
+    # partitions and the live/non-null filters match the partial index
+    query = (
+        select(*EVENT_COLUMNS, rank)
+        .where(
+            Event.kid_id == kid_id,
+            Event.is_deleted == false(),
+            Event.string_value.isnot(None),
+            match,
+        )
+        .order_by(rank.desc(), Event.timestamp.desc(), Event.id.desc())
+        .limit(limit + 1)
+    )
+    if since:
+        query = query.where(Event.timestamp >= since)
+    if until:
+        query = query.where(Event.timestamp < until)
+    if cursor:
+        cursor_rank, cursor_timestamp, cursor_id = decode_search_cursor(cursor)
+        query = query.where(
+            tuple_(rank, Event.timestamp, Event.id)
+            < tuple_(
+                cast(cursor_rank, rank.type),
+                cursor_timestamp,
+                cursor_id,
+                types=[rank.type, *CURSOR_TYPES],
+            )
+        )
+
+    rows = (await db.execute(query)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_search_cursor(last[-1], last.timestamp, last.id)
+
+    response = ORJSONResponse([dict(zip(SEARCH_FIELDS, row)) for row in rows])
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def stream_event_export(kid_id: str, format: str, bind: AsyncEngine):
+    query = (
+        select(*EVENT_COLUMNS)
+        .where(Event.kid_id == kid_id, Event.is_deleted == false())
+        .order_by(Event.timestamp.asc(), Event.id.asc())
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    )
+
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EVENT_FIELDS)
+        yield buffer.getvalue()
+
+    # The request's session is closed before the body is sent, so the stream
+    # owns its own session and server-side cursor, on the same database
+    async with AsyncSession(bind) as db:
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            if format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(
+                    [export_value(value) for value in row] for row in partition
+                )
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(
+                        dict(zip(EVENT_FIELDS, map(export_value, row)))
+                    )
+                    + "\n"
+                    for row in partition
+                )
+
+
+@router.get("/events/export", status_code=status.HTTP_200_OK)
+async def export_events(
+    kid_id: UUIDStr,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    db: AsyncSession = read_db_dependency,
+):
+    kid = await db.get(Kid, kid_id)
+    if not kid or kid.is_deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Kid with id '{kid_id}' not found.",
+        )
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        stream_event_export(kid_id, format, db.bind),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="events-{kid_id}.{format}"'
+        },
+    )
+
+
+@router.get(
+    "/summary",
+    response_model=List[EventDailySummaryResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_event_summary(
+    kid_id: UUIDStr,
+    event_type_id: Optional[UUIDStr] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    db: AsyncSession = read_db_dependency,
+):
+    query = (
+        select(EventDailyRollup)
+        .where(EventDailyRollup.kid_id == kid_id, EventDailyRollup.event_count > 0)
+        .order_by(
+            EventDailyRollup.day.asc(),
+            EventDailyRollup.event_type_id.asc(),
+            EventDailyRollup.unit_id.asc().nulls_first(),
+        )
+    )
     if event_type_id:
-        query = query.where(Event.event_type_id == event_type_id)
+        query = query.where(EventDailyRollup.event_type_id == event_type_id)
+    if since:
+        query = query.where(EventDailyRollup.day >= since)
+    if until:
+        query = query.where(EventDailyRollup.day <= until)
 
-    results = db.execute(query).scalars().all()
+    results = (await db.execute(query)).scalars().all()
     return results
 
 
+@router.get(
+    "/series", response_model=EventSeriesResponse, status_code=status.HTTP_200_OK
+)
+async def get_event_series(
+    kid_id: UUIDStr,
+    event_type_id: UUIDStr,
+    since: datetime,
+    until: datetime,
+    points: int = Query(DEFAULT_SERIES_POINTS, ge=1, le=MAX_SERIES_POINTS),
+    db: AsyncSession = read_db_dependency,
+):
+    if until <= since:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'until' must be after 'since'.",
+        )
+
+    # Charts get at most 'points' buckets instead of every reading. Wider
+    # buckets than any stored resolution are summed from stored ones.
+    resolution = pick_resolution(since, until, points)
+    start = func.date_bin(
+        timedelta(seconds=resolution), EventSeriesBucket.bucket_start, SERIES_EPOCH
+    ).label("bucket_start")
+    query = (
+        select(
+            start,
+            func.sum(EventSeriesBucket.value_count).label("value_count"),
+            func.sum(EventSeriesBucket.value_sum).label("value_sum"),
+            func.min(EventSeriesBucket.value_min).label("value_min"),
+            func.max(EventSeriesBucket.value_max).label("value_max"),
+        )
+        .where(
+            EventSeriesBucket.kid_id == kid_id,
+            EventSeriesBucket.event_type_id == event_type_id,
+            EventSeriesBucket.resolution == stored_resolution(resolution),
+            EventSeriesBucket.bucket_start >= bucket_start(since, resolution),
+            EventSeriesBucket.bucket_start < naive_utc(until),
+        )
+        .group_by(start)
+        .order_by(start.asc())
+    )
+    rows = (await db.execute(query)).all()
+    return {
+        "resolution_seconds": resolution,
+        "points": [
+            {
+                "bucket_start": row.bucket_start,
+                "count": row.value_count,
+                "min": row.value_min,
+                "max": row.value_max,
+                "avg": row.value_sum / row.value_count,
+            }
+            for row in rows
+        ],
+    }
+
+
+async def kid_exists(kid_id: str) -> bool:
+    # A short session of its own, so open streams don't pin a pool connection
+    async with SessionLocal() as db:
+        kid = await db.get(Kid, kid_id)
+        return kid is not None and not kid.is_deleted
+
+
+async def stream_event_feed(kid_id: str):
+    async with get_feed_broker().subscribe(kid_id) as subscription:
+        yield ": connected\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(), FEED_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                return
+            yield f"event: {message['action']}\ndata: {json.dumps(message)}\n\n"
+
+
+@router.get("/feed/{kid_id}", status_code=status.HTTP_200_OK)
+async def get_event_feed(kid_id: UUIDStr):
+    if not await kid_exists(kid_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Kid with id '{kid_id}' not found.",
+        )
+
+    return StreamingResponse(
+        stream_event_feed(kid_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/feed/{kid_id}/ws")
+async def event_feed_socket(websocket: WebSocket, kid_id: UUIDStr):
+    if not await kid_exists(kid_id):
+        await websocket.close(code=1008, reason=f"Kid with id '{kid_id}' not found.")
+        return
+
+    await websocket.accept()
+    async with get_feed_broker().subscribe(kid_id) as subscription:
+        # Watch the socket too, so a client hanging up is noticed while idle
+        receive = asyncio.ensure_future(websocket.receive())
+        try:
+            while True:
+                message = asyncio.ensure_future(subscription.queue.get())
+                done, _ = await asyncio.wait(
+                    {receive, message}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if message in done:
+                    if message.result() is None:
+                        await websocket.close()
+                        return
+                    await websocket.send_json(message.result())
+                else:
+                    message.cancel()
+                if receive in done:
+                    if receive.result()["type"] == "websocket.disconnect":
+                        return
+                    receive = asyncio.ensure_future(websocket.receive())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            receive.cancel()
+
+
 @router.get(
     "/events/{id}", response_model=EventResponse, status_code=status.HTTP_200_OK
 )
-async def get_event(id: str, db: Session = db_dependency):
-    event = db.get(Event, id)
+async def get_event(id: UUIDStr, db: AsyncSession = read_db_dependency):
+    event = await db.get(Event, id)
     if not event or event.is_deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -84,10 +669,34 @@ async def get_event(id: str, db: Session = db_dependency):
     return event
 
 
+@router.get(
+    "/events/{id}/history",
+    response_model=List[EventHistoryResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_event_history(
+    id: UUIDStr, db: AsyncSession = read_db_dependency
+):
+    query = (
+        select(EventHistory)
+        .where(EventHistory.event_id == id)
+        .order_by(EventHistory.valid_from.asc())
+    )
+    results = (await db.execute(query)).scalars().all()
+
+    if not results:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No history found for event with id '{id}'.",
+        )
+
+    return results
+
+
 @router.post(
     "/events", response_model=EventResponse, status_code=status.HTTP_201_CREATED
 )
-async def post_event(event_request: EventCreateRequest, db: Session = db_dependency):
+async def post_event(event_request: EventCreateRequest, db: AsyncSession = db_dependency):
     new_event = Event(
         kid_id=event_request.kid_id,
         event_type_id=event_request.event_type_id,
@@ -99,34 +708,146 @@ async def post_event(event_request: EventCreateRequest, db: Session = db_depende
         unit_id=event_request.unit_id,
     )
 
+    await ensure_event_partitions([month_start(event_request.timestamp)])
     try:
         db.add(new_event)
-        db.commit()
-        db.refresh(new_event)
+        await db.flush()
+        await add_event_to_rollups(db, new_event)
+        await apply_series_deltas(db, series_deltas(new_event))
+        await bump_event_versions(db, [new_event.kid_id])
+        await get_feed_broker().publish(
+            db, feed_messages(new_event.kid_id, "created", [new_event.id])
+        )
+        await db.commit()
+        await db.refresh(new_event)
+        record_event_history(new_event.id, new_event)
         return new_event
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or duplicate event data.",
         )
 
 
+@router.post(
+    "/events/bulk",
+    response_model=EventBulkResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def post_events_bulk(
+    bulk_request: EventBulkCreateRequest, db: AsyncSession = db_dependency
+):
+    events = bulk_request.events
+
+    # Resolve every referenced kid and enum up front, so rows with dangling
+    # references are reported instead of aborting the batch
+    kid_ids = {event.kid_id for event in events}
+    enum_ids = {event.event_type_id for event in events} | {
+        event.unit_id for event in events if event.unit_id
+    }
+    existing_kids = set(
+        (await db.execute(select(Kid.id).where(Kid.id.in_(kid_ids)))).scalars()
+    )
+    existing_enums = {
+        enum_id for enum_id in enum_ids if await enum_cache.get(db, enum_id)
+    }
+
+    now = datetime.now(timezone.utc)
+    rows = []
+    accepted = []
+    deltas = []
+    series = []
+    results = []
+    for index, event in enumerate(events):
+        if event.kid_id not in existing_kids:
+            detail = f"Kid with id '{event.kid_id}' does not exist."
+        elif event.event_type_id not in existing_enums:
+            detail = f"Event type with id '{event.event_type_id}' does not exist."
+        elif event.unit_id and event.unit_id not in existing_enums:
+            detail = f"Unit with id '{event.unit_id}' does not exist."
+        else:
+            detail = None
+
+        if detail:
+            results.append(
+                EventBulkItemResult(index=index, id=None, created=False, detail=detail)
+            )
+            continue
+
+        row = event.model_dump()
+        row["id"] = str(uuid.uuid4())
+        row["created_datetime"] = now
+        rows.append(row)
+        accepted.append((row["id"], event))
+        deltas.append(rollup_delta(event))
+        series.extend(series_deltas(event))
+        results.append(
+            EventBulkItemResult(index=index, id=row["id"], created=True, detail=None)
+        )
+
+    if rows:
+        await ensure_event_partitions({month_start(row["timestamp"]) for row in rows})
+        try:
+            # executemany on a Core insert is sent as batched multi-row INSERTs
+            await db.execute(insert(Event), rows)
+            await apply_rollup_deltas(db, deltas)
+            await apply_series_deltas(db, series)
+            created = {}
+            for row in rows:
+                created.setdefault(row["kid_id"], []).append(row["id"])
+            await bump_event_versions(db, created)
+            await get_feed_broker().publish(
+                db,
+                [
+                    message
+                    for kid_id, event_ids in created.items()
+                    for message in feed_messages(kid_id, "created", event_ids)
+                ],
+            )
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or duplicate event data.",
+            )
+        for event_id, event in accepted:
+            record_event_history(event_id, event)
+
+    return EventBulkResponse(
+        created_count=len(rows),
+        failed_count=len(events) - len(rows),
+        results=results,
+    )
+
+
 @router.put(
     "/events/{id}", response_model=EventResponse, status_code=status.HTTP_202_ACCEPTED
 )
 async def put_event(
-    id: str,
+    id: UUIDStr,
     event_request: EventCreateRequest,
-    db: Session = db_dependency,
+    db: AsyncSession = db_dependency,
 ):
-    event_to_update = db.get(Event, id)
+    # Before the session reads event: the partition DDL runs on its own
+    # connection and would wait on this transaction's lock on the table
+    await ensure_event_partitions([month_start(event_request.timestamp)])
+    event_to_update = await db.get(Event, id)
     if not event_to_update or event_to_update.is_deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Event with id '{id}' not found.",
         )
 
+    deltas = [rollup_delta(event_to_update, sign=-1)]
+    kid_ids = {event_to_update.kid_id, event_request.kid_id}
+    readings = [
+        (event.kid_id, event.event_type_id, event.timestamp)
+        for event in (event_to_update, event_request)
+        if event.float_value is not None
+    ]
+
     event_to_update.kid_id = event_request.kid_id
     event_to_update.event_type_id = event_request.event_type_id
     event_to_update.timestamp = event_request.timestamp
@@ -137,14 +858,29 @@ async def put_event(
     event_to_update.unit_id = event_request.unit_id
     event_to_update.modified_datetime = datetime.now(timezone.utc)
 
-    db.commit()
-    db.refresh(event_to_update)
+    deltas.append(rollup_delta(event_to_update))
+    await apply_rollup_deltas(db, deltas)
+    if readings:
+        await db.flush()
+        await refresh_series_windows(db, readings)
+    await bump_event_versions(db, kid_ids)
+    await get_feed_broker().publish(
+        db,
+        [
+            message
+            for kid_id in kid_ids
+            for message in feed_messages(kid_id, "updated", [event_to_update.id])
+        ],
+    )
+    await db.commit()
+    await db.refresh(event_to_update)
+    record_event_history(event_to_update.id, event_to_update)
     return event_to_update
 
 
 @router.delete("/events/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_event(id: str, db: Session = db_dependency):
-    event_to_delete = db.get(Event, id)
+async def delete_event(id: UUIDStr, db: AsyncSession = db_dependency):
+    event_to_delete = await db.get(Event, id)
     if not event_to_delete or event_to_delete.is_deleted:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -153,6 +889,24 @@ async def delete_event(id: str, db: Session = db_dependency):
 
     event_to_delete.is_deleted = True
     event_to_delete.modified_datetime = datetime.now(timezone.utc)
-    db.commit()
+    await remove_event_from_rollups(db, event_to_delete)
+    if event_to_delete.float_value is not None:
+        await db.flush()
+        await refresh_series_windows(
+            db,
+            [
+                (
+                    event_to_delete.kid_id,
+                    event_to_delete.event_type_id,
+                    event_to_delete.timestamp,
+                )
+            ],
+        )
+    await bump_event_versions(db, [event_to_delete.kid_id])
+    await get_feed_broker().publish(
+        db, feed_messages(event_to_delete.kid_id, "deleted", [event_to_delete.id])
+    )
+    await db.commit()
+    record_event_history(event_to_delete.id, event_to_delete, is_deleted=True)
     return {"message": "Event deleted successfully."}
 
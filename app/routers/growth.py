@@ -0,0 +1,77 @@
+from fastapi import APIRouter, status, HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from app.dependencies import db_dependency
+from app.growth import growth_report
+from app.types import UUIDStr
+from datetime import datetime
+from typing import List, Literal, Optional
+
+router = APIRouter(
+    prefix="/growth", tags=["growth"], responses={404: {"description": "Not found"}}
+)
+
+MAX_GROWTH_REPORT_KIDS = 1000
+
+
+class GrowthReportRequest(BaseModel):
+    kid_ids: List[UUIDStr] = Field(
+        ..., min_length=1, max_length=MAX_GROWTH_REPORT_KIDS
+    )
+    weight_type_id: Optional[UUIDStr] = Field(
+        None, example="123e4567-e89b-12d3-a456-426614174003"
+    )
+    height_type_id: Optional[UUIDStr] = Field(
+        None, example="123e4567-e89b-12d3-a456-426614174005"
+    )
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+
+
+class GrowthMeasurementResponse(BaseModel):
+    event_id: str
+    kid_id: str
+    timestamp: datetime
+    measure: Literal["weight", "height"]
+    # weight-for-age, length-for-age or height-for-age; None when the kid's
+    # birth date or sex is unknown, the unit is unknown or the age is
+    # outside the WHO 0-5 year standards
+    indicator: Optional[str]
+    # In kg or cm
+    value: Optional[float]
+    age_days: Optional[int]
+    z_score: Optional[float]
+    percentile: Optional[float]
+
+
+@router.post(
+    "/report",
+    response_model=List[GrowthMeasurementResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_growth_report(
+    report_request: GrowthReportRequest, db: AsyncSession = db_dependency
+):
+    measures = {
+        type_id: measure
+        for type_id, measure in (
+            (report_request.weight_type_id, "weight"),
+            (report_request.height_type_id, "height"),
+        )
+        if type_id
+    }
+    if not measures:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide weight_type_id, height_type_id or both.",
+        )
+
+    rows = await growth_report(
+        db,
+        report_request.kid_ids,
+        measures,
+        report_request.since,
+        report_request.until,
+    )
+    return ORJSONResponse(rows)
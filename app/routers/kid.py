@@ -1,34 +1,27 @@
-from fastapi import APIRouter, status, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
-from app.database import SessionLocal
-from app.models import Kid, Parent, KidPermission, Enum
+from app.dependencies import db_dependency
+from app.access_cache import access_cache
+from app.enum_cache import enum_cache
+from app.models import Kid, Parent, KidPermission
+from app.types import UUIDStr
 
 router = APIRouter(
     prefix="/kid", tags=["kid"], responses={404: {"description": "Not found"}}
 )
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-db_dependency = Depends(get_db)
-
-
 class KidCreateRequest(BaseModel):
     first_name: str = Field(..., max_length=100, example="John")
     last_name: Optional[str] = Field(None, max_length=100, example="Doe")
     birth_date: Optional[datetime] = Field(None, example="2015-06-15T00:00:00Z")
-    parent_id: str = Field(..., example="123e4567-e89b-12d3-a456-426614174001")
-    role_id: str = Field(..., example="123e4567-e89b-12d3-a456-426614174002")
+    sex: Optional[Literal["M", "F"]] = Field(None, example="F")
+    parent_id: UUIDStr = Field(..., example="123e4567-e89b-12d3-a456-426614174001")
+    role_id: UUIDStr = Field(..., example="123e4567-e89b-12d3-a456-426614174002")
 
 
 class KidResponse(BaseModel):
@@ -36,6 +29,7 @@ class KidResponse(BaseModel):
     first_name: str
     last_name: Optional[str]
     birth_date: Optional[datetime]
+    sex: Optional[str]
     parent_id: Optional[str]
     created_datetime: datetime
     modified_datetime: Optional[datetime]
@@ -45,17 +39,18 @@ class KidResponse(BaseModel):
 
 
 @router.post("/kids", response_model=KidResponse, status_code=status.HTTP_201_CREATED)
-async def create_kid(kid_request: KidCreateRequest, db: Session = db_dependency):
+async def create_kid(kid_request: KidCreateRequest, db: AsyncSession = db_dependency):
     new_kid = Kid(
         first_name=kid_request.first_name,
         last_name=kid_request.last_name,
         birth_date=kid_request.birth_date,
+        sex=kid_request.sex,
         parent_id=kid_request.parent_id,
     )
 
     try:
         # Check if the parent exists
-        parent = db.query(Parent).filter(Parent.id == kid_request.parent_id).first()
+        parent = await db.get(Parent, kid_request.parent_id)
         if not parent:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -63,31 +58,30 @@ async def create_kid(kid_request: KidCreateRequest, db: Session = db_dependency)
             )
 
         # Check if the role_id is valid
-        valid_role = db.query(Enum).filter(Enum.id == kid_request.role_id).first()
+        valid_role = await enum_cache.get(db, kid_request.role_id)
         if not valid_role:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Provided role_id does not exist.",
             )
 
-        # Create the new kid
+        # Kid and permission go in together; the flush orders the inserts
         db.add(new_kid)
-        db.commit()
-        db.refresh(new_kid)
-
-        # Assign the permission to the parent
-        new_permission = KidPermission(
-            kid_id=new_kid.id,
-            parent_id=kid_request.parent_id,
-            role_id=kid_request.role_id,
+        await db.flush()
+        db.add(
+            KidPermission(
+                kid_id=new_kid.id,
+                parent_id=kid_request.parent_id,
+                role_id=kid_request.role_id,
+            )
         )
-        db.add(new_permission)
-        db.commit()
-        db.refresh(new_permission)
+        await db.commit()
+        await db.refresh(new_kid)
+        access_cache.invalidate(kid_request.parent_id)
 
         return new_kid
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Constraints were violated, such as duplicate data.",
@@ -100,11 +94,11 @@ async def create_kid(kid_request: KidCreateRequest, db: Session = db_dependency)
     "/kids/{id}", response_model=KidResponse, status_code=status.HTTP_202_ACCEPTED
 )
 async def update_kid(
-    id: str,
+    id: UUIDStr,
     kid_request: KidCreateRequest,
-    db: Session = db_dependency,
+    db: AsyncSession = db_dependency,
 ):
-    kid_to_update = db.get(Kid, id)
+    kid_to_update = await db.get(Kid, id)
     if not kid_to_update:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -114,16 +108,19 @@ async def update_kid(
     kid_to_update.first_name = kid_request.first_name
     kid_to_update.last_name = kid_request.last_name
     kid_to_update.birth_date = kid_request.birth_date
+    kid_to_update.sex = kid_request.sex
     kid_to_update.parent_id = kid_request.parent_id
 
-    db.commit()
-    db.refresh(kid_to_update)
+    await db.commit()
+    await db.refresh(kid_to_update)
+    # Kid details are cached under every parent with access to the kid
+    access_cache.clear()
     return kid_to_update
 
 
 @router.delete("/kids/{id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_kid(id: str, db: Session = db_dependency):
-    kid_to_delete = db.get(Kid, id)
+async def delete_kid(id: UUIDStr, db: AsyncSession = db_dependency):
+    kid_to_delete = await db.get(Kid, id)
     if not kid_to_delete:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -131,5 +128,6 @@ async def delete_kid(id: str, db: Session = db_dependency):
         )
 
     kid_to_delete.is_deleted = True
-    db.commit()
+    await db.commit()
+    access_cache.clear()
     return {"message": "Kid deleted successfully."}
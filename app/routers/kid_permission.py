@@ -1,9 +1,12 @@
-from fastapi import APIRouter, status, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, false
 from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel, Field
-from app.database import SessionLocal
-from app.models import KidPermission
+from app.dependencies import db_dependency, read_db_dependency
+from app.access_cache import access_cache
+from app.models import Enum, Kid, KidPermission
+from app.types import UUIDStr
 from datetime import datetime
 from typing import Optional, List
 
@@ -13,20 +16,11 @@ router = APIRouter(
     responses={404: {"description": "Not found"}}
 )
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-db_dependency = Depends(get_db)
 
 class KidPermissionCreateRequest(BaseModel):
-    kid_id: str = Field(..., example="123e4567-e89b-12d3-a456-426614174000")
-    parent_id: str = Field(..., example="123e4567-e89b-12d3-a456-426614174001")
-    role_id: str = Field(..., example="123e4567-e89b-12d3-a456-426614174002")
+    kid_id: UUIDStr = Field(..., example="123e4567-e89b-12d3-a456-426614174000")
+    parent_id: UUIDStr = Field(..., example="123e4567-e89b-12d3-a456-426614174001")
+    role_id: UUIDStr = Field(..., example="123e4567-e89b-12d3-a456-426614174002")
 
 
 class KidPermissionResponse(BaseModel):
@@ -41,13 +35,23 @@ class KidPermissionResponse(BaseModel):
         orm_mode = True
 
 
+class AccessibleKidResponse(BaseModel):
+    kid_id: str
+    first_name: str
+    last_name: Optional[str]
+    birth_date: Optional[datetime]
+    role_id: str
+    role_name: str
+    permission_id: str
+
+
 @router.post(
     "/kid_permissions",
     response_model=KidPermissionResponse,
     status_code=status.HTTP_201_CREATED,
 )
 async def post_kid_permission(
-    kid_permission_request: KidPermissionCreateRequest, db: Session = db_dependency
+    kid_permission_request: KidPermissionCreateRequest, db: AsyncSession = db_dependency
 ):
     new_kid_permission = KidPermission(
         kid_id=kid_permission_request.kid_id,
@@ -57,26 +61,43 @@ async def post_kid_permission(
 
     try:
         db.add(new_kid_permission)
-        db.commit()
-        db.refresh(new_kid_permission)
+        await db.commit()
+        await db.refresh(new_kid_permission)
+        access_cache.invalidate(new_kid_permission.parent_id)
         return new_kid_permission
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="KidPermission with the same kid_id, parent_id, and role_id already exists.",
         )
 
 
+@router.delete("/kid_permissions/{id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_kid_permission(id: UUIDStr, db: AsyncSession = db_dependency):
+    kid_permission_to_delete = await db.get(KidPermission, id)
+    if not kid_permission_to_delete or kid_permission_to_delete.is_deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"KidPermission with id '{id}' not found.",
+        )
+
+    kid_permission_to_delete.is_deleted = True
+    await db.commit()
+    access_cache.invalidate(kid_permission_to_delete.parent_id)
+    return {"message": "KidPermission deleted successfully."}
+
+
 @router.get(
     "/kid_permissions/{kid_id}",
     response_model=List[KidPermissionResponse],
     status_code=status.HTTP_200_OK,
 )
 async def get_kid_permissions_by_kid_id(
-    kid_id: str, db: Session = db_dependency
+    kid_id: UUIDStr, db: AsyncSession = read_db_dependency
 ):
-    kid_permissions = db.query(KidPermission).filter(KidPermission.kid_id == kid_id).all()
+    query = select(KidPermission).where(KidPermission.kid_id == kid_id)
+    kid_permissions = (await db.execute(query)).scalars().all()
 
     if not kid_permissions:
         raise HTTPException(
@@ -85,3 +106,44 @@ async def get_kid_permissions_by_kid_id(
         )
 
     return kid_permissions
+
+
+@router.get(
+    "/parents/{parent_id}/kids",
+    response_model=List[AccessibleKidResponse],
+    status_code=status.HTTP_200_OK,
+)
+async def get_accessible_kids(parent_id: UUIDStr, db: AsyncSession = db_dependency):
+    cached = access_cache.get(parent_id)
+    if cached is not None:
+        return cached
+
+    query = (
+        select(
+            Kid.id.label("kid_id"),
+            Kid.first_name,
+            Kid.last_name,
+            Kid.birth_date,
+            KidPermission.role_id,
+            Enum.name.label("role_name"),
+            KidPermission.id.label("permission_id"),
+        )
+        .join(Kid, Kid.id == KidPermission.kid_id)
+        .join(Enum, Enum.id == KidPermission.role_id)
+        .where(
+            KidPermission.parent_id == parent_id,
+            KidPermission.is_deleted == false(),
+            Kid.is_deleted == false(),
+        )
+        .order_by(Kid.first_name, Kid.id)
+    )
+    rows = (await db.execute(query)).mappings().all()
+
+    results = [AccessibleKidResponse(**row) for row in rows]
+    access_cache.set(parent_id, results)
+    return results
+
+
+@router.get("/cache/stats", status_code=status.HTTP_200_OK)
+async def get_access_cache_stats():
+    return access_cache.stats()
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+from app import database
+from app.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, status_code=status.HTTP_200_OK)
+async def get_metrics():
+    pool = database.get_pool_status(database.get_engine().pool)
+    return render_metrics(
+        {
+            "db_pool_size": pool["size"],
+            "db_pool_checked_out": pool["checked_out"],
+            "db_pool_overflow": pool["overflow"],
+        },
+        {
+            "db_pool_checkouts_total": pool["checkouts"],
+            "db_pool_timeouts_total": pool["timeouts"],
+            "db_pool_wait_seconds_total": pool["wait_seconds_total"],
+        }
+    )
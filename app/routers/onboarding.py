@@ -0,0 +1,137 @@
+from fastapi import APIRouter, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import insert
+from pydantic import BaseModel, Field
+from app.dependencies import db_dependency
+from app.enum_cache import enum_cache
+from app.models import Kid, KidPermission, Parent
+from app.passwords import PasswordHasherBusy, hash_password
+from app.routers.kid import KidResponse
+from app.routers.kid_permission import KidPermissionResponse
+from app.routers.parent import ParentCreateRequest, ParentResponse
+from app.types import UUIDStr
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
+import uuid
+
+router = APIRouter(
+    prefix="/onboarding",
+    tags=["onboarding"],
+    responses={404: {"description": "Not found"}}
+)
+
+MAX_ONBOARDING_KIDS = 20
+
+
+class OnboardingKidRequest(BaseModel):
+    first_name: str = Field(..., max_length=100, example="John")
+    last_name: Optional[str] = Field(None, max_length=100, example="Doe")
+    birth_date: Optional[datetime] = Field(None, example="2015-06-15T00:00:00Z")
+    sex: Optional[Literal["M", "F"]] = Field(None, example="F")
+    role_id: UUIDStr = Field(..., example="123e4567-e89b-12d3-a456-426614174002")
+
+
+class OnboardingRequest(BaseModel):
+    parent: ParentCreateRequest
+    kids: List[OnboardingKidRequest] = Field(
+        default_factory=list, max_length=MAX_ONBOARDING_KIDS
+    )
+
+
+class OnboardingResponse(BaseModel):
+    parent: ParentResponse
+    kids: List[KidResponse]
+    permissions: List[KidPermissionResponse]
+
+
+@router.post(
+    "/families",
+    response_model=OnboardingResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def onboard_family(
+    onboarding_request: OnboardingRequest, db: AsyncSession = db_dependency
+):
+    role_ids = {kid.role_id for kid in onboarding_request.kids}
+    if onboarding_request.parent.role:
+        role_ids.add(onboarding_request.parent.role)
+    for role_id in role_ids:
+        if not await enum_cache.get(db, role_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Role with id '{role_id}' does not exist.",
+            )
+
+    try:
+        hashed_password = await hash_password(onboarding_request.parent.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ups in progress, please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+
+    # Ids are assigned here so permission rows can reference kids without
+    # waiting for the kid insert to come back
+    now = datetime.now(timezone.utc)
+    parent_row = onboarding_request.parent.model_dump(exclude={"password"})
+    parent_row.update(
+        id=str(uuid.uuid4()), hashed_password=hashed_password, created_datetime=now
+    )
+    kid_rows = []
+    permission_rows = []
+    for kid in onboarding_request.kids:
+        kid_id = str(uuid.uuid4())
+        kid_rows.append(
+            {
+                "id": kid_id,
+                "first_name": kid.first_name,
+                "last_name": kid.last_name,
+                "birth_date": kid.birth_date,
+                "sex": kid.sex,
+                "parent_id": parent_row["id"],
+                "created_datetime": now,
+            }
+        )
+        permission_rows.append(
+            {
+                "id": str(uuid.uuid4()),
+                "kid_id": kid_id,
+                "parent_id": parent_row["id"],
+                "role_id": kid.role_id,
+                "created_datetime": now,
+            }
+        )
+
+    try:
+        # One multi-row INSERT .. RETURNING per table, all in one transaction
+        parent = (
+            await db.scalars(insert(Parent).returning(Parent), [parent_row])
+        ).one()
+        kids = []
+        permissions = []
+        if kid_rows:
+            kids = (
+                await db.scalars(
+                    insert(Kid).returning(Kid, sort_by_parameter_order=True),
+                    kid_rows,
+                )
+            ).all()
+            permissions = (
+                await db.scalars(
+                    insert(KidPermission).returning(
+                        KidPermission, sort_by_parameter_order=True
+                    ),
+                    permission_rows,
+                )
+            ).all()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parent with the same email or username already exists.",
+        )
+
+    return {"parent": parent, "kids": kids, "permissions": permissions}
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, status, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from pydantic import BaseModel, Field, EmailStr
-from app.database import SessionLocal
+from app.dependencies import db_dependency
 from app.models import Parent
+from app.passwords import PasswordHasherBusy, hash_password
+from app.types import UUIDStr
 from datetime import datetime
-from passlib.context import CryptContext
 from typing import Optional
 
 router = APIRouter(
@@ -13,26 +14,15 @@ router = APIRouter(
 )
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-db_dependency = Depends(get_db)
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
 class ParentCreateRequest(BaseModel):
     email: EmailStr = Field(..., example="parent@example.com")
     username: str = Field(..., max_length=100, example="parent_user")
     first_name: str = Field(..., max_length=100, example="John")
     last_name: Optional[str] = Field(None, max_length=100, example="Doe")
     password: str = Field(..., min_length=8, example="securepassword123")
-    role: Optional[str] = Field(None, example="parent_role")
+    role: Optional[UUIDStr] = Field(
+        None, example="123e4567-e89b-12d3-a456-426614174002"
+    )
 
 
 class ParentResponse(BaseModel):
@@ -52,8 +42,15 @@ class ParentResponse(BaseModel):
 @router.post(
     "/parents", response_model=ParentResponse, status_code=status.HTTP_201_CREATED
 )
-async def post_parent(parent_request: ParentCreateRequest, db: Session = db_dependency):
-    hashed_password = pwd_context.hash(parent_request.password)
+async def post_parent(parent_request: ParentCreateRequest, db: AsyncSession = db_dependency):
+    try:
+        hashed_password = await hash_password(parent_request.password)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-ups in progress, please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
 
     new_parent = Parent(
         email=parent_request.email,
@@ -66,11 +63,11 @@ async def post_parent(parent_request: ParentCreateRequest, db: Session = db_depe
 
     try:
         db.add(new_parent)
-        db.commit()
-        db.refresh(new_parent)
+        await db.commit()
+        await db.refresh(new_parent)
         return new_parent
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Parent with the same email or username already exists.",
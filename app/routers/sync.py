@@ -0,0 +1,200 @@
+from fastapi import APIRouter, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, false, true, func, tuple_
+from pydantic import BaseModel, Field
+from dotenv import load_dotenv
+from app.dependencies import db_dependency
+from app.models import Enum, EnumHistory, Event, Kid, KidPermission, Parent
+from app.routers.enum import EnumResponse
+from app.routers.event import (
+    EVENT_COLUMNS,
+    EVENT_FIELDS,
+    EventResponse,
+    decode_cursor,
+    encode_cursor,
+)
+from app.routers.kid import KidResponse
+from app.routers.kid_permission import KidPermissionResponse
+from app.temporal import naive_utc
+from app.types import UUIDStr
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+import os
+
+load_dotenv()
+
+router = APIRouter(
+    prefix="/sync", tags=["sync"], responses={404: {"description": "Not found"}}
+)
+
+DEFAULT_SYNC_PAGE_SIZE = 1000
+MAX_SYNC_PAGE_SIZE = 5000
+# Watermarks trail the clock by this much, so writes that commit late or
+# come from a worker with a slightly skewed clock are still picked up;
+# clients may see such rows twice and upsert them by id
+SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "10"))
+NIL_ID = "00000000-0000-0000-0000-000000000000"
+
+
+class SyncRequest(BaseModel):
+    parent_id: UUIDStr = Field(..., example="123e4567-e89b-12d3-a456-426614174001")
+    # Watermark for permissions and enums; omit for a full sync
+    watermark: Optional[str] = None
+    # Watermark per kid for the kid and its events; omitted kids sync fully
+    kids: Dict[UUIDStr, Optional[str]] = Field(default_factory=dict)
+    limit: int = Field(DEFAULT_SYNC_PAGE_SIZE, ge=1, le=MAX_SYNC_PAGE_SIZE)
+
+
+class SyncEventResponse(EventResponse):
+    is_deleted: bool
+
+
+class SyncKidRowResponse(KidResponse):
+    is_deleted: bool
+
+
+class SyncPermissionResponse(KidPermissionResponse):
+    is_deleted: bool
+
+
+class SyncKidResponse(BaseModel):
+    kid_id: str
+    kid: Optional[SyncKidRowResponse]
+    events: List[SyncEventResponse]
+    watermark: str
+    # More events are waiting; sync again with this kid's new watermark
+    has_more: bool
+
+
+class SyncResponse(BaseModel):
+    watermark: str
+    enums: List[EnumResponse]
+    deleted_enum_ids: List[str]
+    permissions: List[SyncPermissionResponse]
+    kids: List[SyncKidResponse]
+
+
+def changed_at(model):
+    # Inserts leave modified_datetime empty; indexed as this expression
+    return func.coalesce(model.modified_datetime, model.created_datetime)
+
+
+def read_watermark(watermark: Optional[str]) -> Optional[Tuple[datetime, str]]:
+    if not watermark:
+        return None
+    changed, id = decode_cursor(watermark)
+    return naive_utc(changed), id
+
+
+def changed_since(model, since: Optional[Tuple[datetime, str]]):
+    if since is None:
+        return []
+    return [
+        changed_at(model) >= since[0],
+        tuple_(changed_at(model), model.id)
+        > tuple_(*since, types=[model.created_datetime.type, model.id.type]),
+    ]
+
+
+@router.post("", response_model=SyncResponse, status_code=status.HTTP_200_OK)
+async def sync(sync_request: SyncRequest, db: AsyncSession = db_dependency):
+    parent = await db.get(Parent, sync_request.parent_id)
+    if not parent or parent.is_deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Parent with id '{sync_request.parent_id}' not found.",
+        )
+
+    horizon = naive_utc(datetime.now(timezone.utc)) - timedelta(
+        seconds=SYNC_OVERLAP_SECONDS
+    )
+    settled = encode_cursor(horizon, NIL_ID)
+    since = read_watermark(sync_request.watermark)
+
+    permissions = (
+        await db.execute(
+            select(KidPermission)
+            .where(
+                KidPermission.parent_id == sync_request.parent_id,
+                *changed_since(KidPermission, since),
+            )
+            .order_by(changed_at(KidPermission), KidPermission.id)
+        )
+    ).scalars().all()
+    enums = (
+        await db.execute(
+            select(Enum)
+            .where(*changed_since(Enum, since))
+            .order_by(changed_at(Enum), Enum.id)
+        )
+    ).scalars().all()
+    deleted_enum_ids = []
+    if since is not None:
+        # Enums are hard-deleted, so their tombstones come from the history
+        deleted_enum_ids = (
+            await db.execute(
+                select(EnumHistory.enum_id).where(
+                    EnumHistory.is_deleted == true(),
+                    EnumHistory.valid_from >= since[0],
+                )
+            )
+        ).scalars().all()
+
+    # Every kid the parent can still see; revoked ones arrive as
+    # permission tombstones above
+    kid_ids = set(
+        (
+            await db.execute(
+                select(KidPermission.kid_id).where(
+                    KidPermission.parent_id == sync_request.parent_id,
+                    KidPermission.is_deleted == false(),
+                )
+            )
+        ).scalars()
+    )
+    kids = {
+        kid.id: kid
+        for kid in (
+            await db.execute(select(Kid).where(Kid.id.in_(kid_ids)))
+        ).scalars()
+    }
+
+    kid_results = []
+    for kid_id in sorted(kids):
+        kid_since = read_watermark(sync_request.kids.get(kid_id))
+        kid = kids[kid_id]
+        kid_changed = naive_utc(kid.modified_datetime or kid.created_datetime)
+        if kid_since is not None and kid_changed < kid_since[0]:
+            kid = None
+
+        rows = (
+            await db.execute(
+                select(*EVENT_COLUMNS, Event.is_deleted, changed_at(Event))
+                .where(Event.kid_id == kid_id, *changed_since(Event, kid_since))
+                .order_by(changed_at(Event), Event.id)
+                .limit(sync_request.limit + 1)
+            )
+        ).all()
+        has_more = len(rows) > sync_request.limit
+        rows = rows[: sync_request.limit]
+        kid_results.append(
+            {
+                "kid_id": kid_id,
+                "kid": kid,
+                "events": [
+                    dict(zip(EVENT_FIELDS + ["is_deleted"], row)) for row in rows
+                ],
+                "watermark": (
+                    encode_cursor(rows[-1][-1], rows[-1].id) if has_more else settled
+                ),
+                "has_more": has_more,
+            }
+        )
+
+    return {
+        "watermark": settled,
+        "enums": enums,
+        "deleted_enum_ids": deleted_enum_ids,
+        "permissions": permissions,
+        "kids": kid_results,
+    }
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Request, status
+from app import database
+from app.audit import audit_queue
+from app.feed import get_feed_broker
+from app.replica import replica_monitor
+
+router = APIRouter(
+    prefix="/system", tags=["system"], responses={404: {"description": "Not found"}}
+)
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def get_pool_status():
+    return database.get_pool_status(database.get_engine().pool)
+
+
+@router.get("/startup", status_code=status.HTTP_200_OK)
+async def get_startup_timings(request: Request):
+    return request.app.state.startup
+
+
+@router.get("/audit", status_code=status.HTTP_200_OK)
+async def get_audit_queue_stats():
+    return audit_queue.stats()
+
+
+@router.get("/feed", status_code=status.HTTP_200_OK)
+async def get_event_feed_stats():
+    return get_feed_broker().stats()
+
+
+@router.get("/replica", status_code=status.HTTP_200_OK)
+async def get_replica_status():
+    return replica_monitor.stats()
@@ -0,0 +1,22 @@
+from sqlalchemy import REAL, func, literal_column
+
+
+# Language-neutral: notes are written in whatever language the family
+# uses, so words are lower-cased but not stemmed. Inlined rather than
+# bound so queries match the index expression under generic plans too.
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+
+def search_document(column):
+    # Must stay identical to the ix_event_string_value_search expression
+    return func.to_tsvector(SEARCH_CONFIG, column)
+
+
+def text_match(column, text: str):
+    # (predicate, rank) for a search over 'column': a ranked full-text match
+    # served by the GIN index
+    document = search_document(column)
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, text)
+    # float4, which cursors must compare against as float4 too
+    rank = func.ts_rank_cd(document, query, type_=REAL)
+    return document.op("@@")(query), rank
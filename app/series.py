@@ -0,0 +1,207 @@
+from sqlalchemy import case, delete, false, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import SessionLocal, dispose_engine, get_engine
+from app.models import Event, EventSeriesBucket
+from app.temporal import naive_utc
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import argparse
+import asyncio
+import math
+
+
+# Bucket widths in seconds, finest first; each divides the coarsest, so one
+# coarsest bucket covers every finer bucket inside it
+RESOLUTIONS = (60, 900, 3600)
+EPOCH = datetime(1970, 1, 1)
+REBUILD_CHUNK_SIZE = 5000
+# Keeps each upsert well under Postgres' bind parameter limit
+UPSERT_CHUNK_SIZE = 1000
+
+BucketKey = Tuple[str, str, int, datetime]
+
+
+def bucket_start(timestamp: datetime, resolution: int) -> datetime:
+    seconds = int((naive_utc(timestamp) - EPOCH).total_seconds())
+    return EPOCH + timedelta(seconds=seconds - seconds % resolution)
+
+
+def series_deltas(event) -> List[dict]:
+    if event.float_value is None:
+        return []
+    return [
+        {
+            "kid_id": event.kid_id,
+            "event_type_id": event.event_type_id,
+            "resolution": resolution,
+            "bucket_start": bucket_start(event.timestamp, resolution),
+            "value_count": 1,
+            "value_sum": event.float_value,
+            "value_min": event.float_value,
+            "value_max": event.float_value,
+        }
+        for resolution in RESOLUTIONS
+    ]
+
+
+def merge_buckets(deltas: Iterable[dict]) -> Dict[BucketKey, dict]:
+    merged = {}
+    for delta in deltas:
+        key = (
+            delta["kid_id"],
+            delta["event_type_id"],
+            delta["resolution"],
+            delta["bucket_start"],
+        )
+        bucket = merged.get(key)
+        if bucket is None:
+            merged[key] = dict(delta)
+        else:
+            bucket["value_count"] += delta["value_count"]
+            bucket["value_sum"] += delta["value_sum"]
+            bucket["value_min"] = min(bucket["value_min"], delta["value_min"])
+            bucket["value_max"] = max(bucket["value_max"], delta["value_max"])
+    return merged
+
+
+async def apply_series_deltas(db: AsyncSession, deltas: Iterable[dict]):
+    # Only additions can be applied incrementally; min/max can't be undone,
+    # so edits and deletes go through refresh_series_window
+    buckets = list(merge_buckets(deltas).values())
+    for start in range(0, len(buckets), UPSERT_CHUNK_SIZE):
+        await upsert_buckets(db, buckets[start : start + UPSERT_CHUNK_SIZE])
+
+
+async def upsert_buckets(db: AsyncSession, buckets: List[dict]):
+    statement = insert(EventSeriesBucket).values(buckets)
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=["kid_id", "event_type_id", "resolution", "bucket_start"],
+        set_={
+            "value_count": EventSeriesBucket.value_count + excluded.value_count,
+            "value_sum": EventSeriesBucket.value_sum + excluded.value_sum,
+            "value_min": case(
+                (excluded.value_min < EventSeriesBucket.value_min, excluded.value_min),
+                else_=EventSeriesBucket.value_min,
+            ),
+            "value_max": case(
+                (excluded.value_max > EventSeriesBucket.value_max, excluded.value_max),
+                else_=EventSeriesBucket.value_max,
+            ),
+        },
+    )
+    await db.execute(statement)
+
+
+async def refresh_series_window(
+    db: AsyncSession, kid_id: str, event_type_id: str, timestamp: datetime
+):
+    # Recomputes every resolution inside the coarsest bucket around
+    # timestamp from the raw events; the caller must have flushed its changes
+    window_start = bucket_start(timestamp, RESOLUTIONS[-1])
+    window_end = window_start + timedelta(seconds=RESOLUTIONS[-1])
+    await db.execute(
+        delete(EventSeriesBucket).where(
+            EventSeriesBucket.kid_id == kid_id,
+            EventSeriesBucket.event_type_id == event_type_id,
+            EventSeriesBucket.bucket_start >= window_start,
+            EventSeriesBucket.bucket_start < window_end,
+        )
+    )
+    events = (
+        await db.execute(
+            select(
+                Event.kid_id, Event.event_type_id, Event.timestamp, Event.float_value
+            ).where(
+                Event.kid_id == kid_id,
+                Event.event_type_id == event_type_id,
+                Event.timestamp >= window_start,
+                Event.timestamp < window_end,
+                Event.float_value.is_not(None),
+                Event.is_deleted == false(),
+            )
+        )
+    ).all()
+    deltas = [delta for event in events for delta in series_deltas(event)]
+    await apply_series_deltas(db, deltas)
+
+
+async def refresh_series_windows(
+    db: AsyncSession, points: Iterable[Tuple[str, str, datetime]]
+):
+    # points are (kid_id, event_type_id, timestamp) of changed readings
+    windows = {
+        (kid_id, event_type_id, bucket_start(timestamp, RESOLUTIONS[-1]))
+        for kid_id, event_type_id, timestamp in points
+    }
+    for kid_id, event_type_id, window_start in sorted(windows):
+        await refresh_series_window(db, kid_id, event_type_id, window_start)
+
+
+def bucket_count(since: datetime, until: datetime, resolution: int) -> int:
+    # Buckets from the one holding since up to, not including, until
+    first = bucket_start(since, resolution)
+    last = bucket_start(naive_utc(until) - timedelta(microseconds=1), resolution)
+    return int((last - first).total_seconds()) // resolution + 1
+
+
+def pick_resolution(since: datetime, until: datetime, points: int) -> int:
+    # The finest stored resolution whose buckets fit in points; past the
+    # coarsest, the smallest multiple of it that fits, which queries
+    # re-aggregate from the coarsest buckets
+    for resolution in RESOLUTIONS:
+        if bucket_count(since, until, resolution) <= points:
+            return resolution
+    coarsest = RESOLUTIONS[-1]
+    span = (naive_utc(until) - naive_utc(since)).total_seconds()
+    resolution = math.ceil(span / points / coarsest) * coarsest
+    while bucket_count(since, until, resolution) > points:
+        resolution += coarsest
+    return resolution
+
+
+def stored_resolution(resolution: int) -> int:
+    # The coarsest stored resolution that tiles buckets of this width
+    return max(stored for stored in RESOLUTIONS if resolution % stored == 0)
+
+
+async def rebuild_series(db: AsyncSession, kid_id: Optional[str] = None):
+    clear = delete(EventSeriesBucket)
+    # Ordered so consecutive readings land in the same buckets and merge
+    query = (
+        select(Event.kid_id, Event.event_type_id, Event.timestamp, Event.float_value)
+        .where(Event.float_value.is_not(None), Event.is_deleted == false())
+        .order_by(Event.kid_id, Event.event_type_id, Event.timestamp)
+        .execution_options(yield_per=REBUILD_CHUNK_SIZE)
+    )
+    if kid_id:
+        clear = clear.where(EventSeriesBucket.kid_id == kid_id)
+        query = query.where(Event.kid_id == kid_id)
+    await db.execute(clear)
+
+    # Upserts add up partial buckets, so chunks can be applied as they fill
+    deltas = []
+    async for event in await db.stream(query):
+        deltas.extend(series_deltas(event))
+        if len(deltas) >= REBUILD_CHUNK_SIZE:
+            await apply_series_deltas(db, deltas)
+            deltas = []
+    await apply_series_deltas(db, deltas)
+    await db.commit()
+
+
+async def main(kid_id: Optional[str] = None):
+    get_engine()
+    async with SessionLocal() as db:
+        await rebuild_series(db, kid_id)
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rebuild downsampled event series from the event table."
+    )
+    parser.add_argument("--kid-id", help="Only rebuild series for this kid.")
+    args = parser.parse_args()
+    asyncio.run(main(args.kid_id))
@@ -0,0 +1,25 @@
+from sqlalchemy import DateTime, and_, cast, func, or_
+from datetime import datetime, timezone
+
+
+def naive_utc(value: datetime) -> datetime:
+    # History timestamps are stored as naive UTC
+    if value.tzinfo:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def version_at(model, at):
+    # The version of a temporal row (valid_from/valid_to) in force at 'at',
+    # a value or a correlated column; per-entity lookups use (key, valid_from)
+    return and_(
+        model.valid_from <= at, or_(model.valid_to.is_(None), model.valid_to > at)
+    )
+
+
+def versions_at(model, at):
+    # Every entity's version at 'at', shaped to match the GiST index on
+    # tsrange(valid_from, valid_to)
+    return func.tsrange(model.valid_from, model.valid_to).op("@>")(
+        cast(at, DateTime)
+    )
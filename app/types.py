@@ -0,0 +1,11 @@
+from pydantic import AfterValidator
+from typing import Annotated
+import uuid
+
+
+def canonical_uuid(value: str) -> str:
+    return str(uuid.UUID(value))
+
+
+# Ids are native uuid columns, so malformed ids are rejected before any SQL
+UUIDStr = Annotated[str, AfterValidator(canonical_uuid)]
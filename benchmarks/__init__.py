@@ -0,0 +1,8 @@
+"""Benchmarks for the API.
+
+seed.py fills a database with synthetic families and events, load.py
+drives a request mix against a running server and password_hashing.py
+measures sign-up load. They need Postgres, like the app: point
+SQLALCHEMY_DATABASE_URL at a local one (docker compose up db) migrated
+with 'alembic upgrade head'.
+"""
@@ -0,0 +1,93 @@
+"""Compare per-row and vectorized growth z-scores in rows per second.
+
+    python -m benchmarks.growth --rows 100000 --runs 10
+
+'loop' scores one measurement at a time with the math module, the way
+a report would row by row; 'numpy' is app.growth.compute_growth. Inputs
+are synthetic, so no database is needed. The two are cross-checked
+before timing.
+"""
+
+from typing import List
+import argparse
+import bisect
+import math
+import time
+
+import numpy as np
+
+from app.growth import (
+    DAYS_PER_MONTH,
+    GROWTH_INDICATORS,
+    compute_growth,
+    lms_tables,
+)
+from benchmarks.stats import summarize
+
+
+def loop_z_scores(measures, sexes, values, age_days) -> List[float]:
+    scores = []
+    for measure, sex, value, age in zip(measures, sexes, values, age_days):
+        score = math.nan
+        for indicator_measure, table, first_day, last_day, restricted in (
+            GROWTH_INDICATORS
+        ):
+            if indicator_measure != measure or value <= 0:
+                continue
+            if not first_day <= age <= last_day:
+                continue
+            lms = lms_tables[(table, sex)]
+            months = age / DAYS_PER_MONTH
+            index = min(max(bisect.bisect_right(lms[:, 0], months), 1), len(lms) - 1)
+            (month0, *lms0), (month1, *lms1) = lms[index - 1], lms[index]
+            weight = min(max((months - month0) / (month1 - month0), 0.0), 1.0)
+            lam, m, s = (a + (b - a) * weight for a, b in zip(lms0, lms1))
+            score = ((value / m) ** lam - 1) / (lam * s)
+            if restricted and abs(score) > 3:
+                sign = 1 if score > 0 else -1
+                sd3 = m * (1 + lam * s * 3 * sign) ** (1 / lam)
+                sd2 = m * (1 + lam * s * 2 * sign) ** (1 / lam)
+                score = 3 * sign + (value - sd3) / abs(sd3 - sd2)
+        scores.append(score)
+    return scores
+
+
+def make_inputs(rows: int, rng: np.random.Generator):
+    measures = rng.choice(np.array(["weight", "height"]), rows)
+    sexes = rng.choice(np.array(["M", "F"], dtype=object), rows)
+    age_days = np.floor(rng.uniform(0, 1856, rows))
+    weights = 3.3 + age_days / 1856 * 15 + rng.normal(0, 1.5, rows)
+    heights = 50 + age_days / 1856 * 60 + rng.normal(0, 3, rows)
+    values = np.where(measures == "weight", weights, heights)
+    return measures, sexes, values, age_days
+
+
+def main(args):
+    inputs = make_inputs(args.rows, np.random.default_rng(args.seed))
+    _, vectorized, _ = compute_growth(*inputs)
+    looped = np.array(loop_z_scores(*(column.tolist() for column in inputs)))
+    difference = np.nanmax(np.abs(vectorized - looped))
+    print(f"max |loop - numpy| z difference {difference:.2e}")
+
+    for name, path in (
+        ("loop", lambda: loop_z_scores(*(column.tolist() for column in inputs))),
+        ("numpy", lambda: compute_growth(*inputs)),
+    ):
+        samples = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            path()
+            samples.append(time.perf_counter() - started)
+        stats = summarize(samples, sum(samples))
+        print(
+            f"{name:<8} {args.rows / (stats['p50_ms'] / 1000):>12.0f} rows/s"
+            f"  p50 {stats['p50_ms']:>8.2f}ms  p99 {stats['p99_ms']:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
@@ -0,0 +1,452 @@
+"""Drive a weighted request mix against a running server.
+
+    python -m benchmarks.seed --manifest bench_manifest.json
+    uvicorn app.main:app --workers 4
+    python -m benchmarks.load --manifest bench_manifest.json --output run.json
+    python -m benchmarks.load --manifest bench_manifest.json --compare run.json
+
+Reports throughput and p50/p95/p99 latency per endpoint. --output saves
+the numbers so a later run (e.g. on another commit) can --compare to it.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import httpx
+
+from benchmarks.stats import summarize
+
+
+class LoadContext:
+    def __init__(self, manifest: dict, rng: random.Random):
+        self.manifest = manifest
+        self.rng = rng
+        # Events this worker created, so updates/deletes don't erode seed data
+        self.own_events: List[dict] = []
+        # Last ETag seen per URL, replayed as If-None-Match like a phone client
+        self.etags: Dict[str, str] = {}
+        # Sync watermarks per parent, sent back on the next sync like a phone
+        self.sync_state: Dict[str, dict] = {}
+
+    def kid(self) -> dict:
+        return self.rng.choice(self.manifest["kids"])
+
+    def event_type(self) -> dict:
+        return self.rng.choice(list(self.manifest["event_types"].values()))
+
+    def event_body(self, kid_id: str) -> dict:
+        event_type = self.event_type()
+        return {
+            "kid_id": kid_id,
+            "event_type_id": event_type["id"],
+            "timestamp": (
+                datetime.now(timezone.utc)
+                - timedelta(minutes=self.rng.randint(0, 600))
+            ).isoformat(),
+            "float_value": round(self.rng.uniform(1, 200), 1),
+            "unit_id": event_type["unit_id"],
+        }
+
+
+async def conditional_get(
+    client: httpx.AsyncClient, ctx: LoadContext, url: str, params: dict = None
+):
+    key = url + json.dumps(params, sort_keys=True)
+    headers = {"If-None-Match": ctx.etags[key]} if key in ctx.etags else {}
+    response = await client.get(url, params=params, headers=headers)
+    if "etag" in response.headers:
+        ctx.etags[key] = response.headers["etag"]
+    return response
+
+
+async def list_events(client: httpx.AsyncClient, ctx: LoadContext):
+    return await conditional_get(
+        client, ctx, "/event/events/", {"kid_id": ctx.kid()["id"]}
+    )
+
+
+async def list_events_window(client: httpx.AsyncClient, ctx: LoadContext):
+    since = datetime.now(timezone.utc) - timedelta(days=7)
+    return await client.get(
+        "/event/events/",
+        params={"kid_id": ctx.kid()["id"], "since": since.isoformat()},
+    )
+
+
+async def list_events_pages(client: httpx.AsyncClient, ctx: LoadContext):
+    # Scrolling back through a timeline: follows X-Next-Cursor a few pages
+    params = {"kid_id": ctx.kid()["id"], "limit": 50}
+    for _ in range(3):
+        response = await client.get("/event/events/", params=params)
+        cursor = response.headers.get("X-Next-Cursor")
+        if response.status_code != 200 or not cursor:
+            break
+        params = {**params, "cursor": cursor}
+    return response
+
+
+async def event_report(client: httpx.AsyncClient, ctx: LoadContext):
+    since = datetime.now(timezone.utc) - timedelta(days=30)
+    return await client.get(
+        "/event/events/report",
+        params={"kid_id": ctx.kid()["id"], "since": since.isoformat()},
+    )
+
+
+async def event_series(client: httpx.AsyncClient, ctx: LoadContext):
+    until = datetime.now(timezone.utc)
+    return await client.get(
+        "/event/series",
+        params={
+            "kid_id": ctx.kid()["id"],
+            "event_type_id": ctx.manifest["event_types"]["feeding"]["id"],
+            "since": (until - timedelta(days=90)).isoformat(),
+            "until": until.isoformat(),
+        },
+    )
+
+
+async def growth_report(client: httpx.AsyncClient, ctx: LoadContext):
+    kids = ctx.rng.sample(ctx.manifest["kids"], min(len(ctx.manifest["kids"]), 20))
+    return await client.post(
+        "/growth/report",
+        json={
+            "kid_ids": [kid["id"] for kid in kids],
+            "weight_type_id": ctx.manifest["event_types"]["weight"]["id"],
+            "height_type_id": ctx.manifest["event_types"]["height"]["id"],
+        },
+    )
+
+
+async def subscribe_feed(client: httpx.AsyncClient, ctx: LoadContext):
+    # Time to an open stream; the subscription is dropped after its greeting
+    async with client.stream("GET", f"/event/feed/{ctx.kid()['id']}") as response:
+        async for _ in response.aiter_lines():
+            break
+    return response
+
+
+async def sync(client: httpx.AsyncClient, ctx: LoadContext):
+    parent_id = ctx.kid()["parent_id"]
+    body = {"parent_id": parent_id, **ctx.sync_state.get(parent_id, {})}
+    response = await client.post("/sync", json=body)
+    if response.status_code == 200:
+        result = response.json()
+        ctx.sync_state[parent_id] = {
+            "watermark": result["watermark"],
+            "kids": {kid["kid_id"]: kid["watermark"] for kid in result["kids"]},
+        }
+    return response
+
+
+async def get_event(client: httpx.AsyncClient, ctx: LoadContext):
+    return await client.get(f"/event/events/{ctx.rng.choice(ctx.manifest['events'])}")
+
+
+async def search_events(client: httpx.AsyncClient, ctx: LoadContext):
+    return await client.get(
+        "/event/events/search",
+        params={
+            "kid_id": ctx.kid()["id"],
+            "q": ctx.rng.choice(["rash", "refused bottle", "fussy", "smile"]),
+        },
+    )
+
+
+async def event_summary(client: httpx.AsyncClient, ctx: LoadContext):
+    return await client.get("/event/summary", params={"kid_id": ctx.kid()["id"]})
+
+
+async def post_event(client: httpx.AsyncClient, ctx: LoadContext):
+    kid = ctx.kid()
+    response = await client.post("/event/events", json=ctx.event_body(kid["id"]))
+    if response.status_code == 201:
+        ctx.own_events.append(response.json())
+    return response
+
+
+async def post_events_bulk(client: httpx.AsyncClient, ctx: LoadContext):
+    kid_id = ctx.kid()["id"]
+    events = [ctx.event_body(kid_id) for _ in range(100)]
+    return await client.post("/event/events/bulk", json={"events": events})
+
+
+async def put_event(client: httpx.AsyncClient, ctx: LoadContext):
+    if not ctx.own_events:
+        return await post_event(client, ctx)
+    event = ctx.rng.choice(ctx.own_events)
+    body = ctx.event_body(event["kid_id"])
+    return await client.put(f"/event/events/{event['id']}", json=body)
+
+
+async def delete_event(client: httpx.AsyncClient, ctx: LoadContext):
+    if not ctx.own_events:
+        return await post_event(client, ctx)
+    event = ctx.own_events.pop(ctx.rng.randrange(len(ctx.own_events)))
+    return await client.delete(f"/event/events/{event['id']}")
+
+
+async def export_events(client: httpx.AsyncClient, ctx: LoadContext):
+    return await client.get("/event/events/export", params={"kid_id": ctx.kid()["id"]})
+
+
+async def list_enums(client: httpx.AsyncClient, ctx: LoadContext):
+    return await conditional_get(client, ctx, "/enum/enums/")
+
+
+async def get_enum(client: httpx.AsyncClient, ctx: LoadContext):
+    return await client.get(f"/enum/enums/{ctx.event_type()['id']}")
+
+
+async def enum_history(client: httpx.AsyncClient, ctx: LoadContext):
+    return await client.get(f"/enum/enums/{ctx.event_type()['id']}/history")
+
+
+async def enums_as_of(client: httpx.AsyncClient, ctx: LoadContext):
+    at = datetime.now(timezone.utc) - timedelta(days=ctx.rng.randint(0, 30))
+    return await client.get("/enum/enums/as-of", params={"at": at.isoformat()})
+
+
+async def enums_as_of_batch(client: httpx.AsyncClient, ctx: LoadContext):
+    now = datetime.now(timezone.utc)
+    at = [(now - timedelta(days=days)).isoformat() for days in range(0, 30, 3)]
+    return await client.get("/enum/enums/as-of/batch", params={"at": at})
+
+
+async def kid_permissions(client: httpx.AsyncClient, ctx: LoadContext):
+    return await client.get(f"/kid_permission/kid_permissions/{ctx.kid()['id']}")
+
+
+async def accessible_kids(client: httpx.AsyncClient, ctx: LoadContext):
+    parent_id = ctx.kid()["parent_id"]
+    return await client.get(f"/kid_permission/parents/{parent_id}/kids")
+
+
+async def post_kid_permission(client: httpx.AsyncClient, ctx: LoadContext):
+    return await client.post(
+        "/kid_permission/kid_permissions",
+        json={
+            "kid_id": ctx.kid()["id"],
+            "parent_id": ctx.rng.choice(ctx.manifest["parents"]),
+            "role_id": ctx.rng.choice(ctx.manifest["roles"]),
+        },
+    )
+
+
+async def create_kid(client: httpx.AsyncClient, ctx: LoadContext):
+    return await client.post(
+        "/kid/kids",
+        json={
+            "first_name": "Load",
+            "parent_id": ctx.rng.choice(ctx.manifest["parents"]),
+            "role_id": ctx.rng.choice(ctx.manifest["roles"]),
+        },
+    )
+
+
+async def update_kid(client: httpx.AsyncClient, ctx: LoadContext):
+    kid = ctx.kid()
+    return await client.put(
+        f"/kid/kids/{kid['id']}",
+        json={
+            "first_name": "Renamed",
+            "parent_id": kid["parent_id"],
+            "role_id": ctx.rng.choice(ctx.manifest["roles"]),
+        },
+    )
+
+
+async def post_parent(client: httpx.AsyncClient, ctx: LoadContext):
+    suffix = uuid.uuid4().hex
+    return await client.post(
+        "/parent/parents",
+        json={
+            "email": f"load-{suffix}@example.com",
+            "username": f"load-{suffix}",
+            "first_name": "Load",
+            "password": "benchmark-password",
+        },
+    )
+
+
+async def onboard_family(client: httpx.AsyncClient, ctx: LoadContext):
+    suffix = uuid.uuid4().hex
+    return await client.post(
+        "/onboarding/families",
+        json={
+            "parent": {
+                "email": f"family-{suffix}@example.com",
+                "username": f"family-{suffix}",
+                "first_name": "Load",
+                "password": "benchmark-password",
+            },
+            "kids": [
+                {"first_name": f"Load{index}", "role_id": ctx.manifest["roles"][0]}
+                for index in range(ctx.rng.randint(1, 3))
+            ],
+        },
+    )
+
+
+# Roughly what a fleet of phone clients does: mostly timeline reads
+REQUEST_MIX = {
+    "GET /event/events/": (list_events, 30),
+    "GET /event/events/?since": (list_events_window, 10),
+    "GET /event/events/?cursor (3 pages)": (list_events_pages, 3),
+    "GET /event/events/report": (event_report, 2),
+    "GET /event/series": (event_series, 3),
+    "GET /event/feed/{kid_id}": (subscribe_feed, 1),
+    "POST /sync": (sync, 8),
+    "POST /growth/report": (growth_report, 0.5),
+    "GET /event/events/{id}": (get_event, 5),
+    "GET /event/events/search": (search_events, 1),
+    "GET /event/summary": (event_summary, 8),
+    "POST /event/events": (post_event, 12),
+    "POST /event/events/bulk": (post_events_bulk, 1),
+    "PUT /event/events/{id}": (put_event, 3),
+    "DELETE /event/events/{id}": (delete_event, 2),
+    "GET /event/events/export": (export_events, 0.2),
+    "GET /enum/enums/": (list_enums, 10),
+    "GET /enum/enums/{id}": (get_enum, 3),
+    "GET /enum/enums/{id}/history": (enum_history, 1),
+    "GET /enum/enums/as-of": (enums_as_of, 1),
+    "GET /enum/enums/as-of/batch": (enums_as_of_batch, 0.3),
+    "GET /kid_permission/kid_permissions/{kid_id}": (kid_permissions, 5),
+    "GET /kid_permission/parents/{parent_id}/kids": (accessible_kids, 8),
+    "POST /kid_permission/kid_permissions": (post_kid_permission, 0.5),
+    "POST /kid/kids": (create_kid, 0.5),
+    "PUT /kid/kids/{id}": (update_kid, 0.5),
+    "POST /parent/parents": (post_parent, 0.3),
+    "POST /onboarding/families": (onboard_family, 0.2),
+}
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    ctx: LoadContext,
+    deadline: float,
+    latencies: Dict[str, List[float]],
+    errors: Dict[str, int],
+):
+    names = list(REQUEST_MIX)
+    weights = [REQUEST_MIX[name][1] for name in names]
+    while time.perf_counter() < deadline:
+        name = ctx.rng.choices(names, weights=weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await REQUEST_MIX[name][0](client, ctx)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        elapsed = time.perf_counter() - started
+        if failed:
+            errors[name] = errors.get(name, 0) + 1
+        else:
+            latencies.setdefault(name, []).append(elapsed)
+
+
+async def run(args) -> dict:
+    with open(args.manifest) as manifest_file:
+        manifest = json.load(manifest_file)
+
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        if args.warmup:
+            warmup_deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(
+                *(
+                    worker(
+                        client,
+                        LoadContext(manifest, random.Random(index)),
+                        warmup_deadline,
+                        {},
+                        {},
+                    )
+                    for index in range(args.concurrency)
+                )
+            )
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *(
+                worker(
+                    client,
+                    LoadContext(manifest, random.Random(args.seed + index)),
+                    deadline,
+                    latencies,
+                    errors,
+                )
+                for index in range(args.concurrency)
+            )
+        )
+        duration = time.perf_counter() - started
+
+    endpoints = {}
+    for name in REQUEST_MIX:
+        endpoints[name] = summarize(latencies.get(name, []), duration)
+        endpoints[name]["errors"] = errors.get(name, 0)
+    total = sum(len(samples) for samples in latencies.values())
+    return {
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration": duration,
+        "throughput": total / duration,
+        "endpoints": endpoints,
+    }
+
+
+def print_report(results: dict, baseline: dict = None):
+    header = f"{'endpoint':<46} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5}"
+    if baseline:
+        header += f" {'p50 vs base':>12} {'p99 vs base':>12}"
+    print(header)
+    for name, stats in results["endpoints"].items():
+        line = (
+            f"{name:<46} {stats['throughput']:>8.1f} {stats['p50_ms']:>6.1f}ms"
+            f" {stats['p95_ms']:>6.1f}ms {stats['p99_ms']:>6.1f}ms {stats['errors']:>5}"
+        )
+        base = (baseline or {}).get("endpoints", {}).get(name)
+        if base and base["count"] and stats["count"]:
+            line += (
+                f" {stats['p50_ms'] / base['p50_ms']:>11.2f}x"
+                f" {stats['p99_ms'] / base['p99_ms']:>11.2f}x"
+            )
+        print(line)
+    print(f"total {results['throughput']:.1f} req/s over {results['duration']:.1f}s")
+
+
+async def main(args):
+    results = await run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(results, baseline)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--manifest", default="bench_manifest.json")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    asyncio.run(main(parser.parse_args()))
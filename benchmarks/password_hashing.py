@@ -0,0 +1,95 @@
+"""Sign-up load versus latency on other routes.
+
+Runs against a live server, e.g.:
+
+    uvicorn app.main:app --workers 1
+    python -m benchmarks.password_hashing --base-url http://localhost:8000
+
+For each level of concurrent sign-ups it reports registration throughput
+and the latency of GET /enum/enums/ issued alongside them.
+"""
+
+from typing import List
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+
+from benchmarks.stats import percentile
+
+
+async def sign_up_loop(client: httpx.AsyncClient, deadline: float, results: dict):
+    while time.perf_counter() < deadline:
+        suffix = uuid.uuid4().hex
+        started = time.perf_counter()
+        response = await client.post(
+            "/parent/parents",
+            json={
+                "email": f"bench-{suffix}@example.com",
+                "username": f"bench-{suffix}",
+                "first_name": "Bench",
+                "password": "benchmark-password",
+            },
+        )
+        elapsed = time.perf_counter() - started
+        if response.status_code == 201:
+            results["sign_ups"].append(elapsed)
+        else:
+            results["rejected"] += 1
+
+
+async def probe_loop(client: httpx.AsyncClient, deadline: float, results: dict):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get("/enum/enums/")
+        results["probes"].append(time.perf_counter() - started)
+        await asyncio.sleep(0.01)
+
+
+async def run_level(base_url: str, concurrency: int, duration: float) -> dict:
+    results = {"sign_ups": [], "probes": [], "rejected": 0}
+    limits = httpx.Limits(max_connections=concurrency + 4)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(
+            probe_loop(client, deadline, results),
+            *(sign_up_loop(client, deadline, results) for _ in range(concurrency)),
+        )
+    return results
+
+
+async def main(base_url: str, levels: List[int], duration: float):
+    print(
+        f"{'sign-ups':>8} {'reg/s':>8} {'reg p50':>9} {'rejected':>8} "
+        f"{'probe p50':>10} {'probe p99':>10}"
+    )
+    for concurrency in levels:
+        results = await run_level(base_url, concurrency, duration)
+        sign_ups = results["sign_ups"]
+        probes = results["probes"]
+        print(
+            f"{concurrency:>8} {len(sign_ups) / duration:>8.1f} "
+            f"{percentile(sign_ups, 0.5) * 1000:>7.1f}ms "
+            f"{results['rejected']:>8} "
+            f"{percentile(probes, 0.5) * 1000:>8.1f}ms "
+            f"{percentile(probes, 0.99) * 1000:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--levels", default="0,1,4,16,64")
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    asyncio.run(
+        main(
+            args.base_url,
+            [int(level) for level in args.levels.split(",")],
+            args.duration,
+        )
+    )
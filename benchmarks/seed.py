@@ -0,0 +1,252 @@
+"""Seed a database with synthetic families and event timelines.
+
+Uses the application's models and engine, so it targets whatever
+SQLALCHEMY_DATABASE_URL / POSTGRES_* point at:
+
+    python -m benchmarks.seed --parents 2000 --events-per-kid 1000
+
+Writes a manifest of ids the load driver samples from.
+"""
+
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert
+from typing import List
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from app.database import SessionLocal, dispose_engine, get_engine
+from app.models import Enum, EnumHistory, Event, Kid, KidPermission, Parent
+from app.partitions import add_months, ensure_event_partitions, month_start
+from app.passwords import pwd_context
+from app.rollups import rebuild_rollups
+from app.series import rebuild_series
+
+
+ROLES = ["mother", "father", "nanny", "grandparent"]
+UNITS = ["ml", "h", "kg", "cm", "celsius"]
+# event type -> (unit, value column, value generator)
+EVENT_TYPES = {
+    "feeding": ("ml", "float_value", lambda rng: round(rng.uniform(60, 240), 1)),
+    "sleep": ("h", "float_value", lambda rng: round(rng.uniform(0.3, 4.0), 2)),
+    "diaper": (None, "string_value", lambda rng: rng.choice(["wet", "dirty", "both"])),
+    "weight": ("kg", "float_value", lambda rng: round(rng.uniform(3.0, 15.0), 2)),
+    "height": ("cm", "float_value", lambda rng: round(rng.uniform(48, 100), 1)),
+    "temperature": ("celsius", "float_value", lambda rng: round(rng.gauss(36.8, 0.4), 1)),
+    "medicine": (None, "int_value", lambda rng: rng.choice([1, 2, 5])),
+}
+EVENT_WEIGHTS = [40, 20, 30, 2, 1, 4, 3]
+NOTES = ["refused bottle", "rash on left arm", "fussy after nap", "first smile", None]
+
+
+def make_id(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+async def insert_chunked(table, rows: List[dict], chunk_size: int):
+    for start in range(0, len(rows), chunk_size):
+        async with SessionLocal() as db:
+            await db.execute(insert(table), rows[start : start + chunk_size])
+            await db.commit()
+
+
+async def seed(args) -> dict:
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    started = time.perf_counter()
+
+    # The schema itself comes from 'alembic upgrade head'
+    get_engine()
+
+    # Enums are named per run so reseeding the same database doesn't collide
+    run = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+    enum_ids = {}
+    enum_rows = []
+    for enum_name, names in (
+        ("role", ROLES),
+        ("unit", UNITS),
+        ("event_type", list(EVENT_TYPES)),
+    ):
+        for name in names:
+            enum_ids[(enum_name, name)] = make_id(rng)
+            enum_rows.append(
+                {
+                    "id": enum_ids[(enum_name, name)],
+                    "enum_name": enum_name,
+                    "name": f"{name}-{run}",
+                    "created_datetime": now,
+                }
+            )
+    await insert_chunked(Enum, enum_rows, args.chunk_size)
+    await insert_chunked(
+        EnumHistory,
+        [
+            {
+                "id": make_id(rng),
+                "enum_id": row["id"],
+                "enum_name": row["enum_name"],
+                "name": row["name"],
+                "valid_from": now,
+                "is_deleted": False,
+            }
+            for row in enum_rows
+        ],
+        args.chunk_size,
+    )
+
+    # One real hash; bcrypt per synthetic parent would dominate seeding time
+    hashed_password = pwd_context.hash("benchmark-password")
+    parent_rows = []
+    for index in range(args.parents):
+        parent_rows.append(
+            {
+                "id": make_id(rng),
+                "email": f"parent-{run}-{index}@example.com",
+                "username": f"parent-{run}-{index}",
+                "first_name": f"Parent{index}",
+                "hashed_password": hashed_password,
+                "created_datetime": now,
+                "is_deleted": False,
+            }
+        )
+    await insert_chunked(Parent, parent_rows, args.chunk_size)
+
+    kid_rows = []
+    permission_rows = []
+    for parent in parent_rows:
+        for _ in range(rng.randint(1, args.max_kids_per_parent)):
+            kid_id = make_id(rng)
+            kid_rows.append(
+                {
+                    "id": kid_id,
+                    "first_name": f"Kid{len(kid_rows)}",
+                    "birth_date": now - timedelta(days=rng.randint(0, 3 * 365)),
+                    "parent_id": parent["id"],
+                    "created_datetime": now,
+                    "is_deleted": False,
+                }
+            )
+            permission_rows.append(
+                {
+                    "id": make_id(rng),
+                    "kid_id": kid_id,
+                    "parent_id": parent["id"],
+                    "role_id": enum_ids[("role", rng.choice(ROLES[:2]))],
+                    "created_datetime": now,
+                    "is_deleted": False,
+                }
+            )
+            # Some kids are shared with a co-parent or nanny
+            if rng.random() < args.shared_ratio:
+                permission_rows.append(
+                    {
+                        "id": make_id(rng),
+                        "kid_id": kid_id,
+                        "parent_id": rng.choice(parent_rows)["id"],
+                        "role_id": enum_ids[("role", rng.choice(ROLES[1:]))],
+                        "created_datetime": now,
+                        "is_deleted": False,
+                    }
+                )
+    await insert_chunked(Kid, kid_rows, args.chunk_size)
+    await insert_chunked(KidPermission, permission_rows, args.chunk_size)
+
+    # Every month the generated timestamps fall in needs its partition
+    history = timedelta(days=args.days)
+    months = [month_start(now - history)]
+    while months[-1] < month_start(now):
+        months.append(add_months(months[-1], 1))
+    await ensure_event_partitions(months)
+
+    # Events are generated and flushed per chunk to keep memory flat
+    type_names = list(EVENT_TYPES)
+    events_total = 0
+    event_sample = []
+    buffer = []
+    for kid in kid_rows:
+        for _ in range(args.events_per_kid):
+            type_name = rng.choices(type_names, weights=EVENT_WEIGHTS)[0]
+            unit, column, generate = EVENT_TYPES[type_name]
+            row = {
+                "id": make_id(rng),
+                "kid_id": kid["id"],
+                "event_type_id": enum_ids[("event_type", type_name)],
+                "timestamp": now - history * rng.random(),
+                "string_value": None,
+                "float_value": None,
+                "bool_value": None,
+                "int_value": None,
+                "unit_id": enum_ids[("unit", unit)] if unit else None,
+                "created_datetime": now,
+                "is_deleted": False,
+            }
+            row[column] = generate(rng)
+            if row["string_value"] is None and rng.random() < 0.05:
+                row["string_value"] = rng.choice(NOTES)
+            buffer.append(row)
+            if len(event_sample) < 1000 and rng.random() < 0.01:
+                event_sample.append(row["id"])
+            if len(buffer) >= args.chunk_size:
+                await insert_chunked(Event, buffer, args.chunk_size)
+                events_total += len(buffer)
+                buffer = []
+    if buffer:
+        await insert_chunked(Event, buffer, args.chunk_size)
+        events_total += len(buffer)
+
+    async with SessionLocal() as db:
+        await rebuild_rollups(db)
+        await rebuild_series(db)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"seeded {len(parent_rows)} parents, {len(kid_rows)} kids, "
+        f"{len(permission_rows)} permissions, {events_total} events "
+        f"in {elapsed:.1f}s ({events_total / elapsed:.0f} events/s)"
+    )
+
+    sample_parents = rng.sample(parent_rows, min(len(parent_rows), 1000))
+    sample_kids = rng.sample(kid_rows, min(len(kid_rows), 1000))
+    return {
+        "seed": args.seed,
+        "enums": {
+            f"{enum_name}:{name}": enum_id
+            for (enum_name, name), enum_id in enum_ids.items()
+        },
+        "roles": [enum_ids[("role", name)] for name in ROLES],
+        "event_types": {
+            name: {
+                "id": enum_ids[("event_type", name)],
+                "unit_id": enum_ids[("unit", unit)] if unit else None,
+            }
+            for name, (unit, _, _) in EVENT_TYPES.items()
+        },
+        "parents": [parent["id"] for parent in sample_parents],
+        "kids": [
+            {"id": kid["id"], "parent_id": kid["parent_id"]} for kid in sample_kids
+        ],
+        "events": event_sample,
+    }
+
+
+async def main(args):
+    manifest = await seed(args)
+    with open(args.manifest, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--parents", type=int, default=100)
+    parser.add_argument("--max-kids-per-parent", type=int, default=3)
+    parser.add_argument("--shared-ratio", type=float, default=0.3)
+    parser.add_argument("--events-per-kid", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--manifest", default="bench_manifest.json")
+    asyncio.run(main(parser.parse_args()))
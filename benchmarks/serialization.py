@@ -0,0 +1,84 @@
+"""Compare list-endpoint serialization paths in rows per second.
+
+    python -m benchmarks.seed --parents 200 --events-per-kid 1000
+    python -m benchmarks.serialization --rows 1000 --runs 20
+
+'orm' is the old path: ORM entities validated into EventResponse and
+encoded the way FastAPI does for a response_model. 'tuples' is the fast
+path get_all_events uses: plain column rows encoded by orjson. Both
+include the query, against the database SQLALCHEMY_DATABASE_URL /
+POSTGRES_* point at.
+"""
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import false, select
+from typing import List
+import argparse
+import asyncio
+import json
+import time
+
+from app.database import SessionLocal, dispose_engine, get_engine
+from app.models import Event
+from app.routers.event import EVENT_COLUMNS, EVENT_FIELDS, EventResponse
+from benchmarks.stats import summarize
+
+
+adapter = TypeAdapter(List[EventResponse])
+
+
+async def orm_path(rows: int) -> int:
+    async with SessionLocal() as db:
+        query = (
+            select(Event)
+            .where(Event.is_deleted == false())
+            .order_by(Event.timestamp.desc(), Event.id.desc())
+            .limit(rows)
+        )
+        results = (await db.execute(query)).scalars().all()
+    validated = adapter.validate_python(results, from_attributes=True)
+    body = json.dumps(adapter.dump_python(validated, mode="json")).encode()
+    return len(body)
+
+
+async def tuple_path(rows: int) -> int:
+    async with SessionLocal() as db:
+        query = (
+            select(*EVENT_COLUMNS)
+            .where(Event.is_deleted == false())
+            .order_by(Event.timestamp.desc(), Event.id.desc())
+            .limit(rows)
+        )
+        results = (await db.execute(query)).all()
+    response = ORJSONResponse([dict(zip(EVENT_FIELDS, row)) for row in results])
+    return len(response.body)
+
+
+async def measure(path, rows: int, runs: int) -> List[float]:
+    await path(rows)
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await path(rows)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def main(args):
+    get_engine()
+    for name, path in (("orm", orm_path), ("tuples", tuple_path)):
+        samples = await measure(path, args.rows, args.runs)
+        stats = summarize(samples, sum(samples))
+        print(
+            f"{name:<8} {args.rows / (stats['p50_ms'] / 1000):>12.0f} rows/s"
+            f"  p50 {stats['p50_ms']:>8.2f}ms  p99 {stats['p99_ms']:>8.2f}ms"
+        )
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+"""Measure how long the application takes to become ready.
+
+    python -m benchmarks.startup --runs 5
+
+Times a cold 'import app.main' in a fresh interpreter, and the time from
+spawning uvicorn until /system/startup first answers 200. Neither touches
+the schema; run 'alembic upgrade head' beforehand.
+"""
+
+from typing import List
+import argparse
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.stats import summarize
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_import() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import app.main"], check=True)
+    return time.perf_counter() - started
+
+
+def time_ready(timeout: float) -> dict:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        while time.perf_counter() < deadline:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/system/startup")
+            except httpx.HTTPError:
+                time.sleep(0.01)
+                continue
+            if response.status_code == 200:
+                return {"ready": time.perf_counter() - started, **response.json()}
+        raise RuntimeError(f"server not ready after {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(args):
+    imports: List[float] = []
+    readies: List[float] = []
+    lifespans: List[float] = []
+    for _ in range(args.runs):
+        imports.append(time_import())
+        timings = time_ready(args.timeout)
+        readies.append(timings["ready"])
+        lifespans.append(timings["lifespan_seconds"])
+
+    for name, samples in (
+        ("import app.main", imports),
+        ("spawn to first 200", readies),
+        ("lifespan startup", lifespans),
+    ):
+        stats = summarize(samples, 1.0)
+        print(f"{name:<20} p50 {stats['p50_ms']:>8.1f}ms  p99 {stats['p99_ms']:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    main(parser.parse_args())
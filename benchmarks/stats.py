@@ -0,0 +1,20 @@
+from typing import Dict, List
+import math
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float], duration: float) -> Dict[str, float]:
+    return {
+        "count": len(samples),
+        "throughput": len(samples) / duration if duration else 0.0,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+    }
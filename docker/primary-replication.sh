@@ -0,0 +1,5 @@
+#!/bin/sh
+# Runs once, when the primary's data volume is first initialised: lets the
+# replica stream WAL as the application user
+set -e
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -0,0 +1,47 @@
+from app.access_cache import AccessCache, access_cache
+
+
+def accessible_kids(client, parent: str) -> list:
+    response = client.get(f"/kid_permission/parents/{parent}/kids")
+    assert response.status_code == 200, response.text
+    return [kid["kid_id"] for kid in response.json()]
+
+
+def test_cache_evicts_the_least_recently_used_parent():
+    cache = AccessCache(ttl_seconds=60, max_size=2)
+    cache.set("a", [1])
+    cache.set("b", [2])
+    cache.get("a")
+
+    cache.set("c", [3])
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ([1], [3])
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_expires_entries_after_the_ttl():
+    cache = AccessCache(ttl_seconds=0, max_size=2)
+    cache.set("a", [1])
+
+    assert cache.get("a") is None
+
+
+def test_revoking_a_permission_drops_the_cached_kids(client, parent, kid):
+    assert accessible_kids(client, parent) == [kid]
+    assert access_cache.get(parent) is not None
+    [permission] = client.get(f"/kid_permission/kid_permissions/{kid}").json()
+
+    response = client.delete(f"/kid_permission/kid_permissions/{permission['id']}")
+
+    assert response.status_code == 204
+    assert accessible_kids(client, parent) == []
+
+
+def test_revoking_twice_is_not_found(client, kid):
+    [permission] = client.get(f"/kid_permission/kid_permissions/{kid}").json()
+    client.delete(f"/kid_permission/kid_permissions/{permission['id']}")
+
+    response = client.delete(f"/kid_permission/kid_permissions/{permission['id']}")
+
+    assert response.status_code == 404
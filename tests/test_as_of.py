@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.audit import audit_queue
+
+
+@pytest.fixture
+def renamed_event_type(client, event_type) -> list:
+    # feeding, then bottle: returns the two history versions
+    client.put(
+        f"/enum/enums/{event_type}",
+        json={"enum_name": "event_type", "name": "bottle"},
+    )
+    client.portal.call(audit_queue.flush)
+    return client.get(f"/enum/enums/{event_type}/history").json()
+
+
+def between(version: dict) -> str:
+    valid_from = datetime.fromisoformat(version["valid_from"])
+    valid_to = datetime.fromisoformat(version["valid_to"])
+    return (valid_from + (valid_to - valid_from) / 2).isoformat() + "Z"
+
+
+def names_as_of(client, at: str) -> list:
+    response = client.get("/enum/enums/as-of", params={"at": at})
+    assert response.status_code == 200, response.text
+    return [version["name"] for version in response.json()]
+
+
+def test_as_of_returns_the_version_in_force(client, renamed_event_type):
+    first, second = renamed_event_type
+    created = datetime.fromisoformat(first["valid_from"])
+
+    assert names_as_of(client, (created - timedelta(seconds=1)).isoformat()) == []
+    assert names_as_of(client, between(first)) == ["feeding"]
+    assert names_as_of(client, second["valid_from"]) == ["bottle"]
+
+
+def test_as_of_hides_deleted_enums(client, event_type):
+    client.delete(f"/enum/enums/{event_type}")
+    client.portal.call(audit_queue.flush)
+
+    assert names_as_of(client, datetime.now(timezone.utc).isoformat()) == []
+
+
+def test_as_of_batch_answers_every_timestamp(client, renamed_event_type):
+    first, second = renamed_event_type
+
+    response = client.get(
+        "/enum/enums/as-of/batch",
+        params={"at": [second["valid_from"], between(first)]},
+    )
+
+    assert [
+        [version["name"] for version in point["enums"]] for point in response.json()
+    ] == [["feeding"], ["bottle"]]
+
+
+def test_report_names_events_as_of_their_timestamp(
+    client, kid, renamed_event_type, post_event
+):
+    first, second = renamed_event_type
+    post_event(between(first))
+    post_event(second["valid_from"])
+
+    report = client.get("/event/events/report", params={"kid_id": kid}).json()
+
+    assert [event["event_type_name"] for event in report] == ["bottle", "feeding"]
@@ -0,0 +1,84 @@
+from app.audit import AuditQueue, audit_queue
+from app.models import EventHistory
+
+
+def test_event_history_is_written_behind_with_closed_versions(
+    client, kid, event_type, post_event
+):
+    event = post_event("2024-12-01T08:00:00Z", float_value=100)
+    client.put(
+        f"/event/events/{event['id']}",
+        json={
+            "kid_id": kid,
+            "event_type_id": event_type,
+            "timestamp": "2024-12-01T08:00:00Z",
+            "float_value": 120,
+        },
+    )
+    client.delete(f"/event/events/{event['id']}")
+
+    client.portal.call(audit_queue.flush)
+    history = client.get(f"/event/events/{event['id']}/history").json()
+
+    assert [version["float_value"] for version in history] == [100, 120, 120]
+    assert [version["is_deleted"] for version in history] == [False, False, True]
+    assert [version["valid_to"] for version in history[:-1]] == [
+        version["valid_from"] for version in history[1:]
+    ]
+    assert history[-1]["valid_to"] is None
+
+
+def test_queue_drops_rows_past_its_bound():
+    queue = AuditQueue(max_pending=2)
+
+    for _ in range(3):
+        queue.record(EventHistory, {"event_id": "x"})
+
+    assert (queue.stats()["pending"], queue.stats()["dropped"]) == (2, 1)
+
+
+def test_failed_flush_keeps_the_batch_for_the_next_one(client, db, kid, event_type):
+    queue = AuditQueue()
+    row = {
+        "event_id": "6a8d4d2f-3b5c-4d7e-9fa0-1b2c3d4e5f60",
+        "kid_id": kid,
+        "event_type_id": event_type,
+        "timestamp": None,
+    }
+    queue.record(EventHistory, row)
+
+    client.portal.call(queue.flush)
+    assert (queue.stats()["failures"], queue.stats()["pending"]) == (1, 1)
+
+    row["timestamp"] = "2024-12-01T08:00:00"
+    client.portal.call(queue.flush)
+    assert (queue.stats()["flushed"], queue.stats()["pending"]) == (1, 0)
+    assert db.execute("SELECT count(*) FROM event_history").fetchone() == (1,)
+
+
+def test_a_row_the_database_rejects_stops_blocking_the_queue(
+    client, db, kid, event_type
+):
+    queue = AuditQueue(max_attempts=2)
+    row = {"kid_id": kid, "event_type_id": event_type}
+    queue.record(
+        EventHistory,
+        {**row, "event_id": "6a8d4d2f-3b5c-4d7e-9fa0-1b2c3d4e5f60", "timestamp": None},
+    )
+    client.portal.call(queue.flush)
+    queue.record(
+        EventHistory,
+        {
+            **row,
+            "event_id": "7b9e5e30-4c6d-4e8f-a0b1-2c3d4e5f6071",
+            "timestamp": "2024-12-01T08:00:00",
+        },
+    )
+
+    client.portal.call(queue.flush)
+
+    stats = queue.stats()
+    assert (stats["flushed"], stats["rejected"], stats["pending"]) == (1, 1, 0)
+    assert db.execute("SELECT event_id::text FROM event_history").fetchall() == [
+        ("7b9e5e30-4c6d-4e8f-a0b1-2c3d4e5f6071",)
+    ]
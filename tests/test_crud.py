@@ -0,0 +1,45 @@
+UNKNOWN_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def test_duplicate_parent_is_rejected_and_the_session_recovers(client, parent):
+    body = {
+        "email": "parent@example.com",
+        "username": "parent",
+        "first_name": "Parent",
+        "password": "securepassword123",
+    }
+
+    duplicate = client.post("/parent/parents", json=body)
+    other = client.post(
+        "/parent/parents",
+        json={**body, "email": "other@example.com", "username": "other"},
+    )
+
+    assert duplicate.status_code == 400
+    assert other.status_code == 201, other.text
+
+
+def test_kid_for_an_unknown_parent_is_rejected(client, role):
+    response = client.post(
+        "/kid/kids", json={"first_name": "Kid", "parent_id": UNKNOWN_ID, "role_id": role}
+    )
+
+    assert response.status_code == 400
+
+
+def test_kid_can_be_updated_and_deleted(client, parent, role, kid):
+    body = {"first_name": "Renamed", "parent_id": parent, "role_id": role}
+
+    updated = client.put(f"/kid/kids/{kid}", json=body)
+    deleted = client.delete(f"/kid/kids/{kid}")
+
+    assert updated.status_code == 202
+    assert updated.json()["first_name"] == "Renamed"
+    assert deleted.status_code == 204
+
+
+def test_unknown_kid_is_not_found(client, parent, role):
+    body = {"first_name": "Kid", "parent_id": parent, "role_id": role}
+
+    assert client.put(f"/kid/kids/{UNKNOWN_ID}", json=body).status_code == 404
+    assert client.delete(f"/kid/kids/{UNKNOWN_ID}").status_code == 404
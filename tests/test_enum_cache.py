@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+from sqlalchemy import update
+
+from app.database import SessionLocal
+from app.enum_cache import enum_cache
+from app.models import Enum
+
+from conftest import ROOT
+
+
+def list_enums(client, etag: str = None):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get("/enum/enums/", headers=headers)
+
+
+def test_ttl_is_read_from_the_environment():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from app.enum_cache import enum_cache; print(enum_cache.ttl_seconds)",
+        ],
+        cwd=ROOT,
+        env={**os.environ, "ENUM_CACHE_TTL_SECONDS": "5"},
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.stdout.strip() == "5.0", result.stderr
+
+
+def test_etag_is_unchanged_until_enums_change(client, role):
+    etag = list_enums(client).headers["etag"]
+
+    assert list_enums(client, etag).status_code == 304
+
+
+def test_each_enum_write_changes_the_etag(client, role):
+    etags = [list_enums(client).headers["etag"]]
+
+    client.post("/enum/enums", json={"enum_name": "unit", "name": "kg"})
+    etags.append(list_enums(client).headers["etag"])
+    client.put(f"/enum/enums/{role}", json={"enum_name": "role", "name": "father"})
+    etags.append(list_enums(client).headers["etag"])
+    client.delete(f"/enum/enums/{role}")
+    response = list_enums(client, etags[-1])
+
+    assert response.status_code == 200
+    assert [enum["name"] for enum in response.json()] == ["kg"]
+    assert len(set(etags + [response.headers["etag"]])) == 4
+
+
+def test_writes_outside_the_enum_routes_invalidate(client, role):
+    list_enums(client)
+    assert enum_cache.is_fresh()
+
+    async def rename():
+        async with SessionLocal() as db:
+            await db.execute(
+                update(Enum).where(Enum.id == role).values(name="grandparent")
+            )
+            await db.commit()
+
+    client.portal.call(rename)
+
+    assert not enum_cache.is_fresh()
+    assert list_enums(client).json()[0]["name"] == "grandparent"
+
+
+def test_rolled_back_writes_keep_the_cache(client, role):
+    list_enums(client)
+
+    async def rename_and_roll_back():
+        async with SessionLocal() as db:
+            (await db.get(Enum, role)).name = "grandparent"
+            await db.flush()
+            await db.rollback()
+
+    client.portal.call(rename_and_roll_back)
+
+    assert enum_cache.is_fresh()
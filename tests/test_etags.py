@@ -0,0 +1,84 @@
+from app.etags import etag_matches
+
+
+def timeline(client, kid: str, etag: str = None, **params):
+    headers = {"If-None-Match": etag} if etag else {}
+    return client.get(
+        "/event/events/", params={"kid_id": kid, **params}, headers=headers
+    )
+
+
+def test_unchanged_timeline_is_not_modified(client, kid, post_event):
+    post_event("2024-12-01T08:00:00Z")
+    etag = timeline(client, kid).headers["etag"]
+
+    response = timeline(client, kid, etag)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_every_event_write_changes_the_timeline_etag(
+    client, kid, event_type, post_event
+):
+    etags = [timeline(client, kid).headers["etag"]]
+    event = post_event("2024-12-01T08:00:00Z")
+    etags.append(timeline(client, kid).headers["etag"])
+    client.put(
+        f"/event/events/{event['id']}",
+        json={
+            "kid_id": kid,
+            "event_type_id": event_type,
+            "timestamp": "2024-12-02T08:00:00Z",
+        },
+    )
+    etags.append(timeline(client, kid).headers["etag"])
+    client.post(
+        "/event/events/bulk",
+        json={
+            "events": [
+                {
+                    "kid_id": kid,
+                    "event_type_id": event_type,
+                    "timestamp": "2024-12-03T08:00:00Z",
+                }
+            ]
+        },
+    )
+    etags.append(timeline(client, kid).headers["etag"])
+    client.delete(f"/event/events/{event['id']}")
+
+    response = timeline(client, kid, etags[-1])
+
+    assert response.status_code == 200
+    assert len(set(etags + [response.headers["etag"]])) == 5
+
+
+def test_event_writes_do_not_count_as_kid_edits(client, db, kid, post_event):
+    post_event("2024-12-01T08:00:00Z")
+
+    assert db.execute(
+        "SELECT event_version, modified_datetime FROM kid WHERE id = %s", [kid]
+    ).fetchone() == (1, None)
+
+
+def test_etag_depends_on_the_page_requested(client, kid, post_event):
+    post_event("2024-12-01T08:00:00Z")
+
+    first = timeline(client, kid, limit=1).headers["etag"]
+
+    assert timeline(client, kid, first, limit=2).status_code == 200
+
+
+def test_unfiltered_listing_has_no_etag(client, kid, post_event):
+    post_event("2024-12-01T08:00:00Z")
+
+    assert "etag" not in client.get("/event/events/").headers
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"x", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('W/"abd"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
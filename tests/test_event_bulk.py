@@ -0,0 +1,51 @@
+from app.routers.event import MAX_BULK_EVENTS
+
+
+UNKNOWN_ID = "00000000-0000-4000-8000-000000000000"
+
+
+def test_bulk_reports_bad_rows_and_stores_the_rest(client, db, kid, event_type):
+    events = [
+        {"kid_id": kid, "event_type_id": event_type, "timestamp": timestamp}
+        for timestamp in ("2024-11-30T23:00:00Z", "2036-02-01T08:00:00Z")
+    ]
+    events.insert(1, {**events[0], "kid_id": UNKNOWN_ID})
+    events.append({**events[0], "unit_id": UNKNOWN_ID})
+
+    response = client.post("/event/events/bulk", json={"events": events})
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["created_count"], body["failed_count"]) == (2, 2)
+    assert [result["created"] for result in body["results"]] == [
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert "Kid" in body["results"][1]["detail"]
+    assert "Unit" in body["results"][3]["detail"]
+    created = [result["id"] for result in body["results"] if result["created"]]
+    rows = db.execute(
+        "SELECT id::text, tableoid::regclass::text FROM event ORDER BY timestamp"
+    ).fetchall()
+    assert rows == [(created[0], "event_p2024_11"), (created[1], "event_p2036_02")]
+
+
+def test_bulk_with_only_bad_rows_writes_nothing(client, db, kid):
+    event = {"kid_id": kid, "event_type_id": UNKNOWN_ID, "timestamp": "2024-12-01"}
+
+    response = client.post("/event/events/bulk", json={"events": [event]})
+
+    assert response.json()["created_count"] == 0
+    assert db.execute("SELECT count(*) FROM event").fetchone() == (0,)
+
+
+def test_bulk_rejects_batches_over_the_limit(client, kid, event_type):
+    event = {"kid_id": kid, "event_type_id": event_type, "timestamp": "2024-12-01"}
+
+    response = client.post(
+        "/event/events/bulk", json={"events": [event] * (MAX_BULK_EVENTS + 1)}
+    )
+
+    assert response.status_code == 422
@@ -0,0 +1,47 @@
+import csv
+import io
+import json
+
+from app.routers import event as event_module
+
+
+def test_ndjson_export_streams_the_timeline_oldest_first(
+    client, kid, post_event, monkeypatch
+):
+    # Several server-side cursor chunks
+    monkeypatch.setattr(event_module, "EXPORT_CHUNK_SIZE", 2)
+    events = [post_event(f"2024-12-0{day}T08:00:00Z") for day in (3, 1, 4, 2, 5)]
+    client.delete(f"/event/events/{events[0]['id']}")
+
+    response = client.get("/event/events/export", params={"kid_id": kid})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["timestamp"] for row in rows] == [
+        "2024-12-01T08:00:00",
+        "2024-12-02T08:00:00",
+        "2024-12-04T08:00:00",
+        "2024-12-05T08:00:00",
+    ]
+
+
+def test_csv_export_has_a_header_and_one_row_per_event(client, kid, post_event):
+    event = post_event("2024-12-01T08:00:00Z", float_value=120.5)
+
+    response = client.get(
+        "/event/events/export", params={"kid_id": kid, "format": "csv"}
+    )
+
+    assert response.headers["content-type"].startswith("text/csv")
+    [row] = csv.DictReader(io.StringIO(response.text))
+    assert (row["id"], row["float_value"]) == (event["id"], "120.5")
+
+
+def test_export_of_an_unknown_kid_is_not_found(client):
+    response = client.get(
+        "/event/events/export",
+        params={"kid_id": "00000000-0000-4000-8000-000000000000"},
+    )
+
+    assert response.status_code == 404
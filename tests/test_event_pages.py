@@ -0,0 +1,54 @@
+def test_event_list_follows_cursor_to_the_last_page(follow_pages, kid, post_event):
+    events = [post_event(f"2024-12-0{day}T08:00:00Z") for day in range(1, 6)]
+
+    pages = follow_pages("/event/events/", {"kid_id": kid, "limit": 2})
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    listed = [event["id"] for page in pages for event in page]
+    assert listed == [event["id"] for event in reversed(events)]
+
+
+def test_event_list_pages_equal_timestamps_by_id(follow_pages, kid, post_event):
+    events = [post_event("2024-12-01T08:00:00Z") for _ in range(3)]
+
+    pages = follow_pages("/event/events/", {"kid_id": kid, "limit": 1})
+
+    listed = [event["id"] for page in pages for event in page]
+    assert listed == sorted((event["id"] for event in events), reverse=True)
+
+
+def test_event_list_filters_by_time_range(client, kid, post_event):
+    for day in range(1, 6):
+        post_event(f"2024-12-0{day}T08:00:00Z")
+
+    response = client.get(
+        "/event/events/",
+        params={
+            "kid_id": kid,
+            "since": "2024-12-02T00:00:00Z",
+            "until": "2024-12-04T00:00:00Z",
+        },
+    )
+
+    assert [event["timestamp"] for event in response.json()] == [
+        "2024-12-03T08:00:00",
+        "2024-12-02T08:00:00",
+    ]
+
+
+def test_event_list_rejects_a_malformed_cursor(client, kid):
+    response = client.get("/event/events/", params={"kid_id": kid, "cursor": "nope"})
+
+    assert response.status_code == 400
+
+
+def test_event_report_follows_cursor_to_the_end(follow_pages, kid, post_event):
+    events = [post_event(f"2024-12-0{day}T08:00:00Z") for day in range(1, 4)]
+
+    pages = follow_pages("/event/events/report", {"kid_id": kid, "limit": 2})
+
+    listed = [event["id"] for page in pages for event in page]
+    assert listed == [event["id"] for event in reversed(events)]
+    assert {event["event_type_name"] for page in pages for event in page} == {
+        "feeding"
+    }
@@ -0,0 +1,33 @@
+def test_search_matches_words_in_notes(client, kid, post_event):
+    rash = post_event("2024-12-01T08:00:00Z", string_value="Rash on left arm")
+    post_event("2024-12-02T08:00:00Z", string_value="refused bottle")
+    post_event("2024-12-03T08:00:00Z")
+
+    response = client.get("/event/events/search", params={"kid_id": kid, "q": "rash"})
+
+    assert response.status_code == 200
+    assert [event["id"] for event in response.json()] == [rash["id"]]
+
+
+def test_search_skips_deleted_events(client, kid, post_event):
+    event = post_event("2024-12-01T08:00:00Z", string_value="rash")
+    client.delete(f"/event/events/{event['id']}")
+
+    response = client.get("/event/events/search", params={"kid_id": kid, "q": "rash"})
+
+    assert response.json() == []
+
+
+def test_search_follows_cursor_to_the_last_page(follow_pages, kid, post_event):
+    events = [
+        post_event(f"2024-12-0{day}T08:00:00Z", string_value="fussy after nap")
+        for day in range(1, 6)
+    ]
+
+    pages = follow_pages(
+        "/event/events/search", {"kid_id": kid, "q": "fussy", "limit": 2}
+    )
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    listed = [event["id"] for page in pages for event in page]
+    assert listed == [event["id"] for event in reversed(events)]
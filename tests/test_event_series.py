@@ -0,0 +1,123 @@
+from datetime import datetime
+
+from app.series import bucket_count, pick_resolution
+
+from conftest import any_session_time_zone
+
+
+def series(client, kid: str, event_type: str, points: int = 10) -> dict:
+    response = client.get(
+        "/event/series",
+        params={
+            "kid_id": kid,
+            "event_type_id": event_type,
+            "since": "2024-12-01T08:00:00Z",
+            "until": "2024-12-01T10:00:00Z",
+            "points": points,
+        },
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def summarize(body: dict) -> list:
+    return [
+        (point["bucket_start"], point["count"], point["min"], point["max"])
+        for point in body["points"]
+    ]
+
+
+def test_series_buckets_readings_at_the_resolution_that_fits(
+    client, kid, event_type, post_event
+):
+    for minute, value in ((1, 100), (5, 140), (14, 120)):
+        post_event(f"2024-12-01T08:{minute:02d}:00Z", float_value=value)
+    post_event("2024-12-01T09:20:00Z", float_value=90)
+
+    body = series(client, kid, event_type)
+
+    assert body["resolution_seconds"] == 900
+    assert summarize(body) == [
+        ("2024-12-01T08:00:00", 3, 100.0, 140.0),
+        ("2024-12-01T09:15:00", 1, 90.0, 90.0),
+    ]
+    assert body["points"][0]["avg"] == 120.0
+
+
+@any_session_time_zone
+def test_series_follows_edits_and_deletes(client, kid, event_type, post_event):
+    low = post_event("2024-12-01T08:01:00Z", float_value=100)
+    high = post_event("2024-12-01T08:05:00Z", float_value=140)
+
+    client.put(
+        f"/event/events/{high['id']}",
+        json={
+            "kid_id": kid,
+            "event_type_id": event_type,
+            "timestamp": "2024-12-01T08:05:00Z",
+            "float_value": 110,
+        },
+    )
+    client.delete(f"/event/events/{low['id']}")
+
+    assert summarize(series(client, kid, event_type)) == [
+        ("2024-12-01T08:00:00", 1, 110.0, 110.0)
+    ]
+
+
+def test_series_rejects_an_empty_range(client, kid, event_type):
+    response = client.get(
+        "/event/series",
+        params={
+            "kid_id": kid,
+            "event_type_id": event_type,
+            "since": "2024-12-01T10:00:00Z",
+            "until": "2024-12-01T10:00:00Z",
+        },
+    )
+
+    assert response.status_code == 400
+
+
+def test_pick_resolution_prefers_the_finest_that_fits():
+    since = datetime(2024, 12, 1)
+
+    assert pick_resolution(since, datetime(2024, 12, 1, 1), 60) == 60
+    assert pick_resolution(since, datetime(2024, 12, 1, 2), 10) == 900
+    assert pick_resolution(since, datetime(2024, 12, 11), 240) == 3600
+
+
+def test_pick_resolution_widens_past_the_coarsest_to_stay_within_points():
+    since, until = datetime(2024, 1, 1, 7, 30), datetime(2025, 1, 1)
+
+    resolution = pick_resolution(since, until, 500)
+
+    assert resolution % 3600 == 0
+    assert bucket_count(since, until, resolution) <= 500
+    assert bucket_count(since, until, resolution - 3600) > 500
+
+
+def test_series_sums_hourly_buckets_for_long_ranges(
+    client, kid, event_type, post_event
+):
+    for day, value in ((1, 100), (1, 140), (2, 90)):
+        post_event(f"2024-12-0{day}T0{day}:00:00Z", float_value=value)
+
+    response = client.get(
+        "/event/series",
+        params={
+            "kid_id": kid,
+            "event_type_id": event_type,
+            "since": "2024-01-01T00:00:00Z",
+            "until": "2025-01-01T00:00:00Z",
+            "points": 366,
+        },
+    )
+
+    body = response.json()
+    assert body["resolution_seconds"] == 86400
+    assert summarize(body) == [
+        ("2024-12-01T00:00:00", 2, 100.0, 140.0),
+        ("2024-12-02T00:00:00", 1, 90.0, 90.0),
+    ]
+    assert body["points"][0]["avg"] == 120.0
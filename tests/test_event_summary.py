@@ -0,0 +1,91 @@
+from app.database import SessionLocal
+from app.rollups import rebuild_rollups
+
+from conftest import any_session_time_zone
+
+
+def summary(client, kid: str) -> list:
+    response = client.get("/event/summary", params={"kid_id": kid})
+    assert response.status_code == 200, response.text
+    return [
+        (row["day"], row["event_count"], row["float_sum"]) for row in response.json()
+    ]
+
+
+def test_summary_follows_creates_updates_and_deletes(
+    client, kid, event_type, post_event
+):
+    first = post_event("2024-12-01T08:00:00Z", float_value=100)
+    post_event("2024-12-01T20:00:00Z", float_value=50)
+    last = post_event("2024-12-02T08:00:00Z", float_value=80)
+
+    client.put(
+        f"/event/events/{first['id']}",
+        json={
+            "kid_id": kid,
+            "event_type_id": event_type,
+            "timestamp": "2024-12-03T08:00:00Z",
+            "float_value": 120,
+        },
+    )
+    client.delete(f"/event/events/{last['id']}")
+
+    assert summary(client, kid) == [("2024-12-01", 1, 50.0), ("2024-12-03", 1, 120.0)]
+
+
+def test_summary_matches_a_rebuild_from_events(client, kid, post_event):
+    for day in (1, 1, 2, 5):
+        post_event(f"2024-12-0{day}T08:00:00Z", float_value=day * 10)
+    maintained = summary(client, kid)
+
+    async def rebuild():
+        async with SessionLocal() as db:
+            await rebuild_rollups(db, kid)
+
+    client.portal.call(rebuild)
+
+    assert summary(client, kid) == maintained
+    assert maintained == [
+        ("2024-12-01", 2, 20.0),
+        ("2024-12-02", 1, 20.0),
+        ("2024-12-05", 1, 50.0),
+    ]
+
+
+@any_session_time_zone
+def test_summary_days_are_utc_days(client, kid, post_event):
+    post_event("2024-12-01T23:30:00Z", float_value=10)
+    post_event("2024-12-02T00:30:00Z", float_value=20)
+    maintained = summary(client, kid)
+
+    async def rebuild():
+        async with SessionLocal() as db:
+            await rebuild_rollups(db, kid)
+
+    client.portal.call(rebuild)
+
+    assert maintained == [("2024-12-01", 1, 10.0), ("2024-12-02", 1, 20.0)]
+    assert summary(client, kid) == maintained
+
+
+def test_summary_keeps_units_apart(client, kid, post_event):
+    units = {
+        name: client.post("/enum/enums", json={"enum_name": "unit", "name": name})
+        .json()["id"]
+        for name in ("ml", "oz")
+    }
+    post_event("2024-12-01T08:00:00Z", float_value=120, unit_id=units["ml"])
+    post_event("2024-12-01T12:00:00Z", float_value=4, unit_id=units["oz"])
+    post_event("2024-12-01T16:00:00Z", float_value=90, unit_id=units["ml"])
+    post_event("2024-12-01T20:00:00Z", float_value=1)
+    maintained = client.get("/event/summary", params={"kid_id": kid}).json()
+
+    async def rebuild():
+        async with SessionLocal() as db:
+            await rebuild_rollups(db, kid)
+
+    client.portal.call(rebuild)
+
+    sums = {(row["unit_id"], row["event_count"], row["float_sum"]) for row in maintained}
+    assert sums == {(None, 1, 1.0), (units["ml"], 2, 210.0), (units["oz"], 1, 4.0)}
+    assert client.get("/event/summary", params={"kid_id": kid}).json() == maintained
@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+
+from app import feed
+from app.feed import (
+    MemoryBroker,
+    PostgresBroker,
+    Subscription,
+    feed_messages,
+    get_feed_broker,
+)
+
+from conftest import ROOT
+
+
+def test_app_imports_without_database_settings():
+    env = {"PATH": os.environ.get("PATH", "")}
+
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.main"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_broker_is_built_on_first_use(monkeypatch):
+    monkeypatch.setattr(feed, "event_feed", None)
+    monkeypatch.setattr(feed, "FEED_BROKER", "postgres")
+    monkeypatch.setattr(
+        feed.database, "SQLALCHEMY_DATABASE_URL", "postgresql+psycopg://u@db/app"
+    )
+
+    broker = get_feed_broker()
+
+    assert isinstance(broker, PostgresBroker)
+    assert broker.conninfo == "postgresql://u@db/app"
+    assert get_feed_broker() is broker
+
+
+def test_feed_announces_a_new_event_after_commit(client, kid, post_event):
+    assert isinstance(get_feed_broker(), MemoryBroker)
+
+    with client.websocket_connect(f"/event/feed/{kid}/ws") as socket:
+        # The socket is accepted just before it subscribes
+        for _ in range(100):
+            if client.get("/system/feed").json()["subscribers"]:
+                break
+        event = post_event("2024-12-01T08:00:00Z")
+
+        message = socket.receive_json()
+
+    assert message == {"kid_id": kid, "action": "created", "event_ids": [event["id"]]}
+
+
+def test_feed_messages_split_large_batches(monkeypatch):
+    monkeypatch.setattr(feed, "FEED_MAX_IDS_PER_MESSAGE", 2)
+
+    messages = feed_messages("kid", "created", ["a", "b", "c"])
+
+    assert [message["event_ids"] for message in messages] == [["a", "b"], ["c"]]
+
+
+def test_subscription_that_falls_behind_is_told_to_resync():
+    subscription = Subscription("kid", size=2)
+
+    for _ in range(3):
+        subscription.deliver({"kid_id": "kid", "action": "created", "event_ids": []})
+
+    assert subscription.queue.qsize() == 1
+    assert subscription.queue.get_nowait() == {"kid_id": "kid", "action": "resync"}
+
+
+def test_feed_of_an_unknown_kid_is_not_found(client):
+    response = client.get("/event/feed/00000000-0000-0000-0000-000000000000")
+
+    assert response.status_code == 404
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from app.growth import compute_growth
+from benchmarks.growth import loop_z_scores, make_inputs
+
+
+@pytest.fixture
+def weight_type(client) -> str:
+    response = client.post(
+        "/enum/enums", json={"enum_name": "event_type", "name": "weight"}
+    )
+    return response.json()["id"]
+
+
+@pytest.fixture
+def newborn(client, parent, role) -> str:
+    response = client.post(
+        "/kid/kids",
+        json={
+            "first_name": "Newborn",
+            "parent_id": parent,
+            "role_id": role,
+            "birth_date": "2024-01-01T00:00:00Z",
+            "sex": "M",
+        },
+    )
+    return response.json()["id"]
+
+
+def weigh(client, kid_id: str, weight_type: str, value: float, **extra) -> str:
+    response = client.post(
+        "/event/events",
+        json={
+            "kid_id": kid_id,
+            "event_type_id": weight_type,
+            "timestamp": "2024-01-01T12:00:00Z",
+            "float_value": value,
+            **extra,
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_growth_report_scores_the_who_median_as_zero(client, newborn, weight_type):
+    weigh(client, newborn, weight_type, 3.3464)
+
+    response = client.post(
+        "/growth/report", json={"kid_ids": [newborn], "weight_type_id": weight_type}
+    )
+
+    assert response.status_code == 200
+    [row] = response.json()
+    assert row["indicator"] == "weight-for-age"
+    assert row["age_days"] == 0
+    assert row["z_score"] == 0.0
+    assert row["percentile"] == 50.0
+
+
+def test_growth_report_converts_units(client, newborn, weight_type):
+    grams = client.post("/enum/enums", json={"enum_name": "unit", "name": "g"})
+    weigh(client, newborn, weight_type, 3346.4, unit_id=grams.json()["id"])
+
+    response = client.post(
+        "/growth/report", json={"kid_ids": [newborn], "weight_type_id": weight_type}
+    )
+
+    [row] = response.json()
+    assert row["value"] == pytest.approx(3.3464)
+    assert row["z_score"] == 0.0
+
+
+def test_growth_report_leaves_kids_without_birth_data_unscored(
+    client, kid, weight_type
+):
+    weigh(client, kid, weight_type, 4.0)
+
+    response = client.post(
+        "/growth/report", json={"kid_ids": [kid], "weight_type_id": weight_type}
+    )
+
+    [row] = response.json()
+    assert row["value"] == 4.0
+    assert (row["indicator"], row["z_score"], row["percentile"]) == (None, None, None)
+
+
+def test_growth_report_requires_a_measure(client, kid):
+    response = client.post("/growth/report", json={"kid_ids": [kid]})
+
+    assert response.status_code == 400
+
+
+def test_compute_growth_matches_the_per_row_reference():
+    inputs = make_inputs(2000, np.random.default_rng(7))
+
+    _, z, _ = compute_growth(*inputs)
+
+    np.testing.assert_allclose(z, loop_z_scores(*inputs), rtol=1e-9, equal_nan=True)
@@ -0,0 +1,33 @@
+from app.database import Base
+
+
+def test_every_id_column_is_a_native_uuid(db):
+    columns = db.execute(
+        "SELECT table_name, column_name, data_type FROM information_schema.columns "
+        "WHERE table_schema = 'public' AND (column_name = 'id' "
+        "OR column_name LIKE '%\\_id')"
+    ).fetchall()
+    tables = {table.name for table in Base.metadata.sorted_tables}
+
+    id_types = {
+        (table, column): data_type
+        for table, column, data_type in columns
+        if table in tables
+    }
+
+    assert id_types
+    assert set(id_types.values()) == {"uuid"}, id_types
+
+
+def test_malformed_ids_are_rejected_before_any_query(client):
+    assert client.get("/event/events/not-a-uuid").status_code == 422
+    assert client.get("/event/events/", params={"kid_id": "1"}).status_code == 422
+
+
+def test_ids_are_accepted_in_any_uuid_spelling(client, kid, post_event):
+    event = post_event("2024-12-01T08:00:00Z")
+
+    response = client.get(f"/event/events/{event['id'].upper()}")
+
+    assert response.status_code == 200
+    assert response.json()["id"] == event["id"]
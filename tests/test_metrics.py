@@ -0,0 +1,38 @@
+from app.metrics import Histogram
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency", "Latency.", (0.1, 1.0))
+    labels = (("route", "/x"),)
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(labels, value)
+
+    lines = histogram.render()
+
+    assert 'latency_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'latency_bucket{route="/x",le="1.0"} 2' in lines
+    assert 'latency_bucket{route="/x",le="+Inf"} 3' in lines
+    assert 'latency_count{route="/x"} 3' in lines
+
+
+def test_metrics_label_requests_by_route_template(client, kid):
+    client.get(f"/kid_permission/parents/{kid}/kids")
+
+    text = client.get("/metrics").text
+
+    labels = 'method="GET",route="/kid_permission/parents/{parent_id}/kids"'
+    assert f'http_requests_total{{{labels},status="200"}}' in text
+    assert f"db_statements_per_request_count{{{labels}}}" in text
+    assert kid not in text
+
+
+def test_pool_totals_are_counters(client):
+    text = client.get("/metrics").text
+
+    assert "# TYPE db_pool_checked_out gauge" in text
+    for name in (
+        "db_pool_checkouts_total",
+        "db_pool_timeouts_total",
+        "db_pool_wait_seconds_total",
+    ):
+        assert f"# TYPE {name} counter" in text
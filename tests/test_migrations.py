@@ -0,0 +1,69 @@
+from alembic import command
+import pytest
+
+
+KID_ID = "5f7c3c1e-2a4b-4c6d-8e9f-0a1b2c3d4e5f"
+EVENT_ID = "6a8d4d2f-3b5c-4d7e-9fa0-1b2c3d4e5f60"
+
+
+def build_baseline(empty_database, alembic_config, missing):
+    # What create_all left behind before migrations existed: the 0001
+    # tables, minus whatever that release didn't know about yet, and no
+    # alembic_version
+    command.upgrade(alembic_config, "0001")
+    if "index" in missing:
+        empty_database.execute("DROP INDEX ix_event_kid_id_timestamp")
+    if "rollup" in missing:
+        empty_database.execute("DROP TABLE event_daily_rollup")
+    empty_database.execute("DROP TABLE alembic_version")
+
+    empty_database.execute(
+        "INSERT INTO enum (id, enum_name, name, created_datetime) VALUES "
+        "('7b9e5e30-4c6d-4e8f-a0b1-2c3d4e5f6071', 'event_type', 'feeding', now())"
+    )
+    empty_database.execute(
+        "INSERT INTO kid (id, first_name, created_datetime, is_deleted) "
+        f"VALUES ('{KID_ID}', 'Kid', now(), false)"
+    )
+    empty_database.execute(
+        "INSERT INTO event (id, kid_id, event_type_id, timestamp, "
+        "created_datetime, is_deleted) VALUES "
+        f"('{EVENT_ID}', '{KID_ID}', '7b9e5e30-4c6d-4e8f-a0b1-2c3d4e5f6071', "
+        "'2023-01-05 08:00', now(), false)"
+    )
+
+
+@pytest.mark.parametrize(
+    "missing", [{"rollup", "index"}, {"index"}, set()], ids=["v0", "v2", "v5"]
+)
+def test_upgrade_from_a_create_all_database(empty_database, alembic_config, missing):
+    build_baseline(empty_database, alembic_config, missing)
+
+    command.upgrade(alembic_config, "head")
+
+    assert empty_database.execute(
+        "SELECT id::text, pg_typeof(id)::text, tableoid::regclass::text FROM event"
+    ).fetchall() == [(EVENT_ID, "uuid", "event_p2023_01")]
+    assert empty_database.execute(
+        "SELECT count(*) FROM event_history WHERE event_id = %s", [EVENT_ID]
+    ).fetchone() == (1,)
+    # Rebuilt per unit from the events
+    assert empty_database.execute(
+        "SELECT day::text, unit_id, event_count FROM event_daily_rollup"
+    ).fetchall() == [("2023-01-05", None, 1)]
+
+
+def test_downgrade_to_base_and_upgrade_again(empty_database, alembic_config):
+    command.upgrade(alembic_config, "head")
+    command.downgrade(alembic_config, "base")
+
+    assert empty_database.execute(
+        "SELECT to_regclass('event') IS NULL"
+    ).fetchone() == (True,)
+
+    command.upgrade(alembic_config, "head")
+
+
+def test_autogenerate_leaves_event_partitions_alone(database, alembic_config):
+    # Raises if comparing the models with the migrated schema finds changes
+    command.check(alembic_config)
@@ -0,0 +1,83 @@
+import pytest
+
+
+def family(role: str, kids: int = 2, email: str = "family@example.com") -> dict:
+    return {
+        "parent": {
+            "email": email,
+            "username": email.split("@")[0],
+            "first_name": "Parent",
+            "password": "securepassword123",
+        },
+        "kids": [
+            {
+                "first_name": f"Kid{index}",
+                "birth_date": "2024-01-01T00:00:00Z",
+                "sex": "F",
+                "role_id": role,
+            }
+            for index in range(kids)
+        ],
+    }
+
+
+def test_onboarding_creates_parent_kids_and_permissions(client, role):
+    response = client.post("/onboarding/families", json=family(role))
+
+    assert response.status_code == 201, response.text
+    body = response.json()
+    parent_id = body["parent"]["id"]
+    assert [kid["first_name"] for kid in body["kids"]] == ["Kid0", "Kid1"]
+    assert {kid["parent_id"] for kid in body["kids"]} == {parent_id}
+    assert [permission["kid_id"] for permission in body["permissions"]] == [
+        kid["id"] for kid in body["kids"]
+    ]
+    kids = client.get(f"/kid_permission/parents/{parent_id}/kids").json()
+    assert sorted(kid["kid_id"] for kid in kids) == sorted(
+        kid["id"] for kid in body["kids"]
+    )
+
+
+def test_onboarding_rejects_an_unknown_role_before_writing(client, db, role):
+    unknown = "00000000-0000-4000-8000-000000000000"
+
+    response = client.post("/onboarding/families", json=family(unknown))
+
+    assert response.status_code == 400
+    assert db.execute("SELECT count(*) FROM parent").fetchone() == (0,)
+
+
+def test_onboarding_rejects_a_duplicate_parent(client, role):
+    client.post("/onboarding/families", json=family(role))
+
+    response = client.post("/onboarding/families", json=family(role, kids=1))
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/kid/kids", "/onboarding/families"])
+def test_new_kids_have_the_same_timestamp_format_as_stored_ones(
+    client, parent, role, path
+):
+    if path == "/kid/kids":
+        response = client.post(
+            path,
+            json={
+                "first_name": "Kid",
+                "birth_date": "2024-01-01T00:00:00Z",
+                "parent_id": parent,
+                "role_id": role,
+            },
+        )
+        created = response.json()
+    else:
+        response = client.post(path, json=family(role, kids=1))
+        created = response.json()["kids"][0]
+        parent = created["parent_id"]
+
+    assert response.status_code == 201, response.text
+    synced = client.post("/sync", json={"parent_id": parent}).json()
+    [stored] = [kid["kid"] for kid in synced["kids"]]
+    for field in ("birth_date", "created_datetime"):
+        assert created[field] == stored[field]
+    assert created["birth_date"] == "2024-01-01T00:00:00"
@@ -0,0 +1,93 @@
+from datetime import date
+import csv
+import gzip
+
+import pytest
+
+from app import partitions
+from app.partitions import archive_partition, maintain_partitions
+
+from conftest import any_session_time_zone
+
+
+def partition_of(db, event_id: str) -> str:
+    return db.execute(
+        "SELECT tableoid::regclass::text FROM event WHERE id = %s", [event_id]
+    ).fetchone()[0]
+
+
+@any_session_time_zone
+def test_event_can_move_into_a_month_without_a_partition(
+    client, db, kid, event_type, post_event
+):
+    event = post_event("2024-12-01T08:00:00Z")
+
+    response = client.put(
+        f"/event/events/{event['id']}",
+        json={
+            "kid_id": kid,
+            "event_type_id": event_type,
+            "timestamp": "2037-03-10T08:00:00Z",
+        },
+    )
+
+    assert response.status_code == 202, response.text
+    assert response.json()["timestamp"] == "2037-03-10T08:00:00"
+    assert partition_of(db, event["id"]) == "event_p2037_03"
+
+
+def test_a_write_blocked_on_partition_ddl_goes_to_the_default_partition(
+    client, db, post_event, monkeypatch
+):
+    monkeypatch.setattr(partitions, "PARTITION_LOCK_TIMEOUT_SECONDS", 0.1)
+
+    # A long reader of the default partition, such as an export
+    with db.transaction():
+        db.execute("LOCK TABLE event_default IN ACCESS SHARE MODE")
+        event = post_event("2036-05-10T08:00:00Z")
+        assert partition_of(db, event["id"]) == "event_default"
+
+    assert client.portal.call(maintain_partitions) is True
+    assert partition_of(db, event["id"]) == "event_p2036_05"
+    assert db.execute("SELECT count(*) FROM event_default").fetchone() == (0,)
+
+
+def test_a_month_dropped_by_another_process_goes_to_the_default_partition(
+    client, db, post_event
+):
+    post_event("2035-07-01T08:00:00Z")
+    db.execute("DELETE FROM event")
+    # Archived elsewhere: this process still lists the month as known
+    db.execute("ALTER TABLE event DETACH PARTITION event_p2035_07")
+    db.execute("DROP TABLE event_p2035_07")
+
+    event = post_event("2035-07-02T08:00:00Z")
+    assert partition_of(db, event["id"]) == "event_default"
+
+    client.portal.call(maintain_partitions)
+    assert partition_of(db, event["id"]) == "event_p2035_07"
+
+
+def test_archive_partition_copies_then_drops_it(client, db, post_event, tmp_path):
+    events = [post_event(f"2019-01-0{day}T08:00:00Z") for day in range(1, 4)]
+
+    path = client.portal.call(archive_partition, date(2019, 1, 1), str(tmp_path))
+
+    with gzip.open(path, "rt") as archive:
+        rows = list(csv.DictReader(archive))
+    assert sorted(row["id"] for row in rows) == sorted(e["id"] for e in events)
+    assert db.execute("SELECT to_regclass('event_p2019_01')").fetchone() == (None,)
+
+
+def test_archive_partition_keeps_it_attached_when_the_copy_fails(
+    client, db, post_event, tmp_path
+):
+    event = post_event("2019-02-01T08:00:00Z")
+
+    with pytest.raises(FileNotFoundError):
+        client.portal.call(
+            archive_partition, date(2019, 2, 1), str(tmp_path / "missing")
+        )
+
+    assert partition_of(db, event["id"]) == "event_p2019_02"
+    assert not (tmp_path / "missing").exists()
@@ -0,0 +1,32 @@
+import asyncio
+
+from app import passwords
+from app.passwords import pwd_context
+
+
+def test_sign_up_stores_a_bcrypt_hash(db, parent):
+    [(hashed_password,)] = db.execute(
+        "SELECT hashed_password FROM parent WHERE id = %s", [parent]
+    ).fetchall()
+
+    assert hashed_password.startswith("$2b$")
+    assert pwd_context.verify("securepassword123", hashed_password)
+
+
+def test_sign_up_is_rejected_when_the_hasher_is_saturated(client, monkeypatch):
+    # No free slots and no patience: the request is turned away, not queued
+    monkeypatch.setattr(passwords, "slots", asyncio.Semaphore(0))
+    monkeypatch.setattr(passwords, "PASSWORD_HASH_QUEUE_TIMEOUT", 0.01)
+
+    response = client.post(
+        "/parent/parents",
+        json={
+            "email": "busy@example.com",
+            "username": "busy",
+            "first_name": "Busy",
+            "password": "securepassword123",
+        },
+    )
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
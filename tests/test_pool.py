@@ -0,0 +1,13 @@
+from app.database import DB_MAX_OVERFLOW, DB_POOL_SIZE
+
+
+def test_pool_status_reports_configuration_and_checkouts(client, kid):
+    before = client.get("/system/pool").json()["checkouts"]
+
+    client.get(f"/event/events/?kid_id={kid}")
+    status = client.get("/system/pool").json()
+
+    assert (status["size"], status["max_overflow"]) == (DB_POOL_SIZE, DB_MAX_OVERFLOW)
+    assert status["checkouts"] > before
+    assert status["checked_out"] == 0
+    assert status["timeouts"] == 0
@@ -0,0 +1,118 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.engine import make_url
+import pytest
+
+from app import database as app_database
+from app.main import app
+from app.replica import replica_monitor
+
+from conftest import TEST_DATABASE_URL
+
+
+UNREACHABLE_URL = "postgresql+psycopg://nobody@127.0.0.1:1/unreachable"
+
+
+@pytest.fixture
+def replica_url(request) -> str:
+    # The test database doubles as its own replica: not in recovery, so
+    # its lag is always zero. Indirect parameters name another fixture.
+    if hasattr(request, "param"):
+        return request.getfixturevalue(request.param)
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture
+def stalled_standby_url(db) -> str:
+    # Connections that search this schema before pg_catalog see a standby
+    # whose WAL receiver stopped an hour ago, with everything it received
+    # replayed
+    db.execute("CREATE SCHEMA stalled_standby")
+    for function, returns, value in [
+        ("pg_is_in_recovery", "boolean", "true"),
+        ("pg_last_wal_receive_lsn", "pg_lsn", "'0/1'::pg_lsn"),
+        ("pg_last_wal_replay_lsn", "pg_lsn", "'0/1'::pg_lsn"),
+        (
+            "pg_last_xact_replay_timestamp",
+            "timestamptz",
+            "now() - interval '1 hour'",
+        ),
+    ]:
+        db.execute(
+            f"CREATE FUNCTION stalled_standby.{function}() RETURNS {returns}"
+            f" LANGUAGE sql AS $$ SELECT {value} $$"
+        )
+    yield make_url(TEST_DATABASE_URL).update_query_dict(
+        {"options": "-c search_path=stalled_standby,pg_catalog,public"}
+    ).render_as_string(hide_password=False)
+    db.execute("DROP SCHEMA stalled_standby CASCADE")
+
+
+@pytest.fixture
+def client(db, replica_url, monkeypatch):
+    monkeypatch.setattr(app_database, "REPLICA_DATABASE_URL", replica_url)
+    with TestClient(app) as client:
+        client.portal.call(replica_monitor.check)
+        yield client
+
+
+def reads(client) -> tuple:
+    stats = client.get("/system/replica").json()
+    return stats["replica_reads"], stats["primary_reads"]
+
+
+def read_kid_permissions(client, kid: str):
+    response = client.get(f"/kid_permission/kid_permissions/{kid}")
+    assert response.status_code == 200, response.text
+
+
+def test_reads_go_to_a_healthy_replica(client, kid):
+    before = reads(client)
+    client.cookies.clear()
+
+    read_kid_permissions(client, kid)
+
+    assert client.get("/system/replica").json()["healthy"]
+    assert reads(client) == (before[0] + 1, before[1])
+
+
+def test_reads_after_a_write_stay_on_the_primary(client, kid, post_event):
+    post_event("2024-12-01T08:00:00Z")
+    before = reads(client)
+
+    read_kid_permissions(client, kid)
+
+    assert reads(client) == (before[0], before[1] + 1)
+
+
+def test_a_lagging_replica_is_skipped(client, kid, monkeypatch):
+    monkeypatch.setattr(replica_monitor, "max_lag_seconds", -1)
+    client.portal.call(replica_monitor.check)
+    client.cookies.clear()
+    before = reads(client)
+
+    read_kid_permissions(client, kid)
+
+    assert reads(client) == (before[0], before[1] + 1)
+
+
+@pytest.mark.parametrize("replica_url", [UNREACHABLE_URL])
+def test_an_unreachable_replica_is_skipped(client, kid):
+    before = reads(client)
+
+    read_kid_permissions(client, kid)
+
+    stats = client.get("/system/replica").json()
+    assert (stats["healthy"], stats["failures"] > 0) == (False, True)
+    assert reads(client) == (before[0], before[1] + 1)
+
+
+@pytest.mark.parametrize("replica_url", ["stalled_standby_url"], indirect=True)
+def test_a_standby_that_stopped_receiving_is_skipped(client, kid):
+    before = reads(client)
+
+    read_kid_permissions(client, kid)
+
+    stats = client.get("/system/replica").json()
+    assert stats["healthy"] is False
+    assert stats["lag_seconds"] >= 3600
+    assert reads(client) == (before[0], before[1] + 1)
@@ -0,0 +1,12 @@
+def test_event_list_items_match_the_validated_single_event(client, kid, post_event):
+    event = post_event("2024-12-01T08:00:00.123456Z", float_value=120, int_value=2)
+
+    [listed] = client.get("/event/events/", params={"kid_id": kid}).json()
+
+    assert listed == client.get(f"/event/events/{event['id']}").json()
+
+
+def test_enum_list_items_match_the_validated_single_enum(client, role):
+    [listed] = client.get("/enum/enums/").json()
+
+    assert listed == client.get(f"/enum/enums/{role}").json()
@@ -0,0 +1,80 @@
+import pytest
+
+import app.routers.sync as sync
+
+
+@pytest.fixture(autouse=True)
+def no_overlap(monkeypatch):
+    # Watermarks sit exactly at the sync time, so a second sync only
+    # returns what changed after the first
+    monkeypatch.setattr(sync, "SYNC_OVERLAP_SECONDS", 0)
+
+
+def run_sync(client, parent, watermark=None, kids=None, limit=None) -> dict:
+    body = {"parent_id": parent, "watermark": watermark, "kids": kids or {}}
+    if limit:
+        body["limit"] = limit
+    response = client.post("/sync", json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def kid_watermarks(result: dict) -> dict:
+    return {kid["kid_id"]: kid["watermark"] for kid in result["kids"]}
+
+
+def test_second_sync_returns_only_later_changes(client, parent, kid, post_event):
+    first_event = post_event("2024-12-01T08:00:00Z")
+
+    first = run_sync(client, parent)
+    [kid_result] = first["kids"]
+    assert kid_result["kid"]["id"] == kid
+    assert [event["id"] for event in kid_result["events"]] == [first_event["id"]]
+    assert len(first["permissions"]) == 1
+
+    second_event = post_event("2024-12-02T08:00:00Z")
+    second = run_sync(client, parent, first["watermark"], kid_watermarks(first))
+
+    [kid_result] = second["kids"]
+    assert kid_result["kid"] is None
+    assert [event["id"] for event in kid_result["events"]] == [second_event["id"]]
+    assert second["permissions"] == []
+    assert second["enums"] == []
+
+
+def test_sync_returns_deleted_events_as_tombstones(client, parent, kid, post_event):
+    event = post_event("2024-12-01T08:00:00Z")
+    first = run_sync(client, parent)
+
+    client.delete(f"/event/events/{event['id']}")
+    second = run_sync(client, parent, first["watermark"], kid_watermarks(first))
+
+    [kid_result] = second["kids"]
+    assert [(row["id"], row["is_deleted"]) for row in kid_result["events"]] == [
+        (event["id"], True)
+    ]
+
+
+def test_sync_pages_events_with_has_more(client, parent, kid, post_event):
+    events = [post_event(f"2024-12-0{day}T08:00:00Z") for day in range(1, 4)]
+
+    synced = []
+    result = run_sync(client, parent, limit=2)
+    while True:
+        [kid_result] = result["kids"]
+        synced.extend(event["id"] for event in kid_result["events"])
+        if not kid_result["has_more"]:
+            break
+        result = run_sync(
+            client, parent, result["watermark"], kid_watermarks(result), limit=2
+        )
+
+    assert sorted(synced) == sorted(event["id"] for event in events)
+
+
+def test_sync_unknown_parent_is_not_found(client):
+    response = client.post(
+        "/sync", json={"parent_id": "123e4567-e89b-12d3-a456-426614174001"}
+    )
+
+    assert response.status_code == 404